@@ -0,0 +1,34 @@
+"""add transaction note search
+
+Revision ID: 37839d5eff6a
+Revises: ae92df213f4f
+Create Date: 2026-10-17 15:02:19.847126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '37839d5eff6a'
+down_revision: Union[str, None] = 'ae92df213f4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated column: Postgres keeps it in sync with note on every insert and update
+    op.add_column('transactions', sa.Column(
+        'note_search',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(note, ''))", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_transactions_note_search', 'transactions', ['note_search'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_note_search', table_name='transactions', postgresql_using='gin')
+    op.drop_column('transactions', 'note_search')
@@ -0,0 +1,59 @@
+"""add composite indexes for hot queries
+
+Revision ID: 3f13a410d145
+Revises: a1e999073e60
+Create Date: 2026-10-17 10:12:41.208337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f13a410d145'
+down_revision: Union[str, None] = 'a1e999073e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Remove duplicate memberships (keep the oldest row) so the unique constraint can be created
+    op.execute("""
+        DELETE FROM group_members gm
+        USING group_members dup
+        WHERE gm.user_id = dup.user_id
+          AND gm.group_id = dup.group_id
+          AND gm.id > dup.id
+    """)
+
+    # Membership checks filter on (user_id, group_id); the constraint's index serves them
+    op.create_unique_constraint('uq_group_members_user_id_group_id', 'group_members', ['user_id', 'group_id'])
+    # Member lists and member counts per group
+    op.create_index('ix_group_members_group_id_user_id', 'group_members', ['group_id', 'user_id'], unique=False)
+
+    # Transaction listing (group_id ordered by date, id) and keyset pagination;
+    # amount/type are included so per-group stats can use an index-only scan
+    op.create_index(
+        'ix_transactions_group_id_date_id', 'transactions', ['group_id', 'date', 'id'],
+        unique=False, postgresql_include=['amount', 'type']
+    )
+
+    # Notification pages ordered by created_at, with and without the unread filter
+    op.create_index(
+        'ix_notifications_user_id_is_read_created_at', 'notifications', ['user_id', 'is_read', 'created_at'],
+        unique=False
+    )
+    op.create_index(
+        'ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_created_at', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_is_read_created_at', table_name='notifications')
+    op.drop_index('ix_transactions_group_id_date_id', table_name='transactions')
+    op.drop_index('ix_group_members_group_id_user_id', table_name='group_members')
+    op.drop_constraint('uq_group_members_user_id_group_id', 'group_members', type_='unique')
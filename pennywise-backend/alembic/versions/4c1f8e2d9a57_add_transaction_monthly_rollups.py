@@ -0,0 +1,55 @@
+"""add transaction monthly rollups
+
+Revision ID: 4c1f8e2d9a57
+Revises: e3a9c5f17b42
+Create Date: 2026-10-17 23:41:12.064751
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1f8e2d9a57'
+down_revision: Union[str, None] = 'e3a9c5f17b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_monthly_rollups',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('type', postgresql.ENUM('INCOME', 'EXPENSE', name='transactiontype', create_type=False), nullable=False),
+        sa.Column('payment_mode', sa.String(), nullable=False),
+        sa.Column('total', sa.Numeric(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('group_id', 'month', 'category', 'type', 'payment_mode')
+    )
+
+    # Backfill from the existing transactions the way MonthlyRollupService.rebuild does
+    op.execute("""
+        INSERT INTO transaction_monthly_rollups
+            (group_id, month, category, type, payment_mode, total, transaction_count)
+        SELECT
+            group_id,
+            date_trunc('month', date, 'UTC'),
+            COALESCE(category, ''),
+            type,
+            COALESCE(payment_mode, ''),
+            SUM(amount::numeric),
+            COUNT(*)
+        FROM transactions
+        WHERE date IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('transaction_monthly_rollups')
@@ -0,0 +1,59 @@
+"""add transaction content hash
+
+Revision ID: 5d2e8b71c0f3
+Revises: f98036167d4b
+Create Date: 2026-10-17 17:08:52.614270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8b71c0f3'
+down_revision: Union[str, None] = 'f98036167d4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every transaction's hash, from the key built by transaction_content_key (dates as whole
+# UTC seconds since the epoch), numbering identical rows by id the way assign_content_hashes
+# numbers them within an upload
+CONTENT_HASHES = """
+    WITH keyed AS (
+        SELECT id, concat_ws('|',
+            group_id,
+            coalesce(floor(extract(epoch FROM date AT TIME ZONE 'UTC'))::bigint::text, ''),
+            round(amount * 100)::bigint,
+            coalesce(note, ''),
+            coalesce(paid_by::text, '')
+        ) AS content_key
+        FROM transactions
+    ), numbered AS (
+        SELECT id, content_key || '|' || (row_number() OVER (PARTITION BY content_key ORDER BY id) - 1) AS hash_input
+        FROM keyed
+    )
+    SELECT id, encode(sha256(convert_to(hash_input, 'UTF8')), 'hex') AS content_hash
+    FROM numbered
+"""
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.execute(f"""
+        UPDATE transactions
+        SET content_hash = hashes.content_hash
+        FROM ({CONTENT_HASHES}) AS hashes
+        WHERE transactions.id = hashes.id
+    """)
+    op.create_unique_constraint('uq_transactions_content_hash', 'transactions', ['content_hash'])
+
+    op.add_column('import_jobs', sa.Column('rows_skipped', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'rows_skipped')
+    op.drop_constraint('uq_transactions_content_hash', 'transactions', type_='unique')
+    op.drop_column('transactions', 'content_hash')
@@ -0,0 +1,56 @@
+"""split expenses among members at the time
+
+Revision ID: 6e1b9c4d2f58
+Revises: d41f7a3b6e20
+Create Date: 2026-10-20 11:08:23.904617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1b9c4d2f58'
+down_revision: Union[str, None] = 'd41f7a3b6e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing members and transactions get the same timestamp, so the expenses written
+    # so far stay shared by all of the current members
+    op.add_column('group_members', sa.Column(
+        'joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+    ))
+    op.add_column('transactions', sa.Column(
+        'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+    ))
+    op.add_column('group_member_ledgers', sa.Column('owed_total', sa.Numeric(), server_default='0', nullable=False))
+    op.alter_column('group_member_ledgers', 'owed_total', server_default=None)
+
+    # Backfill the shares the way MemberLedgerService.rebuild does
+    op.execute("""
+        INSERT INTO group_member_ledgers (group_id, user_id, paid_total, expense_count, owed_total)
+        SELECT group_id, user_id, 0, 0, SUM(
+            div(cents, sharer_count) + CASE WHEN position <= mod(cents, sharer_count) THEN 1 ELSE 0 END
+        ) / 100
+        FROM (
+            SELECT t.group_id, m.user_id, round(t.amount::numeric * 100) AS cents,
+                   row_number() OVER (PARTITION BY t.id ORDER BY m.user_id) AS position,
+                   count(*) OVER (PARTITION BY t.id) AS sharer_count
+            FROM transactions t
+            JOIN group_members m ON m.group_id = t.group_id
+            WHERE t.type = 'EXPENSE' AND t.paid_by IS NOT NULL
+        ) AS sharers
+        GROUP BY group_id, user_id
+        ON CONFLICT (group_id, user_id) DO UPDATE SET owed_total = EXCLUDED.owed_total
+    """)
+    op.execute("DELETE FROM group_member_ledgers WHERE expense_count = 0 AND owed_total = 0")
+
+
+def downgrade() -> None:
+    op.drop_column('group_member_ledgers', 'owed_total')
+    op.drop_column('transactions', 'created_at')
+    op.drop_column('group_members', 'joined_at')
@@ -0,0 +1,44 @@
+"""add group member ledgers
+
+Revision ID: 9b2d6e4f1c83
+Revises: 4c1f8e2d9a57
+Create Date: 2026-10-18 10:12:47.381205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d6e4f1c83'
+down_revision: Union[str, None] = '4c1f8e2d9a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'group_member_ledgers',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('paid_total', sa.Numeric(), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('group_id', 'user_id')
+    )
+
+    # Backfill from the existing transactions the way MemberLedgerService.rebuild does
+    op.execute("""
+        INSERT INTO group_member_ledgers (group_id, user_id, paid_total, expense_count)
+        SELECT group_id, paid_by, SUM(amount::numeric), COUNT(*)
+        FROM transactions
+        WHERE type = 'EXPENSE' AND paid_by IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('group_member_ledgers')
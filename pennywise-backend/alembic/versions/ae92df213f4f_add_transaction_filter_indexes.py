@@ -0,0 +1,41 @@
+"""add transaction filter indexes
+
+Revision ID: ae92df213f4f
+Revises: 3f13a410d145
+Create Date: 2026-10-17 13:41:07.532190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae92df213f4f'
+down_revision: Union[str, None] = '3f13a410d145'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Equality filters on the transactions listing, keeping the (date, id) order for pagination.
+    # Date range, type and amount filters use ix_transactions_group_id_date_id.
+    op.create_index(
+        'ix_transactions_group_id_category_date_id', 'transactions', ['group_id', 'category', 'date', 'id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_transactions_group_id_payment_mode_date_id', 'transactions', ['group_id', 'payment_mode', 'date', 'id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_transactions_group_id_paid_by_date_id', 'transactions', ['group_id', 'paid_by', 'date', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_group_id_paid_by_date_id', table_name='transactions')
+    op.drop_index('ix_transactions_group_id_payment_mode_date_id', table_name='transactions')
+    op.drop_index('ix_transactions_group_id_category_date_id', table_name='transactions')
@@ -0,0 +1,49 @@
+"""add group stats table
+
+Revision ID: b7c4e91d2a36
+Revises: 5d2e8b71c0f3
+Create Date: 2026-10-17 19:24:05.381142
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c4e91d2a36'
+down_revision: Union[str, None] = '5d2e8b71c0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'group_stats',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('income_total', sa.Numeric(), nullable=False),
+        sa.Column('expense_total', sa.Numeric(), nullable=False),
+        sa.Column('last_transaction_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('group_id')
+    )
+
+    # Backfill every group the way GroupStatsService.rebuild does
+    op.execute("""
+        INSERT INTO group_stats (group_id, transaction_count, income_total, expense_total, last_transaction_at)
+        SELECT
+            g.id,
+            COUNT(t.id),
+            COALESCE(SUM(t.amount::numeric) FILTER (WHERE t.type = 'INCOME'), 0),
+            COALESCE(SUM(t.amount::numeric) FILTER (WHERE t.type = 'EXPENSE'), 0),
+            MAX(t.date)
+        FROM groups g
+        LEFT JOIN transactions t ON t.group_id = g.id
+        GROUP BY g.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('group_stats')
@@ -0,0 +1,28 @@
+"""store import uploads on jobs
+
+Revision ID: d41f7a3b6e20
+Revises: 9b2d6e4f1c83
+Create Date: 2026-10-19 09:41:06.527314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7a3b6e20'
+down_revision: Union[str, None] = '9b2d6e4f1c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Uploads of jobs still pending were spooled to the old worker's disk; they fail with
+    # "no longer available" and have to be uploaded again
+    op.add_column('import_jobs', sa.Column('upload', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'upload')
@@ -0,0 +1,26 @@
+"""add group stats version
+
+Revision ID: e3a9c5f17b42
+Revises: b7c4e91d2a36
+Create Date: 2026-10-17 21:02:47.518309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c5f17b42'
+down_revision: Union[str, None] = 'b7c4e91d2a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('group_stats', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('group_stats', 'version')
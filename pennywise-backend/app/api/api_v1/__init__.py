@@ -1,10 +1,7 @@
 # API v1 package 
 from fastapi import APIRouter
-from .endpoints import health, auth
-from .endpoints.transactions import router as transactions
-from .endpoints.groups import router as groups
-from .endpoints.dashboard import router as dashboard
-from .endpoints.notifications import router as notifications
+from app.core.config import settings
+from .endpoints import health, auth, transactions, groups, dashboard, notifications, reports, analytics
 from .endpoints.ai import router as ai_router
 from .endpoints.utils import router as utils_router
 
@@ -16,17 +13,30 @@ api_router.include_router(health.router, prefix="/health", tags=["health"])
 # Include auth endpoints
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 
+# Read-heavy endpoints come in sync and async versions; DB_ASYNC_ENABLED picks the async ones
+def read_router(module):
+    return module.async_read_router if settings.DB_ASYNC_ENABLED else module.read_router
+
 # Include transactions endpoints
-api_router.include_router(transactions, prefix="/transactions", tags=["transactions"])
+api_router.include_router(read_router(transactions), prefix="/transactions", tags=["transactions"])
+api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
 
 # Include groups endpoints
-api_router.include_router(groups, prefix="/groups", tags=["groups"])
+api_router.include_router(read_router(groups), prefix="/groups", tags=["groups"])
+api_router.include_router(groups.router, prefix="/groups", tags=["groups"])
 
 # Include dashboard endpoints
-api_router.include_router(dashboard, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(read_router(dashboard), prefix="/dashboard", tags=["dashboard"])
+
+# Include reports endpoints
+api_router.include_router(read_router(reports), prefix="/reports", tags=["reports"])
+
+# Include analytics endpoints
+api_router.include_router(read_router(analytics), prefix="/analytics", tags=["analytics"])
 
 # Include notifications endpoints
-api_router.include_router(notifications, prefix="/notifications", tags=["notifications"])
+api_router.include_router(read_router(notifications), prefix="/notifications", tags=["notifications"])
+api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 
 # AI endpoints (no extra prefix)
 api_router.include_router(ai_router, tags=["ai"])
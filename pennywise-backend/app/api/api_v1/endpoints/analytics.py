@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.api.api_v1.endpoints.auth import get_async_read_db, get_current_user_async, get_current_user_read, get_read_db
+from app.api.api_v1.endpoints.conditional import if_analytics_changed, if_analytics_changed_async
+from app.constants.transactions import AnalyticsGranularity
+from app.schemas.analytics import AnalyticsResponse
+from app.schemas.auth import UserResponse
+from app.services.analytics_service import AnalyticsService, AsyncAnalyticsService
+
+# Analytics are reads; the async version is mounted instead when DB_ASYNC_ENABLED is set
+read_router = APIRouter()
+async_read_router = APIRouter()
+
+
+@read_router.get("/", response_model=AnalyticsResponse, dependencies=[Depends(if_analytics_changed)])
+def get_analytics(
+    granularity: AnalyticsGranularity = Query(AnalyticsGranularity.MONTHLY, description="Bucket size: daily or monthly"),
+    group_id: Optional[int] = Query(None, description="Analyse one group instead of each of the user's groups"),
+    periods: Optional[int] = Query(None, ge=2, le=366, description="Number of buckets, up to the current one (default 30 days or 12 months)"),
+    window: Optional[int] = Query(None, ge=1, le=90, description="Buckets per moving average and growth window (default 7 days or 3 months)"),
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
+):
+    """Get moving averages, trend lines, month-end projections and category growth per group."""
+    analytics_service = AnalyticsService(db)
+    return analytics_service.get_analytics(current_user.id, granularity, group_id, periods, window)
+
+
+@async_read_router.get("/", response_model=AnalyticsResponse, dependencies=[Depends(if_analytics_changed_async)])
+async def get_analytics_async(
+    granularity: AnalyticsGranularity = Query(AnalyticsGranularity.MONTHLY, description="Bucket size: daily or monthly"),
+    group_id: Optional[int] = Query(None, description="Analyse one group instead of each of the user's groups"),
+    periods: Optional[int] = Query(None, ge=2, le=366, description="Number of buckets, up to the current one (default 30 days or 12 months)"),
+    window: Optional[int] = Query(None, ge=1, le=90, description="Buckets per moving average and growth window (default 7 days or 3 months)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get moving averages, trend lines, month-end projections and category growth per group."""
+    analytics_service = AsyncAnalyticsService(db)
+    return await analytics_service.get_analytics(current_user.id, granularity, group_id, periods, window)
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import (
+    AsyncSessionLocal, SessionLocal, async_read_session, get_db, note_writer, read_session, reads_from_replica
+)
 from app.core.config import settings
+from app.models.user import User
 from app.services.auth_service import AuthService
 from app.schemas.auth import UserCreate, UserLogin, Token, UserResponse, GoogleAuthRequest, TokenRefresh
 from app.utils.auth import verify_token, verify_refresh_token
@@ -13,12 +17,11 @@ router = APIRouter()
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+async def get_token_user_id(
     request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> Optional[UserResponse]:
-    """Get current authenticated user."""
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> int:
+    """Get the user ID from the access token, without touching the database."""
     token = None
     
     # First try to get token from Authorization header
@@ -51,25 +54,86 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     try:
-        user_id_int = int(user_id)
+        return int(user_id)
     except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID in token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(user_id_int)
+
+
+def _require_user(user: Optional[User]) -> UserResponse:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
     return UserResponse.from_orm(user)
 
 
+def get_current_user(
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_db)
+) -> Optional[UserResponse]:
+    """Get current authenticated user."""
+    auth_service = AuthService(db)
+    # Commits on this request's session are the user's writes, starting their replica stickiness window
+    note_writer(db, user_id)
+    try:
+        return _require_user(auth_service.get_user_by_id(user_id))
+    finally:
+        # The endpoint shares this session but runs in another threadpool hop; holding the connection
+        # across it lets a burst check out the whole pool while requests wait on threads, stalling until
+        # the pool timeout. Ending the read-only transaction returns the connection in between.
+        db.rollback()
+
+
+def get_read_db(user_id: int = Depends(get_token_user_id)):
+    """Session for the read-only endpoints, on the replica when one is configured (see read_session)."""
+    db = read_session(user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(user_id: int = Depends(get_token_user_id)):
+    """AsyncSession for the read-only endpoints served with DB_ASYNC_ENABLED."""
+    async with async_read_session(user_id) as db:
+        yield db
+
+
+def get_current_user_read(
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> UserResponse:
+    """Get current authenticated user on the read session, for the read-only endpoints."""
+    try:
+        user = AuthService(db).get_user_by_id(user_id)
+        if user is None and reads_from_replica(db):
+            # A user who just signed up may not have reached the replica yet
+            with SessionLocal() as primary:
+                user = AuthService(primary).get_user_by_id(user_id)
+        return _require_user(user)
+    finally:
+        # Release the connection between threadpool hops, as in get_current_user
+        db.rollback()
+
+
+async def get_current_user_async(
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> UserResponse:
+    """Get current authenticated user on the async read session, for endpoints served with DB_ASYNC_ENABLED."""
+    user = await db.get(User, user_id)
+    if user is None and reads_from_replica(db):
+        async with AsyncSessionLocal() as primary:
+            user = await primary.get(User, user_id)
+    return _require_user(user)
+
+
 @router.post("/register", response_model=Token)
 def register(user_data: UserCreate, response: Response, db: Session = Depends(get_db)):
     """Register a new user with email and password."""
@@ -0,0 +1,139 @@
+"""Conditional GET dependencies for the read endpoints.
+
+Each dependency derives the response's ETag from version stamps (see VersionService)
+and answers 304 Not Modified when the client already has it, before the endpoint
+runs any of its queries. Declare it ahead of the endpoint's other dependencies so
+a 304 skips them too. Endpoints returning a Response themselves pass the returned
+headers on to it.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.api.api_v1.endpoints.auth import get_async_read_db, get_read_db, get_token_user_id
+from app.core.config import settings
+from app.services.version_service import AsyncVersionService, VersionService
+from app.utils.etags import REVALIDATE, etag_matches, make_etag
+
+
+def check_etag(request: Request, response: Response, etag: str, cache_control: str = REVALIDATE) -> Dict[str, str]:
+    """Raise 304 if the request's If-None-Match has the ETag, else set and return the caching headers."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
+def check_group_versions(
+    request: Request, response: Response, user_id: int, db: Session, *extra: Any, cache_control: str = REVALIDATE
+) -> Dict[str, str]:
+    """check_etag for a response derived from the user's groups."""
+    try:
+        versions = VersionService(db).get_group_versions(user_id)
+    finally:
+        # Release the connection between threadpool hops, as in get_current_user
+        db.rollback()
+    etag = make_etag(user_id, request.url.path, request.url.query, versions, *extra)
+    return check_etag(request, response, etag, cache_control)
+
+
+async def check_group_versions_async(
+    request: Request, response: Response, user_id: int, db: AsyncSession, *extra: Any, cache_control: str = REVALIDATE
+) -> Dict[str, str]:
+    """check_group_versions on an AsyncSession."""
+    versions = await AsyncVersionService(db).get_group_versions(user_id)
+    etag = make_etag(user_id, request.url.path, request.url.query, versions, *extra)
+    return check_etag(request, response, etag, cache_control)
+
+
+def _activity_window() -> int:
+    # The dashboard counts the last 7 days, so its ETag also turns over as often as its server-side cache expires
+    return int(time.time() // max(settings.DASHBOARD_CACHE_TTL_SECONDS, 1))
+
+
+def if_groups_changed(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """ETag for responses derived from the user's groups and their transactions."""
+    return check_group_versions(request, response, user_id, db)
+
+
+async def if_groups_changed_async(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Dict[str, str]:
+    """if_groups_changed on the async read session."""
+    return await check_group_versions_async(request, response, user_id, db)
+
+
+def if_dashboard_stats_changed(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """ETag for the dashboard stats, whose recent activity count also moves with time."""
+    return check_group_versions(request, response, user_id, db, _activity_window())
+
+
+async def if_dashboard_stats_changed_async(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Dict[str, str]:
+    """if_dashboard_stats_changed on the async read session."""
+    return await check_group_versions_async(request, response, user_id, db, _activity_window())
+
+
+def if_analytics_changed(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """ETag for the analytics, whose current bucket and projections also move with the date."""
+    return check_group_versions(request, response, user_id, db, datetime.now(timezone.utc).date())
+
+
+async def if_analytics_changed_async(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Dict[str, str]:
+    """if_analytics_changed on the async read session."""
+    return await check_group_versions_async(request, response, user_id, db, datetime.now(timezone.utc).date())
+
+
+def if_notifications_changed(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """ETag for responses derived from the user's notifications."""
+    try:
+        version = VersionService(db).get_notification_version(user_id)
+    finally:
+        db.rollback()
+    return check_etag(request, response, make_etag(user_id, request.url.path, request.url.query, version))
+
+
+async def if_notifications_changed_async(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Dict[str, str]:
+    """if_notifications_changed on the async read session."""
+    version = await AsyncVersionService(db).get_notification_version(user_id)
+    return check_etag(request, response, make_etag(user_id, request.url.path, request.url.query, version))
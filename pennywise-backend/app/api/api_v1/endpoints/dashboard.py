@@ -1,30 +1,60 @@
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
 from app.schemas.auth import UserResponse
-from app.services.dashboard_service import DashboardService, RecentTransaction
-from app.api.api_v1.endpoints.auth import get_current_user
+from app.services.dashboard_service import AsyncDashboardService, DashboardService, RecentTransaction
+from app.api.api_v1.endpoints.auth import get_async_read_db, get_current_user_async, get_current_user_read, get_read_db
+from app.api.api_v1.endpoints.conditional import (
+    if_dashboard_stats_changed, if_dashboard_stats_changed_async, if_groups_changed, if_groups_changed_async
+)
 from typing import List
 
-router = APIRouter()
+# Every dashboard endpoint is a read; the async versions are mounted instead when DB_ASYNC_ENABLED is set
+read_router = APIRouter()
+async_read_router = APIRouter()
 
 
-@router.get("/recent-transactions", response_model=List[RecentTransaction])
+@read_router.get(
+    "/recent-transactions", response_model=List[RecentTransaction], dependencies=[Depends(if_groups_changed)]
+)
 def get_recent_transactions(
     limit: int = Query(5, ge=1, le=50, description="Number of recent transactions to return"),
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
     """Get recent transactions from all user's groups."""
     dashboard_service = DashboardService(db)
     return dashboard_service.get_recent_transactions(current_user.id, limit)
 
 
-@router.get("/stats")
+@read_router.get("/stats", dependencies=[Depends(if_dashboard_stats_changed)])
 def get_dashboard_stats(
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
     """Get comprehensive dashboard statistics for the current user."""
     dashboard_service = DashboardService(db)
-    return dashboard_service.get_user_dashboard_stats(current_user.id) 
\ No newline at end of file
+    return dashboard_service.get_user_dashboard_stats(current_user.id)
+
+
+@async_read_router.get(
+    "/recent-transactions", response_model=List[RecentTransaction], dependencies=[Depends(if_groups_changed_async)]
+)
+async def get_recent_transactions_async(
+    limit: int = Query(5, ge=1, le=50, description="Number of recent transactions to return"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get recent transactions from all user's groups."""
+    dashboard_service = AsyncDashboardService(db)
+    return await dashboard_service.get_recent_transactions(current_user.id, limit)
+
+
+@async_read_router.get("/stats", dependencies=[Depends(if_dashboard_stats_changed_async)])
+async def get_dashboard_stats_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get comprehensive dashboard statistics for the current user."""
+    dashboard_service = AsyncDashboardService(db)
+    return await dashboard_service.get_user_dashboard_stats(current_user.id)
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.schemas.auth import UserResponse
+from app.schemas.balance import GroupBalances, SettleUpResponse
 from app.schemas.group import GroupCreate, GroupResponse
-from app.services.group_service import GroupService, GroupStats
-from app.api.api_v1.endpoints.auth import get_current_user
+from app.services.balance_service import AsyncBalanceService, BalanceService
+from app.services.group_service import AsyncGroupService, GroupService, GroupStats
+from app.api.api_v1.endpoints.auth import (
+    get_async_read_db, get_current_user, get_current_user_async, get_current_user_read, get_read_db
+)
+from app.api.api_v1.endpoints.conditional import if_groups_changed, if_groups_changed_async
 from typing import List
 from pydantic import BaseModel
 
@@ -15,6 +21,9 @@ class UpdateGroupRequest(BaseModel):
     name: str
 
 router = APIRouter()
+# Group stats and balance reads, mounted ahead of `router`; async_read_router replaces read_router when DB_ASYNC_ENABLED is set
+read_router = APIRouter()
+async_read_router = APIRouter()
 
 
 @router.post("/", response_model=GroupResponse)
@@ -38,21 +47,21 @@ def list_user_groups(
     return group_service.get_user_groups(current_user.id)
 
 
-@router.get("/stats", response_model=List[GroupStats])
+@read_router.get("/stats", response_model=List[GroupStats], dependencies=[Depends(if_groups_changed)])
 def get_user_groups_with_stats(
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
     """Get all groups with statistics where the current user is a member."""
     group_service = GroupService(db)
     return group_service.get_user_groups_with_stats(current_user.id)
 
 
-@router.get("/{group_id}/stats", response_model=GroupStats)
+@read_router.get("/{group_id}/stats", response_model=GroupStats, dependencies=[Depends(if_groups_changed)])
 def get_group_stats(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
     """Get detailed statistics for a specific group."""
     group_service = GroupService(db)
@@ -67,6 +76,85 @@ def get_group_stats(
     return group_stats
 
 
+@read_router.get("/{group_id}/balances", response_model=GroupBalances, dependencies=[Depends(if_groups_changed)])
+def get_group_balances(
+    group_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
+):
+    """Get what each member has paid, their equal share and their balance."""
+    balance_service = BalanceService(db)
+    return balance_service.get_balances(group_id, current_user.id)
+
+
+@read_router.get("/{group_id}/settle-up", response_model=SettleUpResponse, dependencies=[Depends(if_groups_changed)])
+def settle_up_group(
+    group_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
+):
+    """Get the member balances and the transfers that settle them."""
+    balance_service = BalanceService(db)
+    return balance_service.settle_up(group_id, current_user.id)
+
+
+@async_read_router.get("/stats", response_model=List[GroupStats], dependencies=[Depends(if_groups_changed_async)])
+async def get_user_groups_with_stats_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get all groups with statistics where the current user is a member."""
+    group_service = AsyncGroupService(db)
+    return await group_service.get_user_groups_with_stats(current_user.id)
+
+
+@async_read_router.get(
+    "/{group_id}/stats", response_model=GroupStats, dependencies=[Depends(if_groups_changed_async)]
+)
+async def get_group_stats_async(
+    group_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get detailed statistics for a specific group."""
+    group_service = AsyncGroupService(db)
+    group_stats = await group_service.get_group_with_stats(group_id, current_user.id)
+    
+    if not group_stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found or you don't have access"
+        )
+    
+    return group_stats
+
+
+@async_read_router.get(
+    "/{group_id}/balances", response_model=GroupBalances, dependencies=[Depends(if_groups_changed_async)]
+)
+async def get_group_balances_async(
+    group_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get what each member has paid, their equal share and their balance."""
+    balance_service = AsyncBalanceService(db)
+    return await balance_service.get_balances(group_id, current_user.id)
+
+
+@async_read_router.get(
+    "/{group_id}/settle-up", response_model=SettleUpResponse, dependencies=[Depends(if_groups_changed_async)]
+)
+async def settle_up_group_async(
+    group_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get the member balances and the transfers that settle them."""
+    balance_service = AsyncBalanceService(db)
+    return await balance_service.settle_up(group_id, current_user.id)
+
+
 @router.post("/{group_id}/invite")
 def invite_user_to_group(
     group_id: int,
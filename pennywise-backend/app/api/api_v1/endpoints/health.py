@@ -1,6 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import async_engine, async_replica_engine, engine, get_db, replica_engine
+from app.core.pool_metrics import get_pool_metrics
+from app.services.dashboard_service import dashboard_stats_cache
+from app.services.membership_service import membership_cache
+from app.services.transaction_service import transaction_count_cache
 
 router = APIRouter()
 
@@ -27,4 +31,31 @@ def database_health_check(db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=500,
             detail=f"Database connection failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/db/pool")
+def database_pool_metrics():
+    """
+    Connection pool usage and checkout wait metrics, per engine
+    """
+    pools = {"primary": engine.pool}
+    if replica_engine is not None:
+        pools["replica"] = replica_engine.pool
+    for name, async_pool_engine in [("async", async_engine), ("async-replica", async_replica_engine)]:
+        if async_pool_engine is not None:
+            pools[name] = async_pool_engine.sync_engine.pool
+    return {name: get_pool_metrics(name).snapshot(pool) for name, pool in pools.items()}
+
+
+@router.get("/cache")
+def cache_metrics():
+    """
+    Entries and hit/miss counters of this process's in-memory caches
+    """
+    caches = {
+        "dashboard_stats": dashboard_stats_cache,
+        "transaction_counts": transaction_count_cache,
+        "memberships": membership_cache
+    }
+    return {name: cache.stats() for name, cache in caches.items()}
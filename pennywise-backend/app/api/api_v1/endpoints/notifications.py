@@ -1,24 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.core.database import get_db
-from app.services.notification_service import NotificationService
+from app.services.group_stats_service import GroupStatsService
+from app.services.membership_service import MembershipService, invalidate_user_memberships
+from app.services.notification_service import AsyncNotificationService, NotificationService
+from app.services.transaction_service import invalidate_user_caches
 from app.schemas.notification import NotificationResponse, NotificationListResponse
-from app.api.api_v1.endpoints.auth import get_current_user
+from app.api.api_v1.endpoints.auth import (
+    get_async_read_db, get_current_user, get_current_user_async, get_current_user_read, get_read_db
+)
+from app.api.api_v1.endpoints.conditional import if_notifications_changed, if_notifications_changed_async
 from app.schemas.auth import UserResponse
 from app.models.notification import Notification
 from app.models.group_member import GroupMember
 
 router = APIRouter()
+# Notification reads; async_read_router replaces read_router when DB_ASYNC_ENABLED is set
+read_router = APIRouter()
+async_read_router = APIRouter()
 
 
-@router.get("/", response_model=NotificationListResponse)
+@read_router.get("/", response_model=NotificationListResponse, dependencies=[Depends(if_notifications_changed)])
 def get_notifications(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     unread_only: bool = Query(False),
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
     """Get notifications for the current user"""
     notifications, total_count, unread_count = NotificationService.get_user_notifications(
@@ -36,16 +46,52 @@ def get_notifications(
     )
 
 
-@router.get("/unread-count")
+@read_router.get("/unread-count", dependencies=[Depends(if_notifications_changed)])
 def get_unread_count(
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
     """Get the count of unread notifications"""
     count = NotificationService.get_unread_count(db, current_user.id)
     return {"unread_count": count}
 
 
+@async_read_router.get(
+    "/", response_model=NotificationListResponse, dependencies=[Depends(if_notifications_changed_async)]
+)
+async def get_notifications_async(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    unread_only: bool = Query(False),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get notifications for the current user"""
+    notifications, total_count, unread_count = await AsyncNotificationService.get_user_notifications(
+        db=db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        unread_only=unread_only
+    )
+    
+    return NotificationListResponse(
+        notifications=[NotificationResponse.from_orm(notification) for notification in notifications],
+        total_count=total_count,
+        unread_count=unread_count
+    )
+
+
+@async_read_router.get("/unread-count", dependencies=[Depends(if_notifications_changed_async)])
+async def get_unread_count_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get the count of unread notifications"""
+    count = await AsyncNotificationService.get_unread_count(db, current_user.id)
+    return {"unread_count": count}
+
+
 @router.put("/mark-all-read")
 def mark_all_notifications_as_read(
     db: Session = Depends(get_db),
@@ -113,12 +159,7 @@ def accept_group_invitation(
     group_id = notification.action_data["group_id"]
     
     # Check if user is already a member of the group
-    existing_member = db.query(GroupMember).filter(
-        GroupMember.user_id == current_user.id,
-        GroupMember.group_id == group_id
-    ).first()
-    
-    if existing_member:
+    if MembershipService(db).is_member(current_user.id, group_id):
         # Delete notification and return
         db.delete(notification)
         db.commit()
@@ -132,10 +173,14 @@ def accept_group_invitation(
     )
     db.add(new_member)
     
+    GroupStatsService(db).touch(group_id)
+
     # Delete the notification after successful action
     db.delete(notification)
     
     db.commit()
+    invalidate_user_memberships(current_user.id)
+    invalidate_user_caches(current_user.id)
     
     return {"message": "Successfully joined the group"}
 
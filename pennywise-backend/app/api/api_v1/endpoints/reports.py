@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.api.api_v1.endpoints.auth import get_async_read_db, get_current_user_async, get_current_user_read, get_read_db
+from app.api.api_v1.endpoints.transactions import (
+    get_transaction_filters, if_transactions_changed, if_transactions_changed_async
+)
+from app.constants.transactions import ReportPeriod
+from app.schemas.auth import UserResponse
+from app.schemas.report import ReportResponse
+from app.schemas.transaction import TransactionFilters
+from app.services.report_service import AsyncReportService, ReportService
+
+# Reports are reads; the async version is mounted instead when DB_ASYNC_ENABLED is set
+read_router = APIRouter()
+async_read_router = APIRouter()
+
+
+@read_router.get("/", response_model=ReportResponse, dependencies=[Depends(if_transactions_changed)])
+def get_report(
+    period: ReportPeriod = Query(ReportPeriod.MONTHLY, description="Bucket size: weekly, monthly or yearly"),
+    group_id: Optional[int] = Query(None, description="Report on one group instead of all of the user's groups"),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
+):
+    """Get totals, category breakdown and income/expense ratio per week, month or year."""
+    report_service = ReportService(db)
+    return report_service.get_report(current_user.id, period, group_id, filters)
+
+
+@async_read_router.get("/", response_model=ReportResponse, dependencies=[Depends(if_transactions_changed_async)])
+async def get_report_async(
+    period: ReportPeriod = Query(ReportPeriod.MONTHLY, description="Bucket size: weekly, monthly or yearly"),
+    group_id: Optional[int] = Query(None, description="Report on one group instead of all of the user's groups"),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get totals, category breakdown and income/expense ratio per week, month or year."""
+    report_service = AsyncReportService(db)
+    return await report_service.get_report(current_user.id, period, group_id, filters)
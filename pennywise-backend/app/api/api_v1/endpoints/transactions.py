@@ -1,14 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, lift_timeouts, read_session
 from app.schemas.auth import UserResponse
-from app.schemas.transaction import TransactionCreate, TransactionResponse, BulkTransactionCreate, PaginatedTransactionResponse, TransactionUpdate
-from app.services.transaction_service import TransactionService
-from app.api.api_v1.endpoints.auth import get_current_user
-from typing import List, Optional
+from app.schemas.transaction import TransactionCreate, TransactionResponse, BulkTransactionCreate, BulkTransactionResult, BulkTransactionUpdate, BulkTransactionDelete, BulkTransactionChangeResult, ImportJobResponse, MonthViewResponse, PaginatedTransactionResponse, TransactionUpdate, TransactionPatch, TransactionFilters, TransactionSearchResponse
+from app.services.transaction_service import AsyncTransactionService, TransactionService
+from app.services.import_job_service import ImportJobService
+from app.services.month_view_service import AsyncMonthViewService, MonthBounds, MonthViewService, month_bounds
+from app.api.api_v1.endpoints.auth import (
+    get_async_read_db, get_current_user, get_current_user_async, get_current_user_read, get_read_db, get_token_user_id
+)
+from app.api.api_v1.endpoints.conditional import check_group_versions, check_group_versions_async
+from app.core.config import settings
+from app.constants.transactions import CountStrategy, TransactionType
+from app.utils.etags import closed_months_cache_control
+from app.utils.pagination import encode_cursor
+from app.utils.responses import RawJSONResponse
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
 from fastapi import File, UploadFile, Form
 
 router = APIRouter()
+# The listing read, mounted ahead of `router`; async_read_router replaces read_router when DB_ASYNC_ENABLED is set
+read_router = APIRouter()
+async_read_router = APIRouter()
+
+# Rows fetched per round trip from the server-side cursor when streaming all transactions
+STREAM_BATCH_SIZE = 1000
 
 
 @router.post("/", response_model=TransactionResponse)
@@ -19,21 +39,60 @@ def create_transaction(
 ):
     """Create a new transaction."""
     transaction_service = TransactionService(db)
-    return transaction_service.create_transaction(transaction, current_user.id)
+    return RawJSONResponse(transaction_service.create_transaction(transaction, current_user.id))
 
 
-@router.post("/bulk", response_model=List[TransactionResponse])
+@router.post("/bulk", response_model=Union[List[TransactionResponse], BulkTransactionResult])
 def create_bulk_transactions(
     bulk_data: BulkTransactionCreate,
+    return_rows: bool = Query(True, description="Return the created transactions; false returns only their IDs, which is much cheaper for large batches"),
+    skip_duplicates: bool = Query(True, description="Skip transactions already created from identical content, so retried requests are safe"),
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    """Create multiple transactions in bulk (for CSV import)."""
+    """Create multiple transactions in bulk (for CSV import).
+
+    Skipped duplicates are returned as the existing transactions; the X-Inserted-Count and
+    X-Skipped-Count headers (or the counts in the ID-only body) tell them apart.
+    """
     transaction_service = TransactionService(db)
-    return transaction_service.create_bulk_transactions(bulk_data, current_user.id)
+    transaction_ids, inserted = transaction_service.create_bulk_transactions(
+        bulk_data, current_user.id, skip_duplicates=skip_duplicates
+    )
+    skipped = len(transaction_ids) - inserted
+    if not return_rows:
+        return RawJSONResponse({"inserted": inserted, "skipped": skipped, "ids": transaction_ids})
+    return RawJSONResponse(
+        transaction_service.get_transaction_rows(transaction_ids),
+        headers={"X-Inserted-Count": str(inserted), "X-Skipped-Count": str(skipped)}
+    )
 
 
-@router.post("/import-pennywise-csv", status_code=status.HTTP_200_OK)
+@router.patch("/bulk", response_model=BulkTransactionChangeResult)
+def update_bulk_transactions(
+    bulk_update: BulkTransactionUpdate,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Set the same fields on many transactions, reporting the outcome for each ID."""
+    transaction_service = TransactionService(db)
+    return RawJSONResponse(
+        transaction_service.update_transactions(bulk_update.ids, bulk_update.changes, current_user.id)
+    )
+
+
+@router.post("/bulk-delete", response_model=BulkTransactionChangeResult)
+def delete_bulk_transactions(
+    bulk_delete: BulkTransactionDelete,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Delete many transactions, reporting the outcome for each ID."""
+    transaction_service = TransactionService(db)
+    return RawJSONResponse(transaction_service.delete_transactions(bulk_delete.ids, current_user.id))
+
+
+@router.post("/import-pennywise-csv", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
 def import_pennywise_csv(
     file: UploadFile = File(...),
     group_id: int = Form(...),
@@ -41,59 +100,317 @@ def import_pennywise_csv(
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    """Import transactions from a Pennywise CSV export."""
+    """Queue an import of a Pennywise CSV export (optionally gzip-compressed); poll /import-jobs/{id} for progress."""
     import json
     try:
         mapping = json.loads(user_mapping)
     except json.JSONDecodeError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user_mapping JSON")
 
-    transaction_service = TransactionService(db)
-    imported_count = transaction_service.import_pennywise_csv(file, group_id, current_user.id, mapping)
-    return {"message": f"Successfully imported {imported_count} transactions.", "count": imported_count}
+    import_job_service = ImportJobService(db)
+    return import_job_service.create_job(file, group_id, current_user.id, mapping)
+
+
+@router.get("/import-jobs/{job_id}", response_model=ImportJobResponse)
+def get_import_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Get the status and progress of an import job."""
+    import_job_service = ImportJobService(db)
+    return import_job_service.get_job(job_id, current_user.id)
+
 
+def get_transaction_filters(
+    date_from: Optional[datetime] = Query(None, description="Only transactions on or after this date"),
+    date_to: Optional[datetime] = Query(None, description="Only transactions before this date"),
+    type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
+    category: Optional[List[str]] = Query(None, description="Filter by category (repeat for several)"),
+    payment_mode: Optional[List[str]] = Query(None, description="Filter by payment mode (repeat for several)"),
+    paid_by: Optional[List[int]] = Query(None, description="Filter by paying user ID (repeat for several)"),
+    amount_min: Optional[float] = Query(None, ge=0, description="Minimum amount (inclusive)"),
+    amount_max: Optional[float] = Query(None, ge=0, description="Maximum amount (inclusive)"),
+) -> TransactionFilters:
+    """Collect the transaction listing filters from the query string."""
+    if date_from and date_to and date_from >= date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be before date_to")
+    if amount_min is not None and amount_max is not None and amount_min > amount_max:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="amount_min must not exceed amount_max")
+    return TransactionFilters(
+        date_from=date_from,
+        date_to=date_to,
+        type=type,
+        categories=category,
+        payment_modes=payment_mode,
+        paid_by=paid_by,
+        amount_min=amount_min,
+        amount_max=amount_max
+    )
 
-@router.get("/", response_model=PaginatedTransactionResponse)
+
+def if_transactions_changed(
+    request: Request,
+    response: Response,
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """ETag for the listing; listings of closed months may also be reused without asking."""
+    cache_control = closed_months_cache_control(filters.date_to, settings.CLOSED_MONTH_CACHE_MAX_AGE_SECONDS)
+    return check_group_versions(request, response, user_id, db, cache_control=cache_control)
+
+
+async def if_transactions_changed_async(
+    request: Request,
+    response: Response,
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Dict[str, str]:
+    """if_transactions_changed on the async read session."""
+    cache_control = closed_months_cache_control(filters.date_to, settings.CLOSED_MONTH_CACHE_MAX_AGE_SECONDS)
+    return await check_group_versions_async(request, response, user_id, db, cache_control=cache_control)
+
+
+def get_month_bounds(
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Month as YYYY-MM; the current month by default"),
+    time_zone: str = Query("UTC", description="IANA time zone the month starts and ends in, e.g. Asia/Kolkata")
+) -> MonthBounds:
+    return month_bounds(month, time_zone)
+
+
+def if_month_view_changed(
+    request: Request,
+    response: Response,
+    bounds: MonthBounds = Depends(get_month_bounds),
+    user_id: int = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """ETag for the month view; the resolved month is part of it, since the default one changes over time."""
+    cache_control = closed_months_cache_control(bounds.end, settings.CLOSED_MONTH_CACHE_MAX_AGE_SECONDS)
+    return check_group_versions(request, response, user_id, db, bounds.month, cache_control=cache_control)
+
+
+async def if_month_view_changed_async(
+    request: Request,
+    response: Response,
+    bounds: MonthBounds = Depends(get_month_bounds),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Dict[str, str]:
+    """if_month_view_changed on the async read session."""
+    cache_control = closed_months_cache_control(bounds.end, settings.CLOSED_MONTH_CACHE_MAX_AGE_SECONDS)
+    return await check_group_versions_async(request, response, user_id, db, bounds.month, cache_control=cache_control)
+
+
+@read_router.get("/", response_model=PaginatedTransactionResponse)
 def list_transactions(
     group_id: Optional[int] = Query(None, description="Filter by group ID"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    all: Optional[bool] = Query(False, description="Return all transactions for the user (ignore skip/limit)"),
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, ignores skip)"),
+    all: Optional[bool] = Query(False, description="Stream all transactions for the user (ignore skip/limit/cursor)"),
+    count_strategy: CountStrategy = Query(CountStrategy.EXACT, description="How to compute the total: exact, window, cached or none (total omitted)"),
+    cache_headers: Dict[str, str] = Depends(if_transactions_changed),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
 ):
-    """Get transactions for the current user with optional group filtering."""
+    """Get transactions for the current user with optional group and field filtering."""
     transaction_service = TransactionService(db)
+    next_cursor = None
     if all:
-        # Get all transactions for the user (with group filter if provided)
-        transactions, total_count = transaction_service.get_user_transactions_with_count(
+        # Stream all transactions for the user (with group filter if provided)
+        group_ids = transaction_service.get_accessible_group_ids(current_user.id, group_id)
+        return StreamingResponse(
+            _stream_all_transactions(current_user.id, group_ids, filters), media_type="application/json", headers=cache_headers
+        )
+    if cursor:
+        # Keyset pagination: constant cost per page, no total count
+        transactions, next_cursor = transaction_service.get_user_transactions_page(
             user_id=current_user.id,
             group_id=group_id,
-            skip=0,
-            limit=10**6  # Arbitrary large number to get all
+            cursor=cursor,
+            limit=limit,
+            filters=filters
+        )
+        return _transactions_page_response(
+            transactions, None, 0, limit, next_cursor is not None, next_cursor, cache_headers
         )
-        skip = 0
-        limit = total_count
-        has_more = False
-    else:
-        transactions, total_count = transaction_service.get_user_transactions_with_count(
+
+    transactions, total_count, has_more = transaction_service.get_user_transactions_with_count(
+        user_id=current_user.id,
+        group_id=group_id,
+        skip=skip,
+        limit=limit,
+        count_strategy=count_strategy,
+        filters=filters
+    )
+    if has_more and transactions:
+        # Let clients switch to cursor mode for the following pages
+        next_cursor = encode_cursor(transactions[-1]["date"], transactions[-1]["id"])
+    return _transactions_page_response(transactions, total_count, skip, limit, has_more, next_cursor, cache_headers)
+
+
+@async_read_router.get("/", response_model=PaginatedTransactionResponse)
+async def list_transactions_async(
+    group_id: Optional[int] = Query(None, description="Filter by group ID"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, ignores skip)"),
+    all: Optional[bool] = Query(False, description="Stream all transactions for the user (ignore skip/limit/cursor)"),
+    count_strategy: CountStrategy = Query(CountStrategy.EXACT, description="How to compute the total: exact, window, cached or none (total omitted)"),
+    cache_headers: Dict[str, str] = Depends(if_transactions_changed_async),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get transactions for the current user with optional group and field filtering."""
+    transaction_service = AsyncTransactionService(db)
+    next_cursor = None
+    if all:
+        # The export still streams from the sync engine's server-side cursor, in the threadpool
+        group_ids = await transaction_service.get_accessible_group_ids(current_user.id, group_id)
+        return StreamingResponse(
+            _stream_all_transactions(current_user.id, group_ids, filters), media_type="application/json", headers=cache_headers
+        )
+    if cursor:
+        transactions, next_cursor = await transaction_service.get_user_transactions_page(
             user_id=current_user.id,
             group_id=group_id,
-            skip=skip,
-            limit=limit
+            cursor=cursor,
+            limit=limit,
+            filters=filters
         )
-        has_more = (skip + limit) < total_count
-    
-    # Convert Transaction objects to TransactionResponse objects
-    transaction_responses = [TransactionResponse.from_orm(transaction) for transaction in transactions]
-    
-    return {
-        "transactions": transaction_responses,
+        return _transactions_page_response(
+            transactions, None, 0, limit, next_cursor is not None, next_cursor, cache_headers
+        )
+
+    transactions, total_count, has_more = await transaction_service.get_user_transactions_with_count(
+        user_id=current_user.id,
+        group_id=group_id,
+        skip=skip,
+        limit=limit,
+        count_strategy=count_strategy,
+        filters=filters
+    )
+    if has_more and transactions:
+        next_cursor = encode_cursor(transactions[-1]["date"], transactions[-1]["id"])
+    return _transactions_page_response(transactions, total_count, skip, limit, has_more, next_cursor, cache_headers)
+
+
+@read_router.get("/month", response_model=MonthViewResponse)
+def get_month_view(
+    group_id: Optional[int] = Query(None, description="Filter by group ID"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records in the first page"),
+    cache_headers: Dict[str, str] = Depends(if_month_view_changed),
+    bounds: MonthBounds = Depends(get_month_bounds),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: Session = Depends(get_read_db),
+    current_user: UserResponse = Depends(get_current_user_read)
+):
+    """Get a month's income, expense and net totals with its first page of transactions, in one query.
+
+    The month replaces any date_from/date_to filter; the other listing filters apply to both.
+    """
+    month_view_service = MonthViewService(db)
+    month_view = month_view_service.get_month_view(current_user.id, bounds, group_id, limit, filters)
+    return RawJSONResponse(month_view, headers=cache_headers)
+
+
+@async_read_router.get("/month", response_model=MonthViewResponse)
+async def get_month_view_async(
+    group_id: Optional[int] = Query(None, description="Filter by group ID"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records in the first page"),
+    cache_headers: Dict[str, str] = Depends(if_month_view_changed_async),
+    bounds: MonthBounds = Depends(get_month_bounds),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """Get a month's income, expense and net totals with its first page of transactions, in one query.
+
+    The month replaces any date_from/date_to filter; the other listing filters apply to both.
+    """
+    month_view_service = AsyncMonthViewService(db)
+    month_view = await month_view_service.get_month_view(current_user.id, bounds, group_id, limit, filters)
+    return RawJSONResponse(month_view, headers=cache_headers)
+
+
+def _transactions_page_response(
+    transactions: List[dict],
+    total_count: Optional[int],
+    skip: int,
+    limit: int,
+    has_more: bool,
+    next_cursor: Optional[str],
+    headers: Dict[str, str]
+) -> RawJSONResponse:
+    # Rows are already in the TransactionResponse shape, so serialize them without re-validating
+    return RawJSONResponse({
+        "transactions": transactions,
         "total": total_count,
         "skip": skip,
         "limit": limit,
-        "has_more": has_more
-    }
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
+def _stream_all_transactions(user_id: int, group_ids: List[int], filters: TransactionFilters) -> Iterator[bytes]:
+    """Write the paginated response shape incrementally, one batch of transactions at a time.
+
+    Runs on its own read session because the request's session is closed before the
+    response body is streamed. Its transaction stays open for as long as the client
+    takes to read, so the connection timeouts are lifted for it.
+    """
+    db = read_session(user_id)
+    try:
+        lift_timeouts(db)
+        yield b'{"transactions":['
+        count = 0
+        for batch in TransactionService(db).iter_transaction_batches(
+            group_ids, batch_size=STREAM_BATCH_SIZE, filters=filters
+        ):
+            chunk = b','.join(to_json(dict(row)) for row in batch)
+            yield b',' + chunk if count else chunk
+            count += len(batch)
+        yield b'],' + to_json(
+            {"total": count, "skip": 0, "limit": count, "has_more": False, "next_cursor": None}
+        )[1:]
+    finally:
+        db.close()
+
+
+@router.get("/search", response_model=TransactionSearchResponse)
+def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in transaction notes (prefix match)"),
+    group_id: Optional[int] = Query(None, description="Filter by group ID"),
+    skip: int = Query(0, ge=0, description="Number of matches to skip"),
+    limit: int = Query(50, ge=1, le=200, description="Number of matches to return"),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Search the current user's transactions by note text, best matches first."""
+    transaction_service = TransactionService(db)
+    transactions, has_more, truncated = transaction_service.search_transactions(
+        user_id=current_user.id,
+        text=q,
+        group_id=group_id,
+        filters=filters,
+        skip=skip,
+        limit=limit
+    )
+    return RawJSONResponse({
+        "transactions": transactions,
+        "query": q,
+        "skip": skip,
+        "limit": limit,
+        "has_more": has_more,
+        "truncated": truncated
+    })
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
@@ -136,4 +453,16 @@ def update_transaction(
 ):
     """Update a transaction with complete transaction data."""
     transaction_service = TransactionService(db)
-    return transaction_service.update_transaction(transaction_id, transaction_update, current_user.id) 
\ No newline at end of file
+    return RawJSONResponse(transaction_service.update_transaction(transaction_id, transaction_update, current_user.id)) 
+
+
+@router.patch("/{transaction_id}", response_model=TransactionResponse)
+def patch_transaction(
+    transaction_id: int,
+    patch: TransactionPatch,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Update only the given fields of a transaction."""
+    transaction_service = TransactionService(db)
+    return RawJSONResponse(transaction_service.patch_transaction(transaction_id, patch, current_user.id))
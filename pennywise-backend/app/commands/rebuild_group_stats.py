@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Recompute the group_stats summary rows from the transactions table.
+
+The migration creating group_stats backfills it, and every transaction write keeps
+it current afterwards, so this is only needed to repair rows changed outside the
+app (e.g. by hand-written SQL). Transaction writes wait while it runs, which it
+does with the connection timeouts (DB_STATEMENT_TIMEOUT_MS and
+DB_IDLE_IN_TRANSACTION_TIMEOUT_MS) turned off, however many transactions there are.
+
+    python -m app.commands.rebuild_group_stats [--group-id 12 --group-id 15]
+"""
+
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.group_stats_service import GroupStatsService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--group-id", type=int, action="append", dest="group_ids",
+        help="Only rebuild this group (repeatable); all groups by default"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuilt = GroupStatsService(db).rebuild(args.group_ids)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt stats for {rebuilt} group(s)")
+
+
+if __name__ == "__main__":
+    main()
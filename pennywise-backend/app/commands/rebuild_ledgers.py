@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Verify or recompute the group_member_ledgers rows from the transactions and group_members tables.
+
+The migration creating the table backfills it, and every transaction write keeps it
+current afterwards, so a rebuild is only needed to repair rows changed outside the
+app (e.g. by hand-written SQL). --verify only reports the members that drifted and
+exits with status 1 if there are any. Transaction writes wait while a rebuild runs.
+Both split every expense among its group's members, so they run with the connection
+timeouts (DB_STATEMENT_TIMEOUT_MS and DB_IDLE_IN_TRANSACTION_TIMEOUT_MS) turned off.
+
+    python -m app.commands.rebuild_ledgers [--verify] [--group-id 12 --group-id 15]
+"""
+
+import argparse
+import sys
+
+from app.core.database import SessionLocal
+from app.services.ledger_service import MemberLedgerService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--group-id", type=int, action="append", dest="group_ids",
+        help="Only check or rebuild this group (repeatable); all groups by default"
+    )
+    parser.add_argument("--verify", action="store_true", help="Compare with the transactions without changing anything")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.verify:
+            mismatches = MemberLedgerService(db).verify(args.group_ids)
+            for mismatch in mismatches:
+                print(
+                    f"group {mismatch['group_id']} user {mismatch['user_id']}: "
+                    f"stored {mismatch['stored_total']} over {mismatch['stored_count']} "
+                    f"owing {mismatch['stored_owed']}, "
+                    f"actual {mismatch['actual_total']} over {mismatch['actual_count']} "
+                    f"owing {mismatch['actual_owed']}"
+                )
+            print(f"{len(mismatches)} ledger row(s) differ from the transactions")
+            if mismatches:
+                sys.exit(1)
+            return
+
+        rebuilt = MemberLedgerService(db).rebuild(args.group_ids)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt {rebuilt} ledger row(s)")
+
+
+if __name__ == "__main__":
+    main()
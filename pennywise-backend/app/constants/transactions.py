@@ -6,6 +6,60 @@ class TransactionType(str, Enum):
     INCOME = "INCOME"
     EXPENSE = "EXPENSE"
 
+class CountStrategy(str, Enum):
+    """How paginated transaction listings compute their total."""
+    EXACT = "exact"    # Separate COUNT query
+    WINDOW = "window"  # COUNT(*) OVER() in the same round trip as the page
+    CACHED = "cached"  # Per-(user, group) count cached until a write invalidates it
+    NONE = "none"      # No total; has_more is detected by fetching limit + 1 rows
+
+class ReportPeriod(str, Enum):
+    """Bucket size of a transaction report."""
+    WEEKLY = "weekly"    # ISO weeks, starting on Monday
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+# date_trunc() unit of each report period
+REPORT_PERIOD_UNITS: Dict[ReportPeriod, str] = {
+    ReportPeriod.WEEKLY: "week",
+    ReportPeriod.MONTHLY: "month",
+    ReportPeriod.YEARLY: "year",
+}
+
+class AnalyticsGranularity(str, Enum):
+    """Bucket size of the analytics series."""
+    DAILY = "daily"
+    MONTHLY = "monthly"
+
+# NumPy datetime64 unit, default series length and default moving-average window of each granularity
+ANALYTICS_DATETIME64_UNITS: Dict[AnalyticsGranularity, str] = {
+    AnalyticsGranularity.DAILY: "D",
+    AnalyticsGranularity.MONTHLY: "M",
+}
+ANALYTICS_DEFAULT_PERIODS: Dict[AnalyticsGranularity, int] = {
+    AnalyticsGranularity.DAILY: 30,
+    AnalyticsGranularity.MONTHLY: 12,
+}
+ANALYTICS_DEFAULT_WINDOW: Dict[AnalyticsGranularity, int] = {
+    AnalyticsGranularity.DAILY: 7,
+    AnalyticsGranularity.MONTHLY: 3,
+}
+
+class ImportJobStatus(str, Enum):
+    """Lifecycle of a background CSV import job."""
+    PENDING = "pending"      # Queued, waiting for a worker
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class BulkChangeOutcome(str, Enum):
+    """Per-transaction result of a bulk update or delete."""
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"  # The user is not a member of the transaction's group
+    REJECTED = "rejected"    # The changes are invalid for this transaction, see its detail
+
 class CategoryInfo(TypedDict):
     name: str
     description: str
@@ -119,6 +173,11 @@ PAYMENT_MODES = [
     'Other'
 ]
 
+# Text search configuration for transaction notes ('simple' avoids stemming merchant names)
+SEARCH_TEXT_CONFIG = "simple"
+SEARCH_MAX_TERMS = 8
+SEARCH_MAX_CANDIDATES = 1000  # Most recent matches that are ranked per search
+
 # Validation constants
 TRANSACTION_VALIDATION = {
     'MIN_AMOUNT': 0.01,
@@ -132,9 +191,18 @@ TRANSACTION_VALIDATION = {
 CSV_CONSTANTS = {
     'REQUIRED_COLUMNS': ['Date', 'Time', 'Remark', 'Mode', 'Entry By', 'Cash In', 'Cash Out', 'Balance'],
     'OPTIONAL_COLUMNS': ['Category'],
-    'MAX_FILE_SIZE': 10 * 1024 * 1024,  # 10MB
+    'MAX_FILE_SIZE': 10 * 1024 * 1024,  # 10MB, of uncompressed CSV
+    'PENNYWISE_REQUIRED_COLUMNS': ['Date', 'Description', 'Amount'],
+    'IMPORT_BATCH_SIZE': 1000,  # Rows validated and inserted together
+    'MAX_REPORTED_ERRORS': 100,  # Rejected rows listed in the import summary
+    'IMPORT_JOB_LOCK_CLASS': 7301,  # Advisory lock namespace held by the worker running an import job
 }
 
+# Bulk insert constants
+BULK_INSERT_CHUNK_SIZE = 1000  # Rows per multi-row INSERT statement
+BULK_COPY_MIN_ROWS = 1000  # Larger batches are loaded with COPY on Postgres
+BULK_CHANGE_MAX_IDS = 5000  # Transactions one bulk update or delete may target
+
 # Transaction type display helpers
 def get_transaction_type_label(transaction_type: TransactionType) -> str:
     """Get human-readable label for transaction type"""
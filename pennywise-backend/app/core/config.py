@@ -23,6 +23,31 @@ class Settings(BaseSettings):
     DB_HOST: str = Field(default="localhost", env="DB_HOST")
     DB_PORT: str = Field(default="5432", env="DB_PORT")
     DB_NAME: str = Field(env="DB_NAME")
+    # Serve dashboard, group stats, transaction listing and notification reads from async endpoints on asyncpg
+    DB_ASYNC_ENABLED: bool = Field(default=False, env="DB_ASYNC_ENABLED")
+
+    # Connection pool settings, applied to each engine (the async engine has a pool of its own)
+    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")  # Extra connections opened under bursts
+    DB_POOL_TIMEOUT_SECONDS: int = Field(default=30, env="DB_POOL_TIMEOUT_SECONDS")  # Wait for a free connection
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800, env="DB_POOL_RECYCLE_SECONDS")  # -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")  # Replace connections dropped while idle
+    # Server-side timeouts set on every connection; 0 (the default) disables them
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=0, env="DB_STATEMENT_TIMEOUT_MS")
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = Field(default=0, env="DB_IDLE_IN_TRANSACTION_TIMEOUT_MS")
+    # After a write, the user's reads stay on the primary this long instead of the replica (DATABASE_REPLICA_URL)
+    DB_REPLICA_STICKINESS_SECONDS: int = Field(default=5, env="DB_REPLICA_STICKINESS_SECONDS")
+
+    # Cache settings
+    TRANSACTION_COUNT_CACHE_TTL_SECONDS: int = Field(default=300, env="TRANSACTION_COUNT_CACHE_TTL_SECONDS")
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = Field(default=60, env="MEMBERSHIP_CACHE_TTL_SECONDS")
+    # Also bounds how late the dashboard's last-7-days activity count rolls forward
+    DASHBOARD_CACHE_TTL_SECONDS: int = Field(default=60, env="DASHBOARD_CACHE_TTL_SECONDS")
+    # Browsers reuse transaction listings of past months this long without revalidating; 0 always revalidates
+    CLOSED_MONTH_CACHE_MAX_AGE_SECONDS: int = Field(default=86400, env="CLOSED_MONTH_CACHE_MAX_AGE_SECONDS")
+
+    # Import job settings
+    IMPORT_JOB_WORKERS: int = Field(default=2, env="IMPORT_JOB_WORKERS")  # Concurrent imports per process
     
     # CORS settings
     ALLOWED_ORIGINS: List[str] = Field(default=["http://localhost:3000"], env="ALLOWED_ORIGINS")
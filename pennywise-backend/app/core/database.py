@@ -1,22 +1,162 @@
 import os
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+
+
+def _normalize_url(url: Optional[str]) -> Optional[str]:
+    # Convert postgres:// to postgresql:// for newer SQLAlchemy versions
+    if url and url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
 
 # SQLAlchemy setup using settings
 # Check for DATABASE_URL first (for deployment), fallback to individual env vars
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL:
-    # Convert postgres:// to postgresql:// for newer SQLAlchemy versions
-    if DATABASE_URL.startswith("postgres://"):
-        DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-else:
+DATABASE_URL = _normalize_url(os.getenv("DATABASE_URL"))
+if not DATABASE_URL:
     DATABASE_URL = f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
-engine = create_engine(DATABASE_URL)
+# Optional streaming replica serving the read-only endpoints; writes always go to DATABASE_URL
+DATABASE_REPLICA_URL = _normalize_url(os.getenv("DATABASE_REPLICA_URL"))
+
+
+def pool_args(name: str, poolclass=InstrumentedQueuePool) -> dict:
+    """Pool keyword arguments for create_engine; `name` keys the pool's metrics in pool_metrics."""
+    return {
+        "poolclass": poolclass,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def connection_timeouts() -> dict:
+    """Server settings applied to every new connection, leaving out the disabled ones."""
+    timeouts = {
+        "statement_timeout": settings.DB_STATEMENT_TIMEOUT_MS,
+        "idle_in_transaction_session_timeout": settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+    }
+    return {name: str(value) for name, value in timeouts.items() if value > 0}
+
+
+def lift_timeouts(db: Session) -> None:
+    """Turn the connection timeouts off until the session's transaction ends.
+
+    For work expected to outlast them: the rebuild and verify commands, and the
+    streamed export, whose transaction stays open while the client reads it.
+    """
+    db.execute(select(
+        func.set_config("statement_timeout", "0", True),
+        func.set_config("idle_in_transaction_session_timeout", "0", True)
+    ))
+
+
+def sync_engine_args(url: str) -> dict:
+    """psycopg2 connect arguments; the timeouts go in the startup `options`, after any from the URL."""
+    options = [make_url(url).query.get("options")]
+    options += [f"-c {name}={value}" for name, value in connection_timeouts().items()]
+    options = " ".join(option for option in options if option)
+    return {"options": options} if options else {}
+
+
+def async_engine_args(url: str) -> tuple:
+    """Turn the psycopg2 URL into an asyncpg one; asyncpg takes sslmode as the `ssl` connect argument."""
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    connect_args = {}
+    sslmode = async_url.query.get("sslmode")
+    if sslmode:
+        async_url = async_url.difference_update_query(["sslmode"])
+        connect_args["ssl"] = sslmode
+    timeouts = connection_timeouts()
+    if timeouts:
+        connect_args["server_settings"] = timeouts
+    return async_url, connect_args
+
+
+engine = create_engine(DATABASE_URL, connect_args=sync_engine_args(DATABASE_URL), **pool_args("primary"))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the endpoints ported to asyncio; only created when enabled, as it needs asyncpg
+async_engine = None
+if settings.DB_ASYNC_ENABLED:
+    _async_url, _async_connect_args = async_engine_args(DATABASE_URL)
+    async_engine = create_async_engine(
+        _async_url,
+        connect_args=_async_connect_args,
+        **pool_args("async", InstrumentedAsyncAdaptedQueuePool)
+    )
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Replica engines, only created when DATABASE_REPLICA_URL is set; their sessions are tagged in Session.info
+REPLICA_SESSION = "replica"
+replica_engine = None
+async_replica_engine = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        DATABASE_REPLICA_URL,
+        connect_args=sync_engine_args(DATABASE_REPLICA_URL),
+        **pool_args("replica")
+    )
+    if settings.DB_ASYNC_ENABLED:
+        _async_replica_url, _async_replica_connect_args = async_engine_args(DATABASE_REPLICA_URL)
+        async_replica_engine = create_async_engine(
+            _async_replica_url,
+            connect_args=_async_replica_connect_args,
+            **pool_args("async-replica", InstrumentedAsyncAdaptedQueuePool)
+        )
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine, info={REPLICA_SESSION: True}
+)
+AsyncReplicaSessionLocal = async_sessionmaker(
+    bind=async_replica_engine, autoflush=False, expire_on_commit=False, info={REPLICA_SESSION: True}
+)
+
+# Users who committed within the stickiness window, keyed by user_id. Their reads stay on the
+# primary so they see their own writes before the replica catches up. Per process, like TTLCache.
+recent_writers = TTLCache(ttl_seconds=settings.DB_REPLICA_STICKINESS_SECONDS)
+WRITER_ID = "writer_id"
+
+
+def note_writer(db: Session, user_id: int) -> None:
+    """Attribute the session's commits to a user, starting their stickiness window on each commit."""
+    db.info[WRITER_ID] = user_id
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _start_stickiness_window(session: Session) -> None:
+    writer_id = session.info.get(WRITER_ID)
+    if writer_id is not None:
+        recent_writers.set(writer_id, True)
+
+
+def reads_from_replica(db) -> bool:
+    """Whether a (sync or async) session reads from the replica, whose data may lag the primary."""
+    return db.info.get(REPLICA_SESSION, False)
+
+
+def read_session(user_id: int) -> Session:
+    """Session for a read-only request: the replica, unless none is configured or the user wrote recently."""
+    if replica_engine is None or recent_writers.get(user_id):
+        return SessionLocal()
+    return ReplicaSessionLocal()
+
+
+def async_read_session(user_id: int):
+    """AsyncSession for a read-only request, routed like read_session."""
+    if async_replica_engine is None or recent_writers.get(user_id):
+        return AsyncSessionLocal()
+    return AsyncReplicaSessionLocal()
+
 # Create Base class for SQLAlchemy models
 Base = declarative_base()
 
@@ -28,6 +168,11 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def test_connection():
     """
     Test database connection using SQLAlchemy
@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds in seconds of the checkout wait histogram buckets; a last bucket counts longer waits
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Checkout waits and connection usage of one engine's pool since the process started.
+
+    Waits cover the whole time a caller blocks for a connection, including opening
+    a new one when the pool is allowed to grow; pre-ping round trips are not included.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS) + 1)
+            self.in_use_peak = 0
+
+    def record_checkout(self, wait_seconds: float, in_use: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._record_wait(wait_seconds)
+            self.in_use_peak = max(self.in_use_peak, in_use)
+
+    def record_timeout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self._record_wait(wait_seconds)
+
+    def _record_wait(self, wait_seconds: float) -> None:
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        for index, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+            if wait_seconds <= bound:
+                self.wait_buckets[index] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Current pool usage together with the recorded metrics."""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            bounds = [f"<={bound * 1000:g}ms" for bound in CHECKOUT_WAIT_BUCKETS]
+            return {
+                "size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "in_use_peak": self.in_use_peak,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_histogram": dict(zip(bounds + [f">{CHECKOUT_WAIT_BUCKETS[-1] * 1000:g}ms"], self.wait_buckets)),
+            }
+
+
+# Metrics per pool, keyed by the engine's pool_logging_name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    return pool_metrics.setdefault(name, PoolMetrics())
+
+
+class _InstrumentedPoolMixin:
+    """Times QueuePool._do_get, the call that blocks until a connection is free."""
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        return get_pool_metrics(self.logging_name or "default")
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import init_db, test_connection
+from app.core.database import async_engine, async_replica_engine, init_db, test_connection
+from app.services.import_job_service import recover_import_jobs
 from app.api.api_v1 import api_router
 
 app = FastAPI(
@@ -34,10 +35,21 @@ async def startup_event():
     if test_connection():
         init_db()
         print("Successfully connected to database and initialized tables")
+        recover_import_jobs()
     else:
         print("Failed to connect to database")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Close the async engine's connections
+    """
+    for engine in (async_engine, async_replica_engine):
+        if engine is not None:
+            await engine.dispose()
+
+
 
 @app.get("/")
 async def root():
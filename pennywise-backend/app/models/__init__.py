@@ -4,5 +4,9 @@ from .transaction import Transaction
 from .group import Group
 from .group_member import GroupMember
 from .notification import Notification
+from .import_job import ImportJob
+from .group_stats import GroupStatsSummary
+from .monthly_rollup import TransactionMonthlyRollup
+from .member_ledger import GroupMemberLedger
 
-__all__ = ["User", "Transaction", "Group", "GroupMember", "Notification"] 
\ No newline at end of file
+__all__ = ["User", "Transaction", "Group", "GroupMember", "Notification", "ImportJob", "GroupStatsSummary", "TransactionMonthlyRollup", "GroupMemberLedger"] 
\ No newline at end of file
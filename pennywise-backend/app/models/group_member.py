@@ -1,15 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class GroupMember(Base):
     __tablename__ = "group_members"
+    __table_args__ = (
+        UniqueConstraint("user_id", "group_id", name="uq_group_members_user_id_group_id"),
+        Index("ix_group_members_group_id_user_id", "group_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
     role = Column(String, nullable=False, default="member")  # 'admin' or 'member'
     permissions = Column(String, nullable=True)
+    # Expenses written from then on are shared with the member (see MemberLedgerService)
+    joined_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     user = relationship("User")
     group = relationship("Group") 
\ No newline at end of file
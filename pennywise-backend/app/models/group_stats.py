@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from app.core.database import Base
+
+
+class GroupStatsSummary(Base):
+    """Transaction totals per group, kept up to date by every transaction write (see GroupStatsService)."""
+    __tablename__ = "group_stats"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    # Exact sums of the float amounts, so adding and removing rows never drifts
+    income_total = Column(Numeric, nullable=False, default=0)
+    expense_total = Column(Numeric, nullable=False, default=0)
+    last_transaction_at = Column(DateTime(timezone=True), nullable=True)
+    # Bumped by every write to the group, its transactions or its members; read endpoints derive ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index, LargeBinary
+from sqlalchemy.sql import func
+from sqlalchemy.orm import deferred, relationship
+from app.core.database import Base
+from app.constants.transactions import ImportJobStatus
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        Index("ix_import_jobs_status", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
+    status = Column(String, nullable=False, default=ImportJobStatus.PENDING.value)  # See ImportJobStatus
+    filename = Column(String, nullable=True)
+    user_mapping = Column(JSON, nullable=False)  # CSV 'Paid By' name -> user ID
+    # The uploaded file as received (possibly gzipped), kept with the job so any worker can run it;
+    # cleared once the job finishes and only loaded when accessed
+    upload = deferred(Column(LargeBinary, nullable=True))
+    file_size = Column(Integer, nullable=False, default=0)  # Bytes of the stored upload
+    content_size = Column(Integer, nullable=True)  # Uncompressed bytes, known once the job starts
+    bytes_processed = Column(Integer, nullable=False, default=0)  # Uncompressed bytes parsed so far
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)  # Already imported before
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    rejected_rows = Column(JSON, nullable=True)  # [{"row": ..., "reason": ...}], capped
+    error = Column(Text, nullable=True)  # Why the whole job failed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    user = relationship("User")
+    group = relationship("Group")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey
+from app.core.database import Base
+
+
+class GroupMemberLedger(Base):
+    """Expenses each user has paid for and owes in a group, kept up to date by every transaction write (see MemberLedgerService)."""
+    __tablename__ = "group_member_ledgers"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # Exact sum of the float amounts of the expenses with this user as paid_by
+    paid_total = Column(Numeric, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+    # The user's share of the group's expenses, each split to the cent among the members when it was written
+    owed_total = Column(Numeric, nullable=False, default=0)
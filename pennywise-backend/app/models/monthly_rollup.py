@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, String, Enum, ForeignKey
+from app.core.database import Base
+from app.constants.transactions import TransactionType
+
+
+class TransactionMonthlyRollup(Base):
+    """Transaction totals per group, month, category, type and payment mode (see MonthlyRollupService)."""
+    __tablename__ = "transaction_monthly_rollups"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(DateTime(timezone=True), primary_key=True)  # Start of the month, in UTC
+    # A missing category or payment mode is stored as '', since key columns cannot be NULL
+    category = Column(String, primary_key=True)
+    type = Column(Enum(TransactionType), primary_key=True)
+    payment_mode = Column(String, primary_key=True)
+    total = Column(Numeric, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index, Computed, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
-from app.constants.transactions import TransactionType
+from app.constants.transactions import TransactionType, SEARCH_TEXT_CONFIG
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_group_id_date_id", "group_id", "date", "id", postgresql_include=["amount", "type"]),
+        Index("ix_transactions_group_id_category_date_id", "group_id", "category", "date", "id"),
+        Index("ix_transactions_group_id_payment_mode_date_id", "group_id", "payment_mode", "date", "id"),
+        Index("ix_transactions_group_id_paid_by_date_id", "group_id", "paid_by", "date", "id"),
+        Index("ix_transactions_note_search", "note_search", postgresql_using="gin"),
+        UniqueConstraint("content_hash", name="uq_transactions_content_hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
@@ -17,6 +26,15 @@ class Transaction(Base):
     payment_mode = Column(String, nullable=True)
     date = Column(DateTime(timezone=True), server_default=func.now())
     paid_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Identifies rows created by bulk or CSV ingest so retries and re-imports skip them; NULL otherwise
+    content_hash = Column(String(64), nullable=True)
+    # When the transaction was written; its expense is shared by the members of the group at that time
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Full-text search vector over the note, generated by Postgres on insert and update
+    note_search = deferred(Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(note, ''))", persisted=True)
+    ))
 
     # Relationships (optional, for ORM navigation)
     user = relationship("User", foreign_keys=[user_id])
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+from app.constants.transactions import AnalyticsGranularity
+
+
+class AnalyticsTrend(BaseModel):
+    slope: float  # Change per bucket, fitted over the completed buckets
+    start: float  # Trend line value at the first bucket
+    end: float    # Trend line value at the current bucket
+
+
+class CategoryGrowth(BaseModel):
+    category: Optional[str] = None
+    recent_expense: float    # Over the last `window` completed buckets
+    previous_expense: float  # Over the `window` completed buckets before those
+    growth_rate: Optional[float] = None  # (recent - previous) / previous; None without previous spending
+
+
+class GroupAnalytics(BaseModel):
+    group_id: int
+    # One value per bucket of AnalyticsResponse.buckets
+    income: List[float]
+    expense: List[float]
+    expense_moving_average: List[Optional[float]]  # None until a full window is available
+    income_trend: AnalyticsTrend
+    expense_trend: AnalyticsTrend
+    month_to_date_expense: float
+    projected_month_expense: float  # Month to date plus the remaining days at the recent daily rate
+    categories: List[CategoryGrowth]  # Largest recent expense first
+
+
+class AnalyticsResponse(BaseModel):
+    granularity: AnalyticsGranularity
+    periods: int
+    window: int
+    as_of: date  # The current bucket, still filling up, is the one containing this date (UTC)
+    buckets: List[datetime]  # Bucket starts in UTC, oldest first, ending with the current bucket
+    groups: List[GroupAnalytics]
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class MemberBalance(BaseModel):
+    user_id: int
+    username: Optional[str] = None
+    full_name: Optional[str] = None
+    is_member: bool  # False for former members who still paid for some of the group's expenses
+    paid: float      # Expenses paid on the group's behalf
+    share: float     # Equal shares of the expenses written while the user was a member
+    balance: float   # paid - share: positive when the group owes the user, negative when they owe it
+
+
+class GroupBalances(BaseModel):
+    group_id: int
+    total_paid: float  # Sum of the expenses with a payer, each split equally between the members at the time
+    members: List[MemberBalance]  # Ordered by user id
+
+
+class SettlementTransfer(BaseModel):
+    from_user_id: int
+    to_user_id: int
+    amount: float
+
+
+class SettleUpResponse(GroupBalances):
+    transfers: List[SettlementTransfer]  # Largest first; paying them all brings every balance to zero
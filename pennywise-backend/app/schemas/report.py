@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from app.constants.transactions import ReportPeriod
+
+
+class ReportTotals(BaseModel):
+    income: float
+    expense: float
+    net: float  # income - expense
+    transaction_count: int
+    income_expense_ratio: Optional[float] = None  # income / expense; None without expenses
+
+
+class ReportCategory(BaseModel):
+    category: Optional[str] = None
+    income: float
+    expense: float
+    transaction_count: int
+
+
+class ReportBucket(ReportTotals):
+    start: datetime  # Start of the week, month or year, in UTC
+    categories: List[ReportCategory]
+
+
+class ReportResponse(BaseModel):
+    period: ReportPeriod
+    group_id: Optional[int] = None  # None when the report covers all of the user's groups
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    totals: ReportTotals
+    categories: List[ReportCategory]  # Over the whole report, largest expense first
+    buckets: List[ReportBucket]  # Oldest first; periods without transactions are left out
@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
-from pydantic import field_validator
+from pydantic import computed_field, field_validator, model_validator
 from typing import Optional, List
-from datetime import datetime
-from app.constants.transactions import TransactionType
+from datetime import datetime, timezone
+from app.constants.transactions import BULK_CHANGE_MAX_IDS, BulkChangeOutcome, ImportJobStatus, TransactionType
+from app.schemas.report import ReportTotals
 
 class TransactionBase(BaseModel):
     group_id: int  # Refers to Group
@@ -58,6 +59,108 @@ class TransactionUpdate(BaseModel):
 class BulkTransactionCreate(BaseModel):
     transactions: List[TransactionCreate]
 
+class BulkTransactionResult(BaseModel):
+    inserted: int
+    skipped: int  # Duplicates of existing transactions
+    ids: List[int]  # In the order the transactions were submitted, existing ones included
+
+class TransactionChanges(BaseModel):
+    """Fields to set on every transaction of a bulk update; fields left out are unchanged."""
+    amount: Optional[float] = Field(None, gt=0)
+    type: Optional[TransactionType] = None
+    note: Optional[str] = None
+    category: Optional[str] = None
+    payment_mode: Optional[str] = None
+    date: Optional[datetime] = None
+    paid_by: Optional[int] = None
+
+    @field_validator('note', 'category', 'payment_mode')
+    @classmethod
+    def strip_and_require_non_empty(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        trimmed = v.strip()
+        if trimmed == '':
+            raise ValueError('Field cannot be empty')
+        return trimmed
+
+    @model_validator(mode='after')
+    def require_a_change(self) -> 'TransactionChanges':
+        if not self.model_dump(exclude_none=True):
+            raise ValueError('No changes provided')
+        return self
+
+class TransactionPatch(TransactionChanges):
+    """Fields to change on one transaction; unset fields are unchanged and note, category,
+    payment_mode and paid_by can be cleared with null."""
+    group_id: Optional[int] = None
+
+    @model_validator(mode='after')
+    def require_a_change(self) -> 'TransactionPatch':
+        changes = self.model_dump(exclude_unset=True)
+        if not changes:
+            raise ValueError('No changes provided')
+        for field in ('group_id', 'amount', 'type', 'date'):
+            if field in changes and changes[field] is None:
+                raise ValueError(f"'{field}' cannot be null")
+        return self
+
+class BulkTransactionUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_CHANGE_MAX_IDS)
+    changes: TransactionChanges
+
+class BulkTransactionDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_CHANGE_MAX_IDS)
+
+class BulkTransactionOutcome(BaseModel):
+    id: int
+    status: BulkChangeOutcome
+    detail: Optional[str] = None  # Why the transaction was left unchanged
+
+class BulkTransactionChangeResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkTransactionOutcome]  # One per distinct id, in the order submitted
+
+class CsvRowError(BaseModel):
+    row: int  # Record number in the CSV file, counting the header as row 1
+    reason: str
+
+class ImportJobResponse(BaseModel):
+    id: int
+    group_id: int
+    status: ImportJobStatus
+    filename: Optional[str] = None
+    file_size: int
+    content_size: Optional[int] = None
+    bytes_processed: int
+    rows_imported: int
+    rows_skipped: int
+    rows_rejected: int
+    rejected_rows: Optional[List[CsvRowError]] = None  # The first CSV_CONSTANTS['MAX_REPORTED_ERRORS'] rejections
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def rows_processed(self) -> int:
+        return self.rows_imported + self.rows_skipped + self.rows_rejected
+
+    @computed_field
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Seconds left for a running job, extrapolated from how much of the file it has parsed."""
+        if self.status != ImportJobStatus.RUNNING or not self.started_at or not self.bytes_processed or not self.content_size:
+            return None
+        elapsed = (datetime.now(timezone.utc) - self.started_at).total_seconds()
+        remaining = max(self.content_size - self.bytes_processed, 0)
+        return round(elapsed * remaining / self.bytes_processed, 1)
+
+    class Config:
+        from_attributes = True
+
 class TransactionResponse(TransactionBase):
     id: int
     date: Optional[datetime] = None
@@ -73,12 +176,54 @@ class TransactionResponse(TransactionBase):
     class Config:
         from_attributes = True
 
+class TransactionSearchResult(TransactionResponse):
+    rank: float  # Relevance of the note to the search query
+
+class TransactionSearchResponse(BaseModel):
+    transactions: List[TransactionSearchResult]
+    query: str
+    skip: int
+    limit: int
+    has_more: bool
+    truncated: bool  # Older matches beyond the SEARCH_MAX_CANDIDATES most recent were not ranked
+
+class TransactionFilters(BaseModel):
+    """Optional filters for transaction listings; every filter that is set must match."""
+    date_from: Optional[datetime] = None  # Inclusive
+    date_to: Optional[datetime] = None    # Exclusive
+    type: Optional[TransactionType] = None
+    categories: Optional[List[str]] = None
+    payment_modes: Optional[List[str]] = None
+    paid_by: Optional[List[int]] = None
+    amount_min: Optional[float] = None
+    amount_max: Optional[float] = None
+
+    def cache_key(self) -> Optional[tuple]:
+        """Hashable representation of the filters that are set, or None if there are none."""
+        values = tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in self.model_dump(exclude_none=True).items()
+        )
+        return values or None
+
 class PaginatedTransactionResponse(BaseModel):
     transactions: List[TransactionResponse]
-    total: int
+    total: Optional[int] = None  # Not computed in cursor mode
     skip: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
+
+class MonthViewResponse(BaseModel):
+    month: str  # YYYY-MM
+    time_zone: str  # IANA name the month boundaries were taken in
+    date_from: datetime  # Start of the month in time_zone
+    date_to: datetime    # Start of the next month (exclusive)
+    totals: ReportTotals  # Over all of the month's matching transactions, not only this page
+    transactions: List[TransactionResponse]  # The first page, newest first
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str] = None  # Pass to the listing as `cursor`, with date_from and date_to, for the next page
 
 
 # AI Transaction Extraction Schemas
@@ -0,0 +1,263 @@
+"""Trend and forecast analytics over a user's groups, computed with NumPy.
+
+The income and expense of every group are read per (group, bucket, category) in one
+aggregated query and laid out as (group, category, bucket) arrays, so moving
+averages, trend lines, projections and growth rates are computed for all of the
+groups at once instead of row by row in Python.
+"""
+import math
+from datetime import date, datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import Numeric, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.constants.transactions import (
+    ANALYTICS_DATETIME64_UNITS, ANALYTICS_DEFAULT_PERIODS, ANALYTICS_DEFAULT_WINDOW, AnalyticsGranularity,
+    TransactionType
+)
+from app.models.monthly_rollup import TransactionMonthlyRollup
+from app.models.transaction import Transaction
+from app.services.transaction_service import AsyncTransactionService, TransactionService
+
+
+def analytics_buckets(granularity: AnalyticsGranularity, periods: int, as_of: date) -> np.ndarray:
+    """The charted bucket starts as datetime64, oldest first, ending with the one containing `as_of`."""
+    current = np.datetime64(as_of, ANALYTICS_DATETIME64_UNITS[granularity])
+    return np.arange(current - (periods - 1), current + 1)
+
+
+def _span(buckets: np.ndarray) -> np.ndarray:
+    # Daily series reach back to the start of the month at least, for the month to date
+    month_start = buckets[-1].astype("datetime64[M]").astype(buckets.dtype)
+    return np.arange(min(buckets[0], month_start), buckets[-1] + 1)
+
+
+def _utc_datetime(value: np.datetime64) -> datetime:
+    return value.astype("datetime64[s]").item().replace(tzinfo=timezone.utc)
+
+
+def series_statement(group_ids: List[int], granularity: AnalyticsGranularity, buckets: np.ndarray):
+    """Income and expense per (group, bucket, category) over the buckets' span.
+
+    Buckets come back as epoch seconds of their start in UTC and missing categories
+    as '', ready to be read into NumPy arrays. Monthly series read the monthly
+    rollups; daily ones aggregate the transactions.
+    """
+    span = _span(buckets)
+    start, end = _utc_datetime(span[0]), _utc_datetime(span[-1] + 1)
+    if granularity == AnalyticsGranularity.MONTHLY:
+        rollup = TransactionMonthlyRollup
+        return (
+            select(
+                rollup.group_id,
+                func.extract("epoch", rollup.month).label("bucket"),
+                rollup.category,
+                func.coalesce(func.sum(rollup.total).filter(rollup.type == TransactionType.INCOME), 0).label("income"),
+                func.coalesce(func.sum(rollup.total).filter(rollup.type == TransactionType.EXPENSE), 0).label("expense")
+            )
+            .where(rollup.group_id.in_(group_ids), rollup.month >= start, rollup.month < end)
+            .group_by(rollup.group_id, rollup.month, rollup.category)
+        )
+
+    bucket = func.date_trunc(literal_column("'day'"), Transaction.date, literal_column("'UTC'"))
+    category = func.coalesce(Transaction.category, literal_column("''"))
+    amount = cast(Transaction.amount, Numeric)
+    return (
+        select(
+            Transaction.group_id,
+            func.extract("epoch", bucket).label("bucket"),
+            category.label("category"),
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.INCOME), 0).label("income"),
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.EXPENSE), 0).label("expense")
+        )
+        .where(Transaction.group_id.in_(group_ids), Transaction.date >= start, Transaction.date < end)
+        .group_by(Transaction.group_id, bucket, category)
+    )
+
+
+def series_arrays(
+    group_ids: List[int], rows: Sequence, span: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """series_statement rows as (group, category, bucket) income and expense arrays, and the category names.
+
+    `group_ids` must be sorted; groups and buckets without transactions are zero.
+    """
+    columns = list(zip(*rows)) if rows else [[], [], [], [], []]
+    groups = np.searchsorted(np.asarray(group_ids), np.asarray(columns[0], dtype=np.int64))
+    bucket_starts = np.asarray(columns[1], dtype=float).astype(np.int64).astype("datetime64[s]")
+    buckets = (bucket_starts.astype(span.dtype) - span[0]).astype(np.int64)
+    categories, category_index = np.unique(np.asarray(columns[2], dtype=str), return_inverse=True)
+
+    shape = (len(group_ids), len(categories), len(span))
+    income, expense = np.zeros(shape), np.zeros(shape)
+    np.add.at(income, (groups, category_index, buckets), np.asarray(columns[3], dtype=float))
+    np.add.at(expense, (groups, category_index, buckets), np.asarray(columns[4], dtype=float))
+    return income, expense, categories
+
+
+def moving_average(series: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` buckets along the last axis; NaN until a full window is available."""
+    sums = np.cumsum(series, axis=-1)
+    windows = sums[..., window - 1:].copy()
+    windows[..., 1:] -= sums[..., :-window]
+    averages = np.full(series.shape, np.nan)
+    averages[..., window - 1:] = windows / window
+    return averages
+
+
+def linear_trend(series: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Least-squares slope and intercept of every row of `series` against its bucket index."""
+    x = np.arange(series.shape[-1], dtype=float)
+    centered = x - x.mean()
+    denominator = centered @ centered
+    slopes = series @ centered / denominator if denominator else np.zeros(series.shape[:-1])
+    return slopes, series.mean(axis=-1) - slopes * x.mean()
+
+
+def _values(array: np.ndarray, digits: int = 2) -> List[Optional[float]]:
+    return [None if math.isnan(value) else value for value in np.round(array, digits).tolist()]
+
+
+def _trend(slope: float, intercept: float, periods: int) -> dict:
+    return {
+        "slope": round(slope, 2),
+        "start": round(intercept, 2),
+        "end": round(intercept + slope * (periods - 1), 2)
+    }
+
+
+def compute_analytics(
+    group_ids: List[int],
+    rows: Sequence,
+    granularity: AnalyticsGranularity,
+    periods: int,
+    window: int,
+    as_of: date
+) -> dict:
+    """Shape series_statement rows into an AnalyticsResponse payload.
+
+    The current bucket is still filling up, so trends, growth rates and the recent
+    daily rate only look at the completed buckets before it.
+    """
+    buckets = analytics_buckets(granularity, periods, as_of)
+    span = _span(buckets)
+    income_cube, expense_cube, categories = series_arrays(group_ids, rows, span)
+
+    # Month to date from the span, which starts with the month at the latest
+    month_start = buckets[-1].astype("datetime64[M]")
+    month_offset = (month_start.astype(span.dtype) - span[0]).astype(int)
+    month_to_date = expense_cube[..., month_offset:].sum(axis=(1, 2))
+
+    income_cube, expense_cube = income_cube[..., -periods:], expense_cube[..., -periods:]
+    income, expense = income_cube.sum(axis=1), expense_cube.sum(axis=1)
+    completed_expense = expense[:, :-1]
+
+    income_slopes, income_intercepts = linear_trend(income[:, :-1])
+    expense_slopes, expense_intercepts = linear_trend(completed_expense)
+
+    # Remaining days of the month at the daily rate of the last `window` completed buckets,
+    # or at the month's own rate when those had no expenses
+    bucket_days = ((buckets + 1).astype("datetime64[D]") - buckets.astype("datetime64[D]")).astype(float)
+    recent_expense = completed_expense[:, -window:].sum(axis=1)
+    daily_rate = recent_expense / bucket_days[:-1][-window:].sum()
+    elapsed_days = as_of.day
+    days_in_month = ((month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")).astype(int)
+    daily_rate = np.where(recent_expense > 0, daily_rate, month_to_date / elapsed_days)
+    projected = month_to_date + daily_rate * (days_in_month - elapsed_days)
+
+    completed_categories = expense_cube[..., :-1]
+    recent = completed_categories[..., -window:].sum(axis=-1)
+    previous = completed_categories[..., -2 * window:-window].sum(axis=-1)
+    growth = np.divide(recent - previous, previous, out=np.full(recent.shape, np.nan), where=previous > 0)
+
+    moving_averages = moving_average(expense, window)
+    groups = []
+    for index, group_id in enumerate(group_ids):
+        spent = np.flatnonzero((recent[index] > 0) | (previous[index] > 0))
+        spent = spent[np.lexsort((categories[spent], -recent[index][spent]))]
+        groups.append({
+            "group_id": group_id,
+            "income": _values(income[index]),
+            "expense": _values(expense[index]),
+            "expense_moving_average": _values(moving_averages[index]),
+            "income_trend": _trend(income_slopes[index], income_intercepts[index], periods),
+            "expense_trend": _trend(expense_slopes[index], expense_intercepts[index], periods),
+            "month_to_date_expense": round(float(month_to_date[index]), 2),
+            "projected_month_expense": round(float(projected[index]), 2),
+            "categories": [
+                {
+                    "category": str(categories[category]) or None,
+                    "recent_expense": round(float(recent[index, category]), 2),
+                    "previous_expense": round(float(previous[index, category]), 2),
+                    "growth_rate": None if np.isnan(growth[index, category]) else round(float(growth[index, category]), 4)
+                }
+                for category in spent
+            ]
+        })
+
+    return {
+        "granularity": granularity,
+        "periods": periods,
+        "window": window,
+        "as_of": as_of,
+        "buckets": [_utc_datetime(bucket) for bucket in buckets],
+        "groups": groups
+    }
+
+
+def _resolve(
+    granularity: AnalyticsGranularity, periods: Optional[int], window: Optional[int], as_of: Optional[date]
+) -> Tuple[int, int, date]:
+    periods = periods or ANALYTICS_DEFAULT_PERIODS[granularity]
+    # Windows are taken over completed buckets, which leaves one bucket out
+    window = min(window or ANALYTICS_DEFAULT_WINDOW[granularity], periods - 1)
+    return periods, window, as_of or datetime.now(timezone.utc).date()
+
+
+class AnalyticsService:
+    """Moving averages, trends, month-end projections and category growth for a user's groups."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.transactions = TransactionService(db)
+
+    def get_analytics(
+        self,
+        user_id: int,
+        granularity: AnalyticsGranularity,
+        group_id: Optional[int] = None,
+        periods: Optional[int] = None,
+        window: Optional[int] = None,
+        as_of: Optional[date] = None
+    ) -> dict:
+        """Analytics of one group (membership checked) or each of the user's groups."""
+        periods, window, as_of = _resolve(granularity, periods, window, as_of)
+        group_ids = sorted(self.transactions.get_accessible_group_ids(user_id, group_id))
+        statement = series_statement(group_ids, granularity, analytics_buckets(granularity, periods, as_of))
+        rows = self.db.execute(statement).all() if group_ids else []
+        return compute_analytics(group_ids, rows, granularity, periods, window, as_of)
+
+
+class AsyncAnalyticsService:
+    """AnalyticsService on an AsyncSession, running the same statement."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transactions = AsyncTransactionService(db)
+
+    async def get_analytics(
+        self,
+        user_id: int,
+        granularity: AnalyticsGranularity,
+        group_id: Optional[int] = None,
+        periods: Optional[int] = None,
+        window: Optional[int] = None,
+        as_of: Optional[date] = None
+    ) -> dict:
+        """Analytics of one group (membership checked) or each of the user's groups."""
+        periods, window, as_of = _resolve(granularity, periods, window, as_of)
+        group_ids = sorted(await self.transactions.get_accessible_group_ids(user_id, group_id))
+        statement = series_statement(group_ids, granularity, analytics_buckets(granularity, periods, as_of))
+        rows = (await self.db.execute(statement)).all() if group_ids else []
+        return compute_analytics(group_ids, rows, granularity, periods, window, as_of)
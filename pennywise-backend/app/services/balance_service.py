@@ -0,0 +1,136 @@
+"""Who owes whom in a group, from the member ledgers (see MemberLedgerService).
+
+Every expense with a payer is shared equally, to the cent, by the members of the
+group when it was written, and the ledgers keep what each member paid and owes.
+A member's balance is what they paid less what they owe, so for amounts in whole
+cents the balances add up to zero exactly.
+"""
+import heapq
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.group_member import GroupMember
+from app.models.member_ledger import GroupMemberLedger
+from app.models.user import User
+from app.services.membership_service import AsyncMembershipService, MembershipService
+
+
+def balances_statement(group_id: int):
+    """The group's current members and anyone else with a ledger row, with what each has paid and owes."""
+    members = select(GroupMember.user_id).where(GroupMember.group_id == group_id).subquery("members")
+    ledger = select(GroupMemberLedger.user_id, GroupMemberLedger.paid_total, GroupMemberLedger.owed_total).where(
+        GroupMemberLedger.group_id == group_id
+    ).subquery("ledger")
+    user_id = func.coalesce(members.c.user_id, ledger.c.user_id)
+    return (
+        select(
+            user_id.label("user_id"),
+            User.username,
+            User.full_name,
+            members.c.user_id.is_not(None).label("is_member"),
+            func.coalesce(ledger.c.paid_total, 0).label("paid_total"),
+            func.coalesce(ledger.c.owed_total, 0).label("owed_total")
+        )
+        .select_from(members.join(ledger, members.c.user_id == ledger.c.user_id, full=True))
+        .join(User, User.id == user_id)
+        .order_by(user_id)
+    )
+
+
+def _cents(amount: Decimal) -> int:
+    return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def compute_balances(group_id: int, rows: Sequence) -> dict:
+    """Shape balances_statement rows (ordered by user id) into a GroupBalances payload."""
+    members = []
+    total = 0
+    for row in rows:
+        paid_cents, share_cents = _cents(row.paid_total), _cents(row.owed_total)
+        total += paid_cents
+        members.append({
+            "user_id": row.user_id,
+            "username": row.username,
+            "full_name": row.full_name,
+            "is_member": row.is_member,
+            "paid": paid_cents / 100,
+            "share": share_cents / 100,
+            "balance": (paid_cents - share_cents) / 100
+        })
+    return {"group_id": group_id, "total_paid": total / 100, "members": members}
+
+
+def minimal_transfers(balances: Dict[int, int]) -> List[Tuple[int, int, int]]:
+    """Greedy settlement of balances in cents, as (debtor, creditor, cents) transfers.
+
+    Repeatedly pays the largest creditor from the largest debtor, so each transfer
+    settles at least one of them: at most n - 1 transfers in O(n log n). Ties go to
+    the lower user id, so the plan is stable between requests.
+    """
+    creditors = [(-cents, user_id) for user_id, cents in balances.items() if cents > 0]
+    debtors = [(cents, user_id) for user_id, cents in balances.items() if cents < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
+
+
+def settle_up(group_id: int, rows: Sequence) -> dict:
+    """compute_balances plus the transfers that settle them."""
+    balances = compute_balances(group_id, rows)
+    transfers = minimal_transfers({member["user_id"]: round(member["balance"] * 100) for member in balances["members"]})
+    return {
+        **balances,
+        "transfers": [
+            {"from_user_id": debtor, "to_user_id": creditor, "amount": cents / 100}
+            for debtor, creditor, cents in transfers
+        ]
+    }
+
+
+class BalanceService:
+    """Group balances and settle-up plans, read from the member ledgers rather than the transactions."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.memberships = MembershipService(db)
+
+    def get_balances(self, group_id: int, user_id: int) -> dict:
+        """Balances of everyone in a group the user belongs to."""
+        self.memberships.require_member(user_id, group_id)
+        return compute_balances(group_id, self.db.execute(balances_statement(group_id)).all())
+
+    def settle_up(self, group_id: int, user_id: int) -> dict:
+        """Balances and the greedy transfers that settle them, for a group the user belongs to."""
+        self.memberships.require_member(user_id, group_id)
+        return settle_up(group_id, self.db.execute(balances_statement(group_id)).all())
+
+
+class AsyncBalanceService:
+    """BalanceService on an AsyncSession, running the same statement."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.memberships = AsyncMembershipService(db)
+
+    async def get_balances(self, group_id: int, user_id: int) -> dict:
+        """Balances of everyone in a group the user belongs to."""
+        await self.memberships.require_member(user_id, group_id)
+        return compute_balances(group_id, (await self.db.execute(balances_statement(group_id))).all())
+
+    async def settle_up(self, group_id: int, user_id: int) -> dict:
+        """Balances and the greedy transfers that settle them, for a group the user belongs to."""
+        await self.memberships.require_member(user_id, group_id)
+        return settle_up(group_id, (await self.db.execute(balances_statement(group_id))).all())
@@ -1,6 +1,10 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, text
 from typing import List, Dict, Any
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import reads_from_replica
 from app.models.group import Group
 from app.models.group_member import GroupMember
 from app.models.user import User
@@ -19,100 +23,147 @@ class RecentTransaction(BaseModel):
     group_name: str
 
 
+RECENT_TRANSACTIONS_QUERY = text("""
+    SELECT
+        t.id,
+        t.amount,
+        t.note,
+        t.date,
+        t.paid_by,
+        t.group_id,
+        g.name as group_name,
+        u.full_name as paid_by_name
+    FROM transactions t
+    JOIN groups g ON t.group_id = g.id
+    LEFT JOIN users u ON t.paid_by = u.id
+    JOIN group_members gm ON t.group_id = gm.group_id
+    WHERE gm.user_id = :user_id
+    ORDER BY t.date DESC
+    LIMIT :limit
+""")
+
+# Totals come from the group_stats summary rows; only the last week's activity is counted from transactions
+DASHBOARD_STATS_QUERY = text("""
+    WITH user_groups AS (
+        SELECT gm.group_id
+        FROM group_members gm
+        WHERE gm.user_id = :user_id
+    ),
+    totals AS (
+        SELECT
+            SUM(s.transaction_count) as total_transactions,
+            SUM(s.income_total + s.expense_total) as total_amount
+        FROM user_groups ug
+        JOIN group_stats s ON s.group_id = ug.group_id
+    )
+    SELECT
+        (SELECT COUNT(*) FROM user_groups) as total_groups,
+        (SELECT ARRAY_AGG(group_id) FROM user_groups) as group_ids,
+        totals.total_transactions,
+        totals.total_amount,
+        (
+            SELECT COUNT(*)
+            FROM user_groups ug
+            JOIN transactions t ON t.group_id = ug.group_id
+            WHERE t.date >= NOW() - INTERVAL '7 days'
+        ) as recent_activity_count
+    FROM totals
+""")
+
+EMPTY_DASHBOARD_STATS = {
+    "total_groups": 0,
+    "total_transactions": 0,
+    "total_amount": 0.0,
+    "recent_activity_count": 0
+}
+
+
+# Dashboard stats snapshots keyed by user_id: {"group_ids": frozenset, "stats": dict}
+dashboard_stats_cache = TTLCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+def invalidate_user_dashboard_stats(*user_ids: int) -> None:
+    """Drop the cached dashboard stats of users whose groups changed."""
+    for user_id in user_ids:
+        dashboard_stats_cache.invalidate(user_id)
+
+
+def invalidate_group_dashboard_stats(group_id: int) -> None:
+    """Drop the cached dashboard stats of every user whose snapshot includes the group."""
+    dashboard_stats_cache.invalidate_values_where(lambda snapshot: group_id in snapshot["group_ids"])
+
+
+def _recent_transactions(rows) -> List[RecentTransaction]:
+    return [
+        RecentTransaction(
+            id=t.id,
+            amount=float(t.amount),
+            note=t.note,
+            date=t.date.isoformat(),
+            paid_by=t.paid_by,
+            paid_by_name=t.paid_by_name,
+            group_id=t.group_id,
+            group_name=t.group_name
+        )
+        for t in rows
+    ]
+
+
+def _dashboard_snapshot(stats) -> Dict[str, Any]:
+    if not stats:
+        return {"group_ids": frozenset(), "stats": dict(EMPTY_DASHBOARD_STATS)}
+
+    return {
+        "group_ids": frozenset(stats.group_ids or ()),
+        "stats": {
+            "total_groups": stats.total_groups or 0,
+            "total_transactions": int(stats.total_transactions or 0),
+            "total_amount": float(stats.total_amount or 0),
+            "recent_activity_count": stats.recent_activity_count or 0
+        }
+    }
+
+
+def _cache_snapshot(db, user_id: int, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    # Like the count and membership caches, only primary reads are cached so replica lag cannot outlive invalidation
+    if not reads_from_replica(db):
+        dashboard_stats_cache.set(user_id, snapshot)
+    return dict(snapshot["stats"])
+
+
 class DashboardService:
     def __init__(self, db: Session):
         self.db = db
 
     def get_recent_transactions(self, user_id: int, limit: int = 5) -> List[RecentTransaction]:
         """Get recent transactions from all user's groups using raw SQL."""
-        try:
-            query = text("""
-                SELECT 
-                    t.id,
-                    t.amount,
-                    t.note,
-                    t.date,
-                    t.paid_by,
-                    t.group_id,
-                    g.name as group_name,
-                    u.full_name as paid_by_name
-                FROM transactions t
-                JOIN groups g ON t.group_id = g.id
-                LEFT JOIN users u ON t.paid_by = u.id
-                JOIN group_members gm ON t.group_id = gm.group_id
-                WHERE gm.user_id = :user_id
-                ORDER BY t.date DESC
-                LIMIT :limit
-            """)
-            
-            result = self.db.execute(query, {"user_id": user_id, "limit": limit})
-            transactions = result.fetchall()
-            
-            return [
-                RecentTransaction(
-                    id=t.id,
-                    amount=float(t.amount),
-                    note=t.note,
-                    date=t.date.isoformat(),
-                    paid_by=t.paid_by,
-                    paid_by_name=t.paid_by_name,
-                    group_id=t.group_id,
-                    group_name=t.group_name
-                )
-                for t in transactions
-            ]
-        except Exception as e:
-            print(f"Error in get_recent_transactions: {e}")
-            return []
+        result = self.db.execute(RECENT_TRANSACTIONS_QUERY, {"user_id": user_id, "limit": limit})
+        return _recent_transactions(result.fetchall())
 
     def get_user_dashboard_stats(self, user_id: int) -> Dict[str, Any]:
-        """Get comprehensive dashboard statistics for a user using raw SQL."""
-        try:
-            query = text("""
-                WITH user_groups AS (
-                    SELECT gm.group_id
-                    FROM group_members gm
-                    WHERE gm.user_id = :user_id
-                ),
-                group_stats AS (
-                    SELECT 
-                        COUNT(DISTINCT ug.group_id) as total_groups,
-                        COUNT(t.id) as total_transactions,
-                        COALESCE(SUM(t.amount), 0) as total_amount,
-                        COUNT(CASE WHEN t.date >= NOW() - INTERVAL '7 days' THEN 1 END) as recent_activity_count
-                    FROM user_groups ug
-                    LEFT JOIN transactions t ON ug.group_id = t.group_id
-                )
-                SELECT 
-                    total_groups,
-                    total_transactions,
-                    total_amount,
-                    recent_activity_count
-                FROM group_stats
-            """)
-            
-            result = self.db.execute(query, {"user_id": user_id})
-            stats = result.fetchone()
-            
-            if not stats:
-                return {
-                    "total_groups": 0,
-                    "total_transactions": 0,
-                    "total_amount": 0.0,
-                    "recent_activity_count": 0
-                }
-            
-            return {
-                "total_groups": stats.total_groups or 0,
-                "total_transactions": stats.total_transactions or 0,
-                "total_amount": float(stats.total_amount or 0),
-                "recent_activity_count": stats.recent_activity_count or 0
-            }
-        except Exception as e:
-            print(f"Error in get_user_dashboard_stats: {e}")
-            return {
-                "total_groups": 0,
-                "total_transactions": 0,
-                "total_amount": 0.0,
-                "recent_activity_count": 0
-            } 
\ No newline at end of file
+        """Get comprehensive dashboard statistics for a user, from the cache when a snapshot is current."""
+        snapshot = dashboard_stats_cache.get(user_id)
+        if snapshot is not None:
+            return dict(snapshot["stats"])
+        result = self.db.execute(DASHBOARD_STATS_QUERY, {"user_id": user_id})
+        return _cache_snapshot(self.db, user_id, _dashboard_snapshot(result.fetchone()))
+
+
+class AsyncDashboardService:
+    """DashboardService on an AsyncSession, running the same queries."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_recent_transactions(self, user_id: int, limit: int = 5) -> List[RecentTransaction]:
+        """Get recent transactions from all user's groups using raw SQL."""
+        result = await self.db.execute(RECENT_TRANSACTIONS_QUERY, {"user_id": user_id, "limit": limit})
+        return _recent_transactions(result.fetchall())
+
+    async def get_user_dashboard_stats(self, user_id: int) -> Dict[str, Any]:
+        """Get comprehensive dashboard statistics for a user, from the cache when a snapshot is current."""
+        snapshot = dashboard_stats_cache.get(user_id)
+        if snapshot is not None:
+            return dict(snapshot["stats"])
+        result = await self.db.execute(DASHBOARD_STATS_QUERY, {"user_id": user_id})
+        return _cache_snapshot(self.db, user_id, _dashboard_snapshot(result.fetchone()))
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func, text
 from typing import List, Optional, Dict, Any
@@ -5,8 +6,16 @@ from app.models.group import Group
 from app.models.group_member import GroupMember
 from app.models.user import User
 from app.models.transaction import Transaction
+from app.models.import_job import ImportJob
+from app.models.group_stats import GroupStatsSummary
+from app.models.monthly_rollup import TransactionMonthlyRollup
+from app.models.member_ledger import GroupMemberLedger
 from app.schemas.group import GroupCreate
+from app.services.group_stats_service import GroupStatsService
+from app.services.summary_service import SummaryService
+from app.services.membership_service import MembershipService, invalidate_user_memberships
 from app.services.notification_service import NotificationService
+from app.services.transaction_service import invalidate_group_caches, invalidate_user_caches
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 
@@ -18,14 +27,56 @@ class GroupStats(BaseModel):
     owner_name: str
     member_count: int
     transaction_count: int
-    total_amount: float
+    total_amount: float  # Income and expenses together
+    total_income: float
+    total_expense: float
     created_at: str
     last_transaction_at: Optional[str] = None
 
 
+# Groups of :user_id with their stats. Transaction totals come from the group_stats summary rows,
+# so the cost does not grow with the transactions; members are counted from the (group_id, user_id) index
+GROUP_STATS_SQL = """
+    SELECT
+        g.id,
+        g.name,
+        g.owner_id,
+        g.created_at,
+        u.full_name as owner_name,
+        (SELECT COUNT(*) FROM group_members gm_all WHERE gm_all.group_id = g.id) as member_count,
+        COALESCE(s.transaction_count, 0) as transaction_count,
+        COALESCE(s.income_total, 0) as total_income,
+        COALESCE(s.expense_total, 0) as total_expense,
+        s.last_transaction_at
+    FROM groups g
+    JOIN group_members gm ON g.id = gm.group_id AND gm.user_id = :user_id
+    JOIN users u ON g.owner_id = u.id
+    LEFT JOIN group_stats s ON s.group_id = g.id
+"""
+GROUP_STATS_QUERY = text(GROUP_STATS_SQL)
+GROUP_STATS_BY_ID_QUERY = text(GROUP_STATS_SQL + "WHERE g.id = :group_id")
+
+
+def _group_stats(group_data) -> GroupStats:
+    return GroupStats(
+        id=group_data.id,
+        name=group_data.name,
+        owner_id=group_data.owner_id,
+        owner_name=group_data.owner_name,
+        member_count=group_data.member_count,
+        transaction_count=group_data.transaction_count,
+        total_amount=float(group_data.total_income + group_data.total_expense),
+        total_income=float(group_data.total_income),
+        total_expense=float(group_data.total_expense),
+        created_at=group_data.created_at.isoformat(),
+        last_transaction_at=group_data.last_transaction_at.isoformat() if group_data.last_transaction_at else None
+    )
+
+
 class GroupService:
     def __init__(self, db: Session):
         self.db = db
+        self.memberships = MembershipService(db)
 
     def create_group(self, group_data: GroupCreate, user_id: int) -> Group:
         """Create a new group and add creator as admin."""
@@ -46,6 +97,8 @@ class GroupService:
         )
         self.db.add(group_member)
         self.db.commit()
+        invalidate_user_memberships(user_id)
+        invalidate_user_caches(user_id)
         
         return db_group
 
@@ -65,99 +118,22 @@ class GroupService:
     def get_group_with_stats(self, group_id: int, user_id: int) -> Optional[GroupStats]:
         """Get group with detailed statistics using raw SQL."""
         # Verify user is member
-        member = self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
-        
-        if not member:
+        if not self.memberships.is_member(user_id, group_id):
             return None
 
-        # Get group with stats using raw SQL - fixed to avoid cartesian product
-        query = text("""
-            SELECT 
-                g.id,
-                g.name,
-                g.owner_id,
-                g.created_at,
-                u.full_name as owner_name,
-                (SELECT COUNT(DISTINCT gm_all.user_id) FROM group_members gm_all WHERE gm_all.group_id = g.id) as member_count,
-                (SELECT COUNT(t.id) FROM transactions t WHERE t.group_id = g.id) as transaction_count,
-                COALESCE((SELECT SUM(t.amount) FROM transactions t WHERE t.group_id = g.id), 0) as total_amount,
-                (SELECT MAX(t.date) FROM transactions t WHERE t.group_id = g.id) as last_transaction_at
-            FROM groups g
-            JOIN group_members gm ON g.id = gm.group_id AND gm.user_id = :user_id
-            JOIN users u ON g.owner_id = u.id
-            WHERE g.id = :group_id
-        """)
-        
-        result = self.db.execute(query, {"group_id": group_id, "user_id": user_id})
+        result = self.db.execute(GROUP_STATS_BY_ID_QUERY, {"group_id": group_id, "user_id": user_id})
         group_data = result.fetchone()
-        
-        if not group_data:
-            return None
-
-        return GroupStats(
-            id=group_data.id,
-            name=group_data.name,
-            owner_id=group_data.owner_id,
-            owner_name=group_data.owner_name,
-            member_count=group_data.member_count,
-            transaction_count=group_data.transaction_count,
-            total_amount=float(group_data.total_amount),
-            created_at=group_data.created_at.isoformat(),
-            last_transaction_at=group_data.last_transaction_at.isoformat() if group_data.last_transaction_at else None
-        )
+        return _group_stats(group_data) if group_data else None
 
     def get_user_groups_with_stats(self, user_id: int) -> List[GroupStats]:
         """Get all groups with statistics where user is a member."""
-        # Get groups with stats using raw SQL - fixed to avoid cartesian product
-        query = text("""
-            SELECT 
-                g.id,
-                g.name,
-                g.owner_id,
-                g.created_at,
-                u.full_name as owner_name,
-                (SELECT COUNT(DISTINCT gm_all.user_id) FROM group_members gm_all WHERE gm_all.group_id = g.id) as member_count,
-                (SELECT COUNT(t.id) FROM transactions t WHERE t.group_id = g.id) as transaction_count,
-                COALESCE((SELECT SUM(t.amount) FROM transactions t WHERE t.group_id = g.id), 0) as total_amount,
-                (SELECT MAX(t.date) FROM transactions t WHERE t.group_id = g.id) as last_transaction_at
-            FROM groups g
-            JOIN group_members gm ON g.id = gm.group_id AND gm.user_id = :user_id
-            JOIN users u ON g.owner_id = u.id
-        """)
-        
-        result = self.db.execute(query, {"user_id": user_id})
-        groups_data = result.fetchall()
-        
-        return [
-            GroupStats(
-                id=group_data.id,
-                name=group_data.name,
-                owner_id=group_data.owner_id,
-                owner_name=group_data.owner_name,
-                member_count=group_data.member_count,
-                transaction_count=group_data.transaction_count,
-                total_amount=float(group_data.total_amount),
-                created_at=group_data.created_at.isoformat(),
-                last_transaction_at=group_data.last_transaction_at.isoformat() if group_data.last_transaction_at else None
-            )
-            for group_data in groups_data
-        ]
-
-
+        result = self.db.execute(GROUP_STATS_QUERY, {"user_id": user_id})
+        return [_group_stats(group_data) for group_data in result.fetchall()]
 
     def invite_user_to_group(self, group_id: int, user_email: str, inviter_id: int) -> bool:
         """Invite a user to a group (only group admin can do this)."""
         # Check if inviter is admin of the group
-        group_member = self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == inviter_id,
-            GroupMember.role == "admin"
-        ).first()
-        
-        if not group_member:
+        if self.memberships.get_role(inviter_id, group_id) != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only group admins can invite members"
@@ -180,12 +156,7 @@ class GroupService:
             )
         
         # Check if user is already a member
-        existing_member = self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user.id
-        ).first()
-        
-        if existing_member:
+        if self.memberships.is_member(user.id, group_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User is already a member of this group"
@@ -218,13 +189,7 @@ class GroupService:
     def add_group_member(self, group_id: int, user_email: str, admin_id: int) -> bool:
         """Add a user to a group (only group admin can do this)."""
         # Check if admin is admin of the group
-        group_member = self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == admin_id,
-            GroupMember.role == "admin"
-        ).first()
-        
-        if not group_member:
+        if self.memberships.get_role(admin_id, group_id) != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only group admins can add members"
@@ -247,12 +212,7 @@ class GroupService:
             )
         
         # Check if user is already a member
-        existing_member = self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user.id
-        ).first()
-        
-        if existing_member:
+        if self.memberships.is_member(user.id, group_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User is already a member of this group"
@@ -265,23 +225,17 @@ class GroupService:
             role="member"
         )
         self.db.add(new_member)
+        GroupStatsService(self.db).touch(group_id)
         self.db.commit()
+        invalidate_user_memberships(user.id)
+        invalidate_user_caches(user.id)
         
         return True
 
     def get_group_members(self, group_id: int, user_id: int) -> List[Dict[str, Any]]:
         """Get all members of a group if user is a member."""
         # Check if user is member of the group
-        member = self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
-        
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this group"
-            )
+        self.memberships.require_member(user_id, group_id)
         
         # Get all members with user details
         members = self.db.query(
@@ -322,14 +276,25 @@ class GroupService:
             )
         
         # Delete all group members first
+        member_ids = [gm.user_id for gm in self.db.query(GroupMember.user_id).filter(
+            GroupMember.group_id == group_id
+        ).all()]
         self.db.query(GroupMember).filter(GroupMember.group_id == group_id).delete()
         
-        # Delete all transactions in the group
+        # Delete all transactions in the group, and their summaries
         self.db.query(Transaction).filter(Transaction.group_id == group_id).delete()
+        self.db.query(GroupStatsSummary).filter(GroupStatsSummary.group_id == group_id).delete()
+        self.db.query(TransactionMonthlyRollup).filter(TransactionMonthlyRollup.group_id == group_id).delete()
+        self.db.query(GroupMemberLedger).filter(GroupMemberLedger.group_id == group_id).delete()
+
+        # Delete the group's import jobs
+        self.db.query(ImportJob).filter(ImportJob.group_id == group_id).delete()
         
         # Delete the group
         self.db.delete(group)
         self.db.commit()
+        invalidate_user_memberships(*member_ids)
+        invalidate_group_caches(group_id)
         
         return True
 
@@ -351,6 +316,7 @@ class GroupService:
         
         # Update group name
         group.name = name
+        GroupStatsService(self.db).touch(group_id)
         self.db.commit()
         self.db.refresh(group)
         
@@ -372,8 +338,28 @@ class GroupService:
                 detail="Only group owner can clear transactions"
             )
         
-        # Delete all transactions in the group
+        # Delete all transactions in the group, emptying its summaries first (see GroupStatsService.reset)
+        SummaryService(self.db).reset(group_id)
         self.db.query(Transaction).filter(Transaction.group_id == group_id).delete()
         self.db.commit()
+        invalidate_group_caches(group_id)
         
-        return True 
\ No newline at end of file
+        return True 
+
+
+class AsyncGroupService:
+    """Group stats reads on an AsyncSession, running the same queries as GroupService."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_group_with_stats(self, group_id: int, user_id: int) -> Optional[GroupStats]:
+        """Get group with detailed statistics; the query itself only matches groups the user belongs to."""
+        result = await self.db.execute(GROUP_STATS_BY_ID_QUERY, {"group_id": group_id, "user_id": user_id})
+        group_data = result.fetchone()
+        return _group_stats(group_data) if group_data else None
+
+    async def get_user_groups_with_stats(self, user_id: int) -> List[GroupStats]:
+        """Get all groups with statistics where user is a member."""
+        result = await self.db.execute(GROUP_STATS_QUERY, {"user_id": user_id})
+        return [_group_stats(group_data) for group_data in result.fetchall()]
@@ -0,0 +1,157 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional
+from sqlalchemy import Numeric, cast, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.constants.transactions import TransactionType
+from app.core.database import lift_timeouts
+from app.models.group import Group
+from app.models.group_stats import GroupStatsSummary
+from app.models.transaction import Transaction
+from app.utils.amounts import numeric_amount
+
+
+class GroupStatsDelta:
+    """Changes to the group_stats rows of the groups touched by a write, summed per group."""
+
+    def __init__(self):
+        self.groups: Dict[int, dict] = {}
+
+    def add(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self._apply(row, 1)
+
+    def remove(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self._apply(row, -1)
+
+    def touch(self, group_id: int) -> dict:
+        """Include a group without changing its totals, so applying the delta still bumps its version."""
+        return self.groups.setdefault(group_id, {
+            "group_id": group_id,
+            "transaction_count": 0,
+            "income_total": Decimal(0),
+            "expense_total": Decimal(0)
+        })
+
+    def _apply(self, row: Mapping, sign: int) -> None:
+        delta = self.touch(row['group_id'])
+        delta["transaction_count"] += sign
+        amount = numeric_amount(row['amount'])
+        if TransactionType(row['type']) == TransactionType.INCOME:
+            delta["income_total"] += sign * amount
+        else:
+            delta["expense_total"] += sign * amount
+
+
+class GroupStatsService:
+    """Keeps the group_stats summary rows in step with the transactions table.
+
+    Write paths pass the rows they removed and added (through SummaryService) before
+    committing, so a summary always changes in the same database transaction as its transactions.
+    Each change bumps the row's version, including edits that leave the totals as
+    they were, so the version identifies the state of everything in the group.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_changes(self, removed: Iterable[Mapping] = (), added: Iterable[Mapping] = ()) -> None:
+        """Apply the rows a write removed and added (mappings with group_id, type, amount and date)."""
+        delta = GroupStatsDelta()
+        delta.remove(removed)
+        delta.add(added)
+        self.apply(delta)
+
+    def touch(self, *group_ids: int) -> None:
+        """Bump the groups' versions after a change outside their transactions, e.g. to the members or name."""
+        delta = GroupStatsDelta()
+        for group_id in group_ids:
+            delta.touch(group_id)
+        self.apply(delta)
+
+    def apply(self, delta: GroupStatsDelta) -> None:
+        """Add the delta to the groups' rows, creating missing ones, and refresh their versions and latest dates.
+
+        Rows are locked in group order so concurrent writes cannot deadlock. The latest
+        date cannot be maintained by addition once rows are removed, so it is re-read
+        from the (group_id, date) index in a second statement; running after the lock
+        is taken, it sees every write committed before this one.
+        """
+        if not delta.groups:
+            return
+        group_ids = sorted(delta.groups)
+        stmt = pg_insert(GroupStatsSummary).values([delta.groups[group_id] for group_id in group_ids])
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[GroupStatsSummary.group_id],
+            set_={
+                "transaction_count": GroupStatsSummary.transaction_count + stmt.excluded.transaction_count,
+                "income_total": GroupStatsSummary.income_total + stmt.excluded.income_total,
+                "expense_total": GroupStatsSummary.expense_total + stmt.excluded.expense_total,
+                "version": GroupStatsSummary.version + 1
+            }
+        ))
+        self.db.execute(
+            update(GroupStatsSummary)
+            .where(GroupStatsSummary.group_id.in_(group_ids))
+            .values(last_transaction_at=select(func.max(Transaction.date)).where(
+                Transaction.group_id == GroupStatsSummary.group_id
+            ).scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+
+    def reset(self, group_id: int) -> None:
+        """Zero a group's row ahead of deleting all of its transactions.
+
+        Call it before the DELETE: the row lock then holds back concurrent writes to
+        the group until commit, so rows they add after the DELETE are counted again.
+        """
+        stmt = pg_insert(GroupStatsSummary).values(
+            group_id=group_id, transaction_count=0, income_total=0, expense_total=0, last_transaction_at=None
+        )
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[GroupStatsSummary.group_id],
+            set_={
+                "transaction_count": 0,
+                "income_total": 0,
+                "expense_total": 0,
+                "last_transaction_at": None,
+                "version": GroupStatsSummary.version + 1
+            }
+        ))
+
+    def rebuild(self, group_ids: Optional[List[int]] = None) -> int:
+        """Recompute the rows of the given groups (all groups by default) from their transactions.
+
+        Takes an EXCLUSIVE lock on group_stats until commit: reads carry on, while
+        transaction writes wait so none lands between the recount and the overwrite.
+        The connection timeouts are lifted for the rest of the transaction, as a full
+        rebuild may outlast them. Returns the number of groups rebuilt.
+        """
+        lift_timeouts(self.db)
+        self.db.execute(text(f"LOCK TABLE {GroupStatsSummary.__tablename__} IN EXCLUSIVE MODE"))
+        amount = cast(Transaction.amount, Numeric)
+        totals = select(
+            Group.id,
+            func.count(Transaction.id),
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.INCOME), 0),
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.EXPENSE), 0),
+            func.max(Transaction.date)
+        ).select_from(Group).outerjoin(Transaction, Transaction.group_id == Group.id).group_by(Group.id)
+        if group_ids is not None:
+            totals = totals.where(Group.id.in_(group_ids))
+
+        stmt = pg_insert(GroupStatsSummary).from_select(
+            ["group_id", "transaction_count", "income_total", "expense_total", "last_transaction_at"], totals
+        )
+        result = self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[GroupStatsSummary.group_id],
+            set_={
+                "transaction_count": stmt.excluded.transaction_count,
+                "income_total": stmt.excluded.income_total,
+                "expense_total": stmt.excluded.expense_total,
+                "last_transaction_at": stmt.excluded.last_transaction_at,
+                "version": GroupStatsSummary.version + 1
+            }
+        ))
+        return result.rowcount
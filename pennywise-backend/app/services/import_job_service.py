@@ -0,0 +1,184 @@
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from fastapi import HTTPException, status, UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.constants.transactions import CSV_CONSTANTS, ImportJobStatus
+from app.core.config import settings
+from app.core.database import SessionLocal, engine, note_writer
+from app.models.import_job import ImportJob
+from app.services.transaction_service import TransactionService
+from app.utils.uploads import UploadTooLargeError, content_size, read_upload
+
+logger = logging.getLogger(__name__)
+
+
+# Bounded pool running import jobs in this process; further jobs wait in its queue
+import_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+
+
+def _job_lock(job_id: int):
+    return CSV_CONSTANTS['IMPORT_JOB_LOCK_CLASS'], job_id
+
+
+def submit_import_job(job_id: int) -> None:
+    """Queue a job on the worker pool."""
+    import_executor.submit(run_import_job, job_id)
+
+
+def run_import_job(job_id: int) -> None:
+    """Run a pending import job, recording its progress as it goes.
+
+    The worker holds a session-level advisory lock on a dedicated connection for the
+    whole run. Postgres drops it if the worker dies, which is how recover_import_jobs
+    tells orphaned jobs from running ones. The import itself is one transaction, so
+    an interrupted job leaves nothing behind and can simply run again. The upload is
+    read from the job row, so the job can run on any worker, including after a restart.
+    """
+    with engine.connect() as connection:
+        db = Session(bind=connection, expire_on_commit=False)
+        import_db = SessionLocal()
+        locked = False
+        try:
+            locked = db.execute(select(func.pg_try_advisory_lock(*_job_lock(job_id)))).scalar()
+            db.commit()
+            if not locked:
+                return  # Another worker owns the job
+
+            job = db.get(ImportJob, job_id)
+            if job is None or job.status != ImportJobStatus.PENDING.value:
+                return
+            job.status = ImportJobStatus.RUNNING.value
+            job.started_at = datetime.now(timezone.utc)
+            db.commit()
+
+            try:
+                upload = job.upload
+                if upload is None:
+                    raise FileNotFoundError(job_id)
+                job.content_size = content_size(upload)
+                db.commit()
+                note_writer(import_db, job.user_id)
+
+                def report(summary: dict) -> None:
+                    job.rows_imported = summary["count"]
+                    job.rows_skipped = summary["skipped_count"]
+                    job.rows_rejected = summary["rejected_count"]
+                    job.rejected_rows = list(summary["rejected_rows"])
+                    job.bytes_processed = summary["bytes_read"]
+                    db.commit()
+
+                summary = TransactionService(import_db).import_pennywise_csv(
+                    io.BytesIO(upload), job.group_id, job.user_id, job.user_mapping, progress=report
+                )
+                job.status = ImportJobStatus.COMPLETED.value
+                job.rows_imported = summary["count"]
+                job.rows_skipped = summary["skipped_count"]
+                job.rows_rejected = summary["rejected_count"]
+                job.rejected_rows = summary["rejected_rows"]
+                job.bytes_processed = summary["bytes_read"]
+            except FileNotFoundError:
+                job.status = ImportJobStatus.FAILED.value
+                job.error = "The uploaded file is no longer available; please upload it again"
+            except HTTPException as e:
+                job.status = ImportJobStatus.FAILED.value
+                job.error = str(e.detail)
+            except Exception as e:
+                logger.exception("Import job %s failed", job_id)
+                job.status = ImportJobStatus.FAILED.value
+                job.error = f"Import failed unexpectedly: {e}"
+            job.finished_at = datetime.now(timezone.utc)
+            job.upload = None  # Finished jobs do not run again
+            db.commit()
+        finally:
+            import_db.close()
+            if locked:
+                db.rollback()
+                db.execute(select(func.pg_advisory_unlock(*_job_lock(job_id))))
+                db.commit()
+            db.close()
+
+
+def recover_import_jobs() -> None:
+    """Requeue jobs left behind by a worker restart.
+
+    Running jobs whose advisory lock is free lost their worker and go back to pending;
+    every pending job is then submitted to the pool.
+    """
+    with engine.connect() as connection:
+        db = Session(bind=connection)
+        try:
+            running_ids = db.scalars(
+                select(ImportJob.id).where(ImportJob.status == ImportJobStatus.RUNNING.value)
+            ).all()
+            for job_id in running_ids:
+                if db.execute(select(func.pg_try_advisory_lock(*_job_lock(job_id)))).scalar():
+                    db.query(ImportJob).filter(
+                        ImportJob.id == job_id,
+                        ImportJob.status == ImportJobStatus.RUNNING.value  # It may have finished meanwhile
+                    ).update(
+                        {ImportJob.status: ImportJobStatus.PENDING.value, ImportJob.started_at: None}
+                    )
+                    db.commit()
+                    db.execute(select(func.pg_advisory_unlock(*_job_lock(job_id))))
+            db.commit()
+
+            pending_ids = db.scalars(
+                select(ImportJob.id)
+                .where(ImportJob.status == ImportJobStatus.PENDING.value)
+                .order_by(ImportJob.id)
+            ).all()
+        finally:
+            db.close()
+
+    for job_id in pending_ids:
+        submit_import_job(job_id)
+
+
+class ImportJobService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(self, upload: UploadFile, group_id: int, user_id: int, mapping: dict) -> ImportJob:
+        """Validate an import, store the upload on the job row and queue it as a background job."""
+        transaction_service = TransactionService(self.db)
+        transaction_service.memberships.require_member(user_id, group_id)
+        transaction_service.resolve_payer_mapping(group_id, mapping)
+
+        try:
+            data = read_upload(upload.file, CSV_CONSTANTS['MAX_FILE_SIZE'])
+        except UploadTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=str(e)
+            )
+
+        job = ImportJob(
+            user_id=user_id,
+            group_id=group_id,
+            filename=upload.filename,
+            user_mapping=mapping,
+            upload=data,
+            file_size=len(data),
+            status=ImportJobStatus.PENDING.value
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        submit_import_job(job.id)
+        return job
+
+    def get_job(self, job_id: int, user_id: int) -> ImportJob:
+        """Get one of the user's import jobs."""
+        job = self.db.query(ImportJob).filter(
+            ImportJob.id == job_id,
+            ImportJob.user_id == user_id
+        ).first()
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import job not found"
+            )
+        return job
@@ -0,0 +1,247 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from sqlalchemy import Numeric, and_, case, cast, delete, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.constants.transactions import TransactionType
+from app.core.database import lift_timeouts
+from app.models.group_member import GroupMember
+from app.models.member_ledger import GroupMemberLedger
+from app.models.transaction import Transaction
+from app.utils.amounts import amount_cents, numeric_amount
+
+LEDGER_KEY_FIELDS = ("group_id", "user_id")
+LEDGER_VALUE_FIELDS = ("paid_total", "expense_count", "owed_total")
+
+Membership = Tuple[datetime, int]  # (joined_at, user_id)
+
+
+def expense_sharers(members: Sequence[Membership], written_at: datetime) -> List[int]:
+    """User ids, ascending, of the members of a group who share an expense written at `written_at`.
+
+    Those are the members who had joined by then. An expense older than every
+    membership of its group, one moved in from another group, is shared by the
+    group's first members.
+    """
+    if not members:
+        return []
+    cutoff = max(written_at, min(joined_at for joined_at, _ in members))
+    return sorted(user_id for joined_at, user_id in members if joined_at <= cutoff)
+
+
+def split_cents(cents: int, count: int) -> List[int]:
+    """`cents` split equally `count` ways, the leftover cents going one each to the first shares."""
+    share, remainder = divmod(cents, count)
+    return [share + (1 if index < remainder else 0) for index in range(count)]
+
+
+class MemberLedgerDelta:
+    """Changes to the member ledger rows touched by a write, summed per (group, member).
+
+    Payers' totals are summed as rows come in. What an expense adds to each member's
+    share depends on who was in the group when it was written, so expenses are kept
+    aside until split() is given the groups' memberships.
+    """
+
+    def __init__(self):
+        self.members: Dict[Tuple[int, int], list] = {}
+        # (group_id, created_at, cents, sign) of the expenses still to split
+        self.shared: List[Tuple[int, Optional[datetime], int, int]] = []
+
+    def add(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self._apply(row, 1)
+
+    def remove(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self._apply(row, -1)
+
+    def _apply(self, row: Mapping, sign: int) -> None:
+        # Only expenses someone paid for are shared; income and payer-less expenses settle nothing
+        if row['paid_by'] is None or TransactionType(row['type']) != TransactionType.EXPENSE:
+            return
+        delta = self._member(row['group_id'], row['paid_by'])
+        delta[0] += sign * numeric_amount(row['amount'])
+        delta[1] += sign
+        # Rows being inserted have no created_at yet
+        self.shared.append((row['group_id'], row.get('created_at'), amount_cents(row['amount']), sign))
+
+    def _member(self, group_id: int, user_id: int) -> list:
+        return self.members.setdefault((group_id, user_id), [Decimal(0), 0, Decimal(0)])
+
+    def group_ids(self) -> Set[int]:
+        """The groups with expenses still to split."""
+        return {group_id for group_id, _, _, _ in self.shared}
+
+    def split(self, memberships: Mapping[int, Sequence[Membership]], now: Optional[datetime]) -> None:
+        """Add the shares of the expenses kept aside to what their sharers owe.
+
+        `memberships` lists the members of each group in group_ids(); `now` is the
+        database time, which rows being inserted get as their created_at.
+        """
+        for group_id, created_at, cents, sign in self.shared:
+            sharers = expense_sharers(memberships.get(group_id, ()), created_at or now)
+            for user_id, share in zip(sharers, split_cents(cents, len(sharers))):
+                self._member(group_id, user_id)[2] += sign * Decimal(share).scaleb(-2)
+        self.shared.clear()
+
+    def changes(self) -> List[dict]:
+        """The members whose totals or count changed, in lock order; call split() first."""
+        return [
+            {"group_id": group_id, "user_id": user_id, **dict(zip(LEDGER_VALUE_FIELDS, values))}
+            for (group_id, user_id), values in sorted(self.members.items())
+            if any(values)
+        ]
+
+
+def _actual_shares(group_ids: Optional[List[int]] = None):
+    """What each member owes per group, recomputed from the transactions and memberships.
+
+    Splits every expense with a payer the way MemberLedgerDelta.split does: in cents,
+    among the members who had joined when it was written (expense_sharers), with the
+    leftover cents going to the lowest user ids.
+    """
+    first_joined = select(
+        GroupMember.group_id, func.min(GroupMember.joined_at).label("first_joined")
+    ).group_by(GroupMember.group_id)
+    expenses = [Transaction.type == TransactionType.EXPENSE, Transaction.paid_by.is_not(None)]
+    if group_ids is not None:
+        first_joined = first_joined.where(GroupMember.group_id.in_(group_ids))
+        expenses.append(Transaction.group_id.in_(group_ids))
+    first_joined = first_joined.subquery("first_joined")
+
+    sharers = select(
+        Transaction.group_id,
+        GroupMember.user_id,
+        func.round(cast(Transaction.amount, Numeric) * 100).label("cents"),
+        func.row_number().over(partition_by=Transaction.id, order_by=GroupMember.user_id).label("position"),
+        func.count().over(partition_by=Transaction.id).label("sharer_count")
+    ).join(
+        first_joined, first_joined.c.group_id == Transaction.group_id
+    ).join(GroupMember, and_(
+        GroupMember.group_id == Transaction.group_id,
+        GroupMember.joined_at <= func.greatest(Transaction.created_at, first_joined.c.first_joined)
+    )).where(*expenses).subquery("sharers")
+
+    share = func.div(sharers.c.cents, sharers.c.sharer_count) + case(
+        (sharers.c.position <= func.mod(sharers.c.cents, sharers.c.sharer_count), 1), else_=0
+    )
+    return select(
+        sharers.c.group_id, sharers.c.user_id, (func.sum(share) / 100).label("owed_total")
+    ).group_by(sharers.c.group_id, sharers.c.user_id)
+
+
+def _actual_ledgers(group_ids: Optional[List[int]] = None):
+    """Ledger rows recomputed from the transactions and memberships tables."""
+    paid = select(
+        Transaction.group_id,
+        Transaction.paid_by.label("user_id"),
+        func.sum(cast(Transaction.amount, Numeric)).label("paid_total"),
+        func.count().label("expense_count")
+    ).where(
+        Transaction.type == TransactionType.EXPENSE, Transaction.paid_by.is_not(None)
+    ).group_by(Transaction.group_id, Transaction.paid_by)
+    if group_ids is not None:
+        paid = paid.where(Transaction.group_id.in_(group_ids))
+    paid = paid.subquery("paid")
+    owed = _actual_shares(group_ids).subquery("owed")
+    return select(
+        *(func.coalesce(paid.c[field], owed.c[field]).label(field) for field in LEDGER_KEY_FIELDS),
+        func.coalesce(paid.c.paid_total, 0).label("paid_total"),
+        func.coalesce(paid.c.expense_count, 0).label("expense_count"),
+        func.coalesce(owed.c.owed_total, 0).label("owed_total")
+    ).select_from(paid.join(
+        owed, and_(*(paid.c[field] == owed.c[field] for field in LEDGER_KEY_FIELDS)), full=True
+    )).where(or_(paid.c.expense_count.is_not(None), owed.c.owed_total != 0))
+
+
+class MemberLedgerService:
+    """Keeps group_member_ledgers, what each member paid and owes per group, in step with the transactions table.
+
+    Applied alongside group_stats (see SummaryService), whose row locks serialize the
+    writes to a group's ledger the same way they do for the monthly rollups.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, delta: MemberLedgerDelta) -> None:
+        """Split the delta's expenses, then add it to the ledger rows, creating missing ones and dropping emptied ones."""
+        group_ids = delta.group_ids()
+        if group_ids:
+            rows = self.db.execute(select(
+                GroupMember.group_id, GroupMember.joined_at, GroupMember.user_id, func.now().label("now")
+            ).where(GroupMember.group_id.in_(sorted(group_ids)))).all()
+            memberships: Dict[int, List[Membership]] = {}
+            for row in rows:
+                memberships.setdefault(row.group_id, []).append((row.joined_at, row.user_id))
+            delta.split(memberships, rows[0].now if rows else None)
+        changes = delta.changes()
+        if not changes:
+            return
+        stmt = pg_insert(GroupMemberLedger).values(changes)
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[getattr(GroupMemberLedger, field) for field in LEDGER_KEY_FIELDS],
+            set_={
+                "paid_total": GroupMemberLedger.paid_total + stmt.excluded.paid_total,
+                "expense_count": GroupMemberLedger.expense_count + stmt.excluded.expense_count,
+                "owed_total": GroupMemberLedger.owed_total + stmt.excluded.owed_total
+            }
+        ))
+        self.db.execute(delete(GroupMemberLedger).where(
+            GroupMemberLedger.group_id.in_({change["group_id"] for change in changes}),
+            GroupMemberLedger.expense_count == 0,
+            GroupMemberLedger.owed_total == 0
+        ))
+
+    def delete_group(self, group_id: int) -> None:
+        """Drop a group's ledger, along with all of its transactions."""
+        self.db.execute(delete(GroupMemberLedger).where(GroupMemberLedger.group_id == group_id))
+
+    def rebuild(self, group_ids: Optional[List[int]] = None) -> int:
+        """Recompute the ledgers of the given groups (all groups by default) from their transactions and members.
+
+        Takes an EXCLUSIVE lock on the table until commit, as GroupStatsService.rebuild
+        does, and lifts the connection timeouts for the rest of the transaction, as
+        splitting every expense among its members may outlast them. Returns the
+        number of ledger rows written.
+        """
+        lift_timeouts(self.db)
+        self.db.execute(text(f"LOCK TABLE {GroupMemberLedger.__tablename__} IN EXCLUSIVE MODE"))
+        stale = delete(GroupMemberLedger)
+        if group_ids is not None:
+            stale = stale.where(GroupMemberLedger.group_id.in_(group_ids))
+        self.db.execute(stale)
+        result = self.db.execute(pg_insert(GroupMemberLedger).from_select(
+            [*LEDGER_KEY_FIELDS, *LEDGER_VALUE_FIELDS], _actual_ledgers(group_ids)
+        ))
+        return result.rowcount
+
+    def verify(self, group_ids: Optional[List[int]] = None) -> List[dict]:
+        """Compare the ledgers with the transactions, returning every member on which they differ.
+
+        Lifts the connection timeouts for the rest of the transaction, like rebuild.
+        """
+        lift_timeouts(self.db)
+        actual = _actual_ledgers(group_ids).subquery("actual")
+        stored = select(GroupMemberLedger)
+        if group_ids is not None:
+            stored = stored.where(GroupMemberLedger.group_id.in_(group_ids))
+        stored = stored.subquery("stored")
+        stmt = select(
+            *(func.coalesce(actual.c[field], stored.c[field]).label(field) for field in LEDGER_KEY_FIELDS),
+            actual.c.paid_total.label("actual_total"),
+            stored.c.paid_total.label("stored_total"),
+            actual.c.expense_count.label("actual_count"),
+            stored.c.expense_count.label("stored_count"),
+            actual.c.owed_total.label("actual_owed"),
+            stored.c.owed_total.label("stored_owed")
+        ).select_from(actual.join(
+            stored, and_(*(actual.c[field] == stored.c[field] for field in LEDGER_KEY_FIELDS)), full=True
+        )).where(or_(
+            actual.c.paid_total.is_distinct_from(stored.c.paid_total),
+            actual.c.expense_count.is_distinct_from(stored.c.expense_count),
+            actual.c.owed_total.is_distinct_from(stored.c.owed_total)
+        )).order_by(*LEDGER_KEY_FIELDS)
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
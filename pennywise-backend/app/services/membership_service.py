@@ -0,0 +1,141 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import reads_from_replica
+from app.models.group_member import GroupMember
+from fastapi import HTTPException, status
+
+
+# group_id -> role maps keyed by user_id, shared across requests
+membership_cache = TTLCache(ttl_seconds=settings.MEMBERSHIP_CACHE_TTL_SECONDS)
+
+
+def invalidate_user_memberships(*user_ids: int) -> None:
+    """Drop cached memberships of users whose groups changed."""
+    for user_id in user_ids:
+        membership_cache.invalidate(user_id)
+
+
+def _roles_query(user_id: int):
+    return select(GroupMember.group_id, GroupMember.role).where(GroupMember.user_id == user_id)
+
+
+class MembershipService:
+    """Resolves group membership and roles, loading each user's memberships once per request.
+
+    Memberships found in the cache are trusted; a group missing from a cached map
+    is re-read from the database once, so a membership granted by another worker
+    is never refused because of a stale cache entry. Only primary reads fill the
+    cache, so replica lag cannot keep a revoked membership cached.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._roles: Dict[int, Dict[int, str]] = {}
+        self._reloaded: set[int] = set()
+
+    def get_roles(self, user_id: int) -> Dict[int, str]:
+        """Get the user's group_id -> role map."""
+        roles = self._roles.get(user_id)
+        if roles is None:
+            roles = membership_cache.get(user_id)
+            if roles is None:
+                roles = self._load_roles(user_id)
+            self._roles[user_id] = roles
+        return roles
+
+    def get_group_ids(self, user_id: int) -> List[int]:
+        """Get the ids of all groups the user belongs to."""
+        return list(self.get_roles(user_id))
+
+    def get_role(self, user_id: int, group_id: int) -> Optional[str]:
+        """Get the user's role in a group, or None if they are not a member."""
+        role = self.get_roles(user_id).get(group_id)
+        if role is None and user_id not in self._reloaded:
+            role = self._load_roles(user_id).get(group_id)
+        return role
+
+    def is_member(self, user_id: int, group_id: int) -> bool:
+        """Check whether the user belongs to the group."""
+        return self.get_role(user_id, group_id) is not None
+
+    def require_member(
+        self,
+        user_id: int,
+        group_id: int,
+        detail: str = "You are not a member of this group"
+    ) -> str:
+        """Return the user's role in the group, raising 403 if they are not a member."""
+        role = self.get_role(user_id, group_id)
+        if role is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return role
+
+    def _load_roles(self, user_id: int) -> Dict[int, str]:
+        """Read the user's memberships from the database and refresh the cache."""
+        roles = dict(self.db.execute(_roles_query(user_id)).all())
+        if not reads_from_replica(self.db):
+            membership_cache.set(user_id, roles)
+        self._roles[user_id] = roles
+        self._reloaded.add(user_id)
+        return roles
+
+
+class AsyncMembershipService:
+    """MembershipService on an AsyncSession, sharing its cache and reload rules."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._roles: Dict[int, Dict[int, str]] = {}
+        self._reloaded: set[int] = set()
+
+    async def get_roles(self, user_id: int) -> Dict[int, str]:
+        """Get the user's group_id -> role map."""
+        roles = self._roles.get(user_id)
+        if roles is None:
+            roles = membership_cache.get(user_id)
+            if roles is None:
+                roles = await self._load_roles(user_id)
+            self._roles[user_id] = roles
+        return roles
+
+    async def get_group_ids(self, user_id: int) -> List[int]:
+        """Get the ids of all groups the user belongs to."""
+        return list(await self.get_roles(user_id))
+
+    async def get_role(self, user_id: int, group_id: int) -> Optional[str]:
+        """Get the user's role in a group, or None if they are not a member."""
+        role = (await self.get_roles(user_id)).get(group_id)
+        if role is None and user_id not in self._reloaded:
+            role = (await self._load_roles(user_id)).get(group_id)
+        return role
+
+    async def require_member(
+        self,
+        user_id: int,
+        group_id: int,
+        detail: str = "You are not a member of this group"
+    ) -> str:
+        """Return the user's role in the group, raising 403 if they are not a member."""
+        role = await self.get_role(user_id, group_id)
+        if role is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return role
+
+    async def _load_roles(self, user_id: int) -> Dict[int, str]:
+        """Read the user's memberships from the database and refresh the cache."""
+        roles = dict((await self.db.execute(_roles_query(user_id))).all())
+        if not reads_from_replica(self.db):
+            membership_cache.set(user_id, roles)
+        self._roles[user_id] = roles
+        self._reloaded.add(user_id)
+        return roles
@@ -0,0 +1,153 @@
+"""The month view: a month's totals and its first page of transactions in one round trip."""
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from fastapi import HTTPException, status
+from sqlalchemy import Numeric, cast, desc, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.constants.transactions import ReportPeriod, TransactionType
+from app.models.monthly_rollup import TransactionMonthlyRollup
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionFilters
+from app.services.report_service import report_totals, rollup_clauses, rollups_cover
+from app.services.transaction_service import AsyncTransactionService, TransactionService
+
+# Columns the totals CTE adds to every row of the page
+MONTH_TOTALS_COLUMNS = ("month_income", "month_expense", "month_transaction_count")
+
+
+class MonthBounds(NamedTuple):
+    month: str  # YYYY-MM
+    time_zone: str
+    start: datetime  # Aware, in time_zone
+    end: datetime    # Start of the next month
+
+
+def month_bounds(month: Optional[str], time_zone: str, now: Optional[datetime] = None) -> MonthBounds:
+    """The month ("YYYY-MM", default the current one) and its start and end in the given IANA time zone.
+
+    Raises 400 for an unknown time zone.
+    """
+    try:
+        zone = ZoneInfo(time_zone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown time zone '{time_zone}'"
+        )
+    if month is None:
+        local = (now or datetime.now(timezone.utc)).astimezone(zone)
+        year, month_number = local.year, local.month
+    else:
+        year, month_number = (int(part) for part in month.split("-"))
+    start = datetime(year, month_number, 1, tzinfo=zone)
+    end = datetime(year + month_number // 12, month_number % 12 + 1, 1, tzinfo=zone)
+    return MonthBounds(f"{year:04d}-{month_number:02d}", time_zone, start, end)
+
+
+def month_view_statement(group_ids: List[int], group_id: Optional[int], filters: TransactionFilters, limit: int):
+    """The month's totals and its first keyset page (plus one row) as a single statement.
+
+    The totals CTE always yields one row and the page is outer joined onto it, so an
+    empty month still returns its totals. Months that start and end on UTC month
+    boundaries take their totals from the monthly rollups when the filters allow;
+    the rest sum the month's transactions, which the (group_id, date) index covers.
+    """
+    if rollups_cover(ReportPeriod.MONTHLY, filters):
+        rollup = TransactionMonthlyRollup
+        totals = select(
+            func.coalesce(func.sum(rollup.total).filter(rollup.type == TransactionType.INCOME), 0).label("month_income"),
+            func.coalesce(func.sum(rollup.total).filter(rollup.type == TransactionType.EXPENSE), 0).label("month_expense"),
+            func.coalesce(func.sum(rollup.transaction_count), 0).label("month_transaction_count")
+        ).where(*rollup_clauses(group_ids, filters))
+    else:
+        amount = cast(Transaction.amount, Numeric)
+        totals = select(
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.INCOME), 0).label("month_income"),
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.EXPENSE), 0).label("month_expense"),
+            func.count().label("month_transaction_count")
+        ).where(*TransactionService._scope_clauses(group_ids, group_id, filters))
+    totals = totals.cte("totals")
+    page = TransactionService._keyset_page_select(
+        TransactionService._scope_clauses(group_ids, group_id, filters), limit
+    ).cte("page")
+    return (
+        select(totals, page)
+        .select_from(totals.outerjoin(page, true()))
+        .order_by(desc(page.c.date), desc(page.c.id))
+    )
+
+
+def build_month_view(bounds: MonthBounds, rows: List[dict], limit: int) -> dict:
+    """Shape month_view_statement rows into a MonthViewResponse payload."""
+    first = rows[0] if rows else dict.fromkeys(MONTH_TOTALS_COLUMNS, 0)
+    transactions = [
+        {key: value for key, value in row.items() if key not in MONTH_TOTALS_COLUMNS}
+        for row in rows if row["id"] is not None
+    ]
+    transactions, next_cursor = TransactionService._keyset_result(transactions, limit)
+    return {
+        "month": bounds.month,
+        "time_zone": bounds.time_zone,
+        "date_from": bounds.start,
+        "date_to": bounds.end,
+        "totals": report_totals(first["month_income"], first["month_expense"], first["month_transaction_count"]),
+        "transactions": transactions,
+        "limit": limit,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
+    }
+
+
+def _month_filters(filters: Optional[TransactionFilters], bounds: MonthBounds) -> TransactionFilters:
+    # The month replaces any date range of the listing filters
+    return (filters or TransactionFilters()).model_copy(update={"date_from": bounds.start, "date_to": bounds.end})
+
+
+class MonthViewService:
+    """Month totals alongside the first page of the month's transactions."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.transactions = TransactionService(db)
+
+    def get_month_view(
+        self,
+        user_id: int,
+        bounds: MonthBounds,
+        group_id: Optional[int] = None,
+        limit: int = 100,
+        filters: Optional[TransactionFilters] = None
+    ) -> dict:
+        """Month view over one group (membership checked) or all of the user's groups."""
+        group_ids = self.transactions.get_accessible_group_ids(user_id, group_id)
+        rows = []
+        if group_ids:
+            statement = month_view_statement(group_ids, group_id, _month_filters(filters, bounds), limit)
+            rows = [dict(row) for row in self.db.execute(statement).mappings()]
+        return build_month_view(bounds, rows, limit)
+
+
+class AsyncMonthViewService:
+    """MonthViewService on an AsyncSession, running the same statement."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transactions = AsyncTransactionService(db)
+
+    async def get_month_view(
+        self,
+        user_id: int,
+        bounds: MonthBounds,
+        group_id: Optional[int] = None,
+        limit: int = 100,
+        filters: Optional[TransactionFilters] = None
+    ) -> dict:
+        """Month view over one group (membership checked) or all of the user's groups."""
+        group_ids = await self.transactions.get_accessible_group_ids(user_id, group_id)
+        rows = []
+        if group_ids:
+            statement = month_view_statement(group_ids, group_id, _month_filters(filters, bounds), limit)
+            rows = [dict(row) for row in (await self.db.execute(statement)).mappings()]
+        return build_month_view(bounds, rows, limit)
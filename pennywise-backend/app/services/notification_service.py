@@ -1,11 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func, select
 from typing import List, Optional
 from app.models.notification import Notification
 from app.schemas.notification import NotificationCreate, NotificationUpdate
 from app.models.user import User
 
 
+def _counts_query(user_id: int):
+    """Total and unread notification counts of a user, in one pass."""
+    return select(
+        func.count(),
+        func.count().filter(Notification.is_read == False)
+    ).where(Notification.user_id == user_id)
+
+
+def _page_query(user_id: int, skip: int, limit: int, unread_only: bool):
+    query = select(Notification).where(Notification.user_id == user_id)
+    if unread_only:
+        query = query.where(Notification.is_read == False)
+    return query.order_by(desc(Notification.created_at)).offset(skip).limit(limit)
+
+
+def _unread_count_query(user_id: int):
+    return select(func.count()).select_from(Notification).where(
+        and_(Notification.user_id == user_id, Notification.is_read == False)
+    )
+
+
 class NotificationService:
     @staticmethod
     def create_notification(db: Session, notification_data: NotificationCreate) -> Notification:
@@ -25,19 +47,10 @@ class NotificationService:
         unread_only: bool = False
     ) -> tuple[List[Notification], int, int]:
         """Get notifications for a user with pagination"""
-        query = db.query(Notification).filter(Notification.user_id == user_id)
+        total_count, unread_count = db.execute(_counts_query(user_id)).one()
+        notifications = db.scalars(_page_query(user_id, skip, limit, unread_only)).all()
         
-        if unread_only:
-            query = query.filter(Notification.is_read == False)
-        
-        total_count = query.count()
-        unread_count = db.query(Notification).filter(
-            and_(Notification.user_id == user_id, Notification.is_read == False)
-        ).count()
-        
-        notifications = query.order_by(desc(Notification.created_at)).offset(skip).limit(limit).all()
-        
-        return notifications, total_count, unread_count
+        return notifications, unread_count if unread_only else total_count, unread_count
 
     @staticmethod
     def mark_notification_as_read(db: Session, notification_id: int, user_id: int) -> Optional[Notification]:
@@ -100,6 +113,27 @@ class NotificationService:
     @staticmethod
     def get_unread_count(db: Session, user_id: int) -> int:
         """Get the count of unread notifications for a user"""
-        return db.query(Notification).filter(
-            and_(Notification.user_id == user_id, Notification.is_read == False)
-        ).count() 
\ No newline at end of file
+        return db.execute(_unread_count_query(user_id)).scalar_one()
+
+
+class AsyncNotificationService:
+    """Notification reads on an AsyncSession, running the same queries as NotificationService."""
+
+    @staticmethod
+    async def get_user_notifications(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        unread_only: bool = False
+    ) -> tuple[List[Notification], int, int]:
+        """Get notifications for a user with pagination"""
+        total_count, unread_count = (await db.execute(_counts_query(user_id))).one()
+        notifications = (await db.scalars(_page_query(user_id, skip, limit, unread_only))).all()
+
+        return notifications, unread_count if unread_only else total_count, unread_count
+
+    @staticmethod
+    async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+        """Get the count of unread notifications for a user"""
+        return (await db.execute(_unread_count_query(user_id))).scalar_one()
@@ -0,0 +1,204 @@
+from collections import defaultdict
+from datetime import timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import Numeric, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.constants.transactions import REPORT_PERIOD_UNITS, ReportPeriod, TransactionType
+from app.models.monthly_rollup import TransactionMonthlyRollup
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionFilters
+from app.services.rollup_service import rollup_month
+from app.services.transaction_service import AsyncTransactionService, TransactionService
+
+
+def report_statement(group_ids: List[int], period: ReportPeriod, filters: Optional[TransactionFilters] = None):
+    """Income, expense and count per (period bucket, category) of the groups' matching transactions.
+
+    Buckets are truncated in UTC; undated transactions fall in no bucket and are left
+    out, as in the monthly rollups. The unit is rendered inline rather than bound, so
+    the GROUP BY expression is identical to the selected one.
+    """
+    bucket = func.date_trunc(
+        literal_column(f"'{REPORT_PERIOD_UNITS[period]}'"), Transaction.date, literal_column("'UTC'")
+    )
+    # Summed as numeric, like group_stats, so totals are exact
+    amount = cast(Transaction.amount, Numeric)
+    return (
+        select(
+            bucket.label("bucket"),
+            Transaction.category,
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.INCOME), 0).label("income"),
+            func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.EXPENSE), 0).label("expense"),
+            func.count().label("transaction_count")
+        )
+        .where(
+            Transaction.group_id.in_(group_ids),
+            Transaction.date.isnot(None),
+            *TransactionService._field_clauses(filters)
+        )
+        .group_by(bucket, Transaction.category)
+        .order_by(bucket)
+    )
+
+
+def rollups_cover(period: ReportPeriod, filters: Optional[TransactionFilters]) -> bool:
+    """Whether the monthly rollups hold everything a report needs.
+
+    That takes month or year buckets, date bounds on month starts (UTC) and filters
+    only on the rollup keys: type, category and payment mode.
+    """
+    if period == ReportPeriod.WEEKLY:
+        return False
+    if filters is None:
+        return True
+    if filters.paid_by or filters.amount_min is not None or filters.amount_max is not None:
+        return False
+    for bound in (filters.date_from, filters.date_to):
+        if bound is not None and rollup_month(bound) != (bound if bound.tzinfo else bound.replace(tzinfo=timezone.utc)):
+            return False
+    return True
+
+
+def rollup_clauses(group_ids: List[int], filters: Optional[TransactionFilters] = None) -> list:
+    """The filters as WHERE clauses on the monthly rollups; see rollups_cover for the filters they can take."""
+    rollup = TransactionMonthlyRollup
+    clauses = [rollup.group_id.in_(group_ids)]
+    if filters is not None:
+        if filters.date_from is not None:
+            clauses.append(rollup.month >= filters.date_from)
+        if filters.date_to is not None:
+            clauses.append(rollup.month < filters.date_to)
+        if filters.type is not None:
+            clauses.append(rollup.type == filters.type)
+        if filters.categories:
+            clauses.append(rollup.category.in_(filters.categories))
+        if filters.payment_modes:
+            clauses.append(rollup.payment_mode.in_(filters.payment_modes))
+    return clauses
+
+
+def rollup_report_statement(group_ids: List[int], period: ReportPeriod, filters: Optional[TransactionFilters] = None):
+    """report_statement over the monthly rollups, reading a few rows per month instead of every transaction."""
+    rollup = TransactionMonthlyRollup
+    bucket = func.date_trunc(
+        literal_column(f"'{REPORT_PERIOD_UNITS[period]}'"), rollup.month, literal_column("'UTC'")
+    )
+    return (
+        select(
+            bucket.label("bucket"),
+            func.nullif(rollup.category, literal_column("''")).label("category"),
+            func.coalesce(func.sum(rollup.total).filter(rollup.type == TransactionType.INCOME), 0).label("income"),
+            func.coalesce(func.sum(rollup.total).filter(rollup.type == TransactionType.EXPENSE), 0).label("expense"),
+            func.sum(rollup.transaction_count).label("transaction_count")
+        )
+        .where(*rollup_clauses(group_ids, filters))
+        .group_by(bucket, rollup.category)
+        .order_by(bucket)
+    )
+
+
+def _statement(group_ids: List[int], period: ReportPeriod, filters: Optional[TransactionFilters]):
+    if rollups_cover(period, filters):
+        return rollup_report_statement(group_ids, period, filters)
+    return report_statement(group_ids, period, filters)
+
+
+def report_totals(income: Decimal, expense: Decimal, transaction_count: int) -> dict:
+    """A ReportTotals payload from exact sums."""
+    return {
+        "income": float(income),
+        "expense": float(expense),
+        "net": float(income - expense),
+        "transaction_count": int(transaction_count),
+        "income_expense_ratio": round(float(income / expense), 4) if expense else None
+    }
+
+
+def _categories(totals: Dict[Optional[str], list]) -> List[dict]:
+    categories = [
+        {"category": category, "income": float(income), "expense": float(expense), "transaction_count": count}
+        for category, (income, expense, count) in totals.items()
+    ]
+    categories.sort(key=lambda category: (-category["expense"], -category["income"], category["category"] or ""))
+    return categories
+
+
+def build_report(
+    period: ReportPeriod, group_id: Optional[int], filters: Optional[TransactionFilters], rows
+) -> dict:
+    """Shape report_statement rows into a ReportResponse payload."""
+    overall = defaultdict(lambda: [Decimal(0), Decimal(0), 0])
+    buckets: Dict[object, Dict[str, list]] = {}
+    for row in rows:
+        per_bucket = buckets.setdefault(row.bucket, {})
+        per_bucket[row.category] = [row.income, row.expense, row.transaction_count]
+        category = overall[row.category]
+        category[0] += row.income
+        category[1] += row.expense
+        category[2] += row.transaction_count
+
+    def summed(categories: Dict[str, list]) -> dict:
+        return report_totals(
+            sum((values[0] for values in categories.values()), Decimal(0)),
+            sum((values[1] for values in categories.values()), Decimal(0)),
+            sum(values[2] for values in categories.values())
+        )
+
+    return {
+        "period": period,
+        "group_id": group_id,
+        "date_from": filters.date_from if filters else None,
+        "date_to": filters.date_to if filters else None,
+        "totals": summed(overall),
+        "categories": _categories(overall),
+        "buckets": [
+            {"start": start, **summed(categories), "categories": _categories(categories)}
+            for start, categories in buckets.items()
+        ]
+    }
+
+
+class ReportService:
+    """Weekly, monthly and yearly transaction reports, aggregated in SQL.
+
+    Monthly and yearly reports over whole months read the monthly rollups; the
+    rest aggregate the transactions themselves.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.transactions = TransactionService(db)
+
+    def get_report(
+        self,
+        user_id: int,
+        period: ReportPeriod,
+        group_id: Optional[int] = None,
+        filters: Optional[TransactionFilters] = None
+    ) -> dict:
+        """Report over one group (membership checked) or all of the user's groups."""
+        group_ids = self.transactions.get_accessible_group_ids(user_id, group_id)
+        rows = self.db.execute(_statement(group_ids, period, filters)).all() if group_ids else []
+        return build_report(period, group_id, filters, rows)
+
+
+class AsyncReportService:
+    """ReportService on an AsyncSession, running the same statement."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transactions = AsyncTransactionService(db)
+
+    async def get_report(
+        self,
+        user_id: int,
+        period: ReportPeriod,
+        group_id: Optional[int] = None,
+        filters: Optional[TransactionFilters] = None
+    ) -> dict:
+        """Report over one group (membership checked) or all of the user's groups."""
+        group_ids = await self.transactions.get_accessible_group_ids(user_id, group_id)
+        rows = (await self.db.execute(_statement(group_ids, period, filters))).all() if group_ids else []
+        return build_report(period, group_id, filters, rows)
@@ -0,0 +1,161 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from sqlalchemy import Numeric, and_, cast, delete, func, literal_column, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.constants.transactions import TransactionType
+from app.core.database import lift_timeouts
+from app.models.monthly_rollup import TransactionMonthlyRollup
+from app.models.transaction import Transaction
+from app.utils.amounts import numeric_amount
+
+RollupKey = Tuple[int, datetime, str, TransactionType, str]
+ROLLUP_KEY_FIELDS = ("group_id", "month", "category", "type", "payment_mode")
+
+
+def rollup_month(date: datetime) -> datetime:
+    """Start of the date's month in UTC, the rollup key; naive datetimes are taken as UTC."""
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc)
+    return datetime(date.year, date.month, 1, tzinfo=timezone.utc)
+
+
+class MonthlyRollupDelta:
+    """Changes to the monthly rollup rows touched by a write, summed per key."""
+
+    def __init__(self):
+        self.keys: Dict[RollupKey, list] = {}
+
+    def add(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self._apply(row, 1)
+
+    def remove(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self._apply(row, -1)
+
+    def _apply(self, row: Mapping, sign: int) -> None:
+        if row['date'] is None:
+            return  # Undated transactions belong to no month
+        key = (
+            row['group_id'], rollup_month(row['date']), row['category'] or '',
+            TransactionType(row['type']), row['payment_mode'] or ''
+        )
+        delta = self.keys.setdefault(key, [Decimal(0), 0])
+        delta[0] += sign * numeric_amount(row['amount'])
+        delta[1] += sign
+
+    def changes(self) -> List[dict]:
+        """The keys whose total or count changed, in lock order."""
+        return [
+            {**dict(zip(ROLLUP_KEY_FIELDS, key)), "total": total, "transaction_count": count}
+            for key, (total, count) in sorted(self.keys.items(), key=lambda item: _sort_key(item[0]))
+            if total or count
+        ]
+
+
+def _sort_key(key: RollupKey) -> tuple:
+    group_id, month, category, transaction_type, payment_mode = key
+    return group_id, month, category, transaction_type.value, payment_mode
+
+
+def _month_expression(column):
+    # The unit and zone are rendered inline so GROUP BY repeats the selected expression exactly
+    return func.date_trunc(literal_column("'month'"), column, literal_column("'UTC'"))
+
+
+def _actual_rollups(group_ids: Optional[List[int]] = None):
+    """Rollup rows recomputed from the transactions table."""
+    month = _month_expression(Transaction.date)
+    category = func.coalesce(Transaction.category, literal_column("''"))
+    payment_mode = func.coalesce(Transaction.payment_mode, literal_column("''"))
+    stmt = select(
+        Transaction.group_id,
+        month.label("month"),
+        category.label("category"),
+        Transaction.type,
+        payment_mode.label("payment_mode"),
+        func.sum(cast(Transaction.amount, Numeric)).label("total"),
+        func.count().label("transaction_count")
+    ).where(Transaction.date.is_not(None)).group_by(Transaction.group_id, month, category, Transaction.type, payment_mode)
+    if group_ids is not None:
+        stmt = stmt.where(Transaction.group_id.in_(group_ids))
+    return stmt
+
+
+class MonthlyRollupService:
+    """Keeps transaction_monthly_rollups in step with the transactions table.
+
+    Applied alongside group_stats (see SummaryService): that upsert has already
+    locked the group_stats rows of the groups involved, so writes to a group's
+    rollups are serialized and rows left at zero can be dropped safely.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, delta: MonthlyRollupDelta) -> None:
+        """Add the delta to the rollup rows, creating missing ones and dropping emptied ones."""
+        changes = delta.changes()
+        if not changes:
+            return
+        stmt = pg_insert(TransactionMonthlyRollup).values(changes)
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[getattr(TransactionMonthlyRollup, field) for field in ROLLUP_KEY_FIELDS],
+            set_={
+                "total": TransactionMonthlyRollup.total + stmt.excluded.total,
+                "transaction_count": TransactionMonthlyRollup.transaction_count + stmt.excluded.transaction_count
+            }
+        ))
+        self.db.execute(delete(TransactionMonthlyRollup).where(
+            TransactionMonthlyRollup.group_id.in_({change["group_id"] for change in changes}),
+            TransactionMonthlyRollup.transaction_count == 0
+        ))
+
+    def delete_group(self, group_id: int) -> None:
+        """Drop a group's rollups, along with all of its transactions."""
+        self.db.execute(delete(TransactionMonthlyRollup).where(TransactionMonthlyRollup.group_id == group_id))
+
+    def rebuild(self, group_ids: Optional[List[int]] = None) -> int:
+        """Recompute the rollups of the given groups (all groups by default) from their transactions.
+
+        Takes an EXCLUSIVE lock on the table until commit, as GroupStatsService.rebuild
+        does, and lifts the connection timeouts for the rest of the transaction, as
+        a full rebuild may outlast them. Returns the number of rollup rows written.
+        """
+        lift_timeouts(self.db)
+        self.db.execute(text(f"LOCK TABLE {TransactionMonthlyRollup.__tablename__} IN EXCLUSIVE MODE"))
+        stale = delete(TransactionMonthlyRollup)
+        if group_ids is not None:
+            stale = stale.where(TransactionMonthlyRollup.group_id.in_(group_ids))
+        self.db.execute(stale)
+        result = self.db.execute(pg_insert(TransactionMonthlyRollup).from_select(
+            [*ROLLUP_KEY_FIELDS, "total", "transaction_count"], _actual_rollups(group_ids)
+        ))
+        return result.rowcount
+
+    def verify(self, group_ids: Optional[List[int]] = None) -> List[dict]:
+        """Compare the rollups with the transactions, returning every key on which they differ.
+
+        Lifts the connection timeouts for the rest of the transaction, like rebuild.
+        """
+        lift_timeouts(self.db)
+        actual = _actual_rollups(group_ids).subquery("actual")
+        stored = select(TransactionMonthlyRollup)
+        if group_ids is not None:
+            stored = stored.where(TransactionMonthlyRollup.group_id.in_(group_ids))
+        stored = stored.subquery("stored")
+        stmt = select(
+            *(func.coalesce(actual.c[field], stored.c[field]).label(field) for field in ROLLUP_KEY_FIELDS),
+            actual.c.total.label("actual_total"),
+            stored.c.total.label("stored_total"),
+            actual.c.transaction_count.label("actual_count"),
+            stored.c.transaction_count.label("stored_count")
+        ).select_from(actual.join(
+            stored, and_(*(actual.c[field] == stored.c[field] for field in ROLLUP_KEY_FIELDS)), full=True
+        )).where(or_(
+            actual.c.total.is_distinct_from(stored.c.total),
+            actual.c.transaction_count.is_distinct_from(stored.c.transaction_count)
+        )).order_by(*ROLLUP_KEY_FIELDS)
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
@@ -0,0 +1,65 @@
+from typing import Iterable, Mapping
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction
+from app.services.group_stats_service import GroupStatsDelta, GroupStatsService
+from app.services.ledger_service import MemberLedgerDelta, MemberLedgerService
+from app.services.rollup_service import MonthlyRollupDelta, MonthlyRollupService
+
+# The transaction columns the summary tables are derived from; write paths pass these for the rows they remove and add
+SUMMARY_COLUMNS = (
+    Transaction.group_id, Transaction.type, Transaction.amount, Transaction.date,
+    Transaction.category, Transaction.payment_mode, Transaction.paid_by, Transaction.created_at
+)
+SUMMARY_FIELDS = frozenset(column.key for column in SUMMARY_COLUMNS)
+
+
+def summary_image(transaction) -> dict:
+    """The SUMMARY_COLUMNS values of an ORM transaction."""
+    return {field: getattr(transaction, field) for field in SUMMARY_FIELDS}
+
+
+class SummaryDelta:
+    """Changes to every summary table (group_stats, the monthly rollups and the member ledgers) from one write."""
+
+    def __init__(self):
+        self.group_stats = GroupStatsDelta()
+        self.rollups = MonthlyRollupDelta()
+        self.ledgers = MemberLedgerDelta()
+
+    def add(self, rows: Iterable[Mapping]) -> None:
+        rows = list(rows)
+        self.group_stats.add(rows)
+        self.rollups.add(rows)
+        self.ledgers.add(rows)
+
+    def remove(self, rows: Iterable[Mapping]) -> None:
+        rows = list(rows)
+        self.group_stats.remove(rows)
+        self.rollups.remove(rows)
+        self.ledgers.remove(rows)
+
+
+class SummaryService:
+    """Applies transaction writes to the summary tables, in the write's database transaction."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_changes(self, removed: Iterable[Mapping] = (), added: Iterable[Mapping] = ()) -> None:
+        """Apply the rows a write removed and added (mappings of SUMMARY_FIELDS); call it before committing."""
+        delta = SummaryDelta()
+        delta.remove(removed)
+        delta.add(added)
+        self.apply(delta)
+
+    def apply(self, delta: SummaryDelta) -> None:
+        # group_stats first: its row locks serialize the groups' rollup and ledger updates (see MonthlyRollupService)
+        GroupStatsService(self.db).apply(delta.group_stats)
+        MonthlyRollupService(self.db).apply(delta.rollups)
+        MemberLedgerService(self.db).apply(delta.ledgers)
+
+    def reset(self, group_id: int) -> None:
+        """Empty a group's summaries ahead of deleting all of its transactions (see GroupStatsService.reset)."""
+        GroupStatsService(self.db).reset(group_id)
+        MonthlyRollupService(self.db).delete_group(group_id)
+        MemberLedgerService(self.db).delete_group(group_id)
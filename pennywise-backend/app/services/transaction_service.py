@@ -1,42 +1,158 @@
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import desc
-from typing import List, Optional
-from app.models.transaction import Transaction
+from sqlalchemy import Integer, String, and_, any_, bindparam, delete, desc, func, insert, or_, select, text, true, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.constants.transactions import BulkChangeOutcome, CountStrategy, CSV_CONSTANTS, SEARCH_TEXT_CONFIG, SEARCH_MAX_TERMS, SEARCH_MAX_CANDIDATES, BULK_INSERT_CHUNK_SIZE, BULK_COPY_MIN_ROWS
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import reads_from_replica
 from app.models.group_member import GroupMember
+from app.models.transaction import Transaction
 from app.models.user import User
-from app.schemas.transaction import TransactionCreate, BulkTransactionCreate, TransactionUpdate
-from fastapi import HTTPException, status, UploadFile
+from app.schemas.transaction import TransactionCreate, BulkTransactionCreate, TransactionChanges, TransactionPatch, TransactionUpdate, TransactionFilters
+from app.services.summary_service import SUMMARY_COLUMNS, SUMMARY_FIELDS, SummaryDelta, SummaryService, summary_image
+from app.services.dashboard_service import invalidate_group_dashboard_stats, invalidate_user_dashboard_stats
+from app.services.membership_service import AsyncMembershipService, MembershipService
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.uploads import UploadTooLargeError, bytes_consumed, open_text_upload
+from fastapi import HTTPException, status
+from pydantic import ValidationError
 import csv
+import hashlib
 import io
-from datetime import datetime
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+
+
+# Total transaction counts keyed by (user_id, group_id); group_id None means all of the user's groups
+transaction_count_cache = TTLCache(ttl_seconds=settings.TRANSACTION_COUNT_CACHE_TTL_SECONDS)
+
+
+def invalidate_transaction_counts(group_id: int) -> None:
+    """Drop cached counts that include transactions of the given group."""
+    transaction_count_cache.invalidate_where(lambda key: key[1] is None or key[1] == group_id)
+
+
+def invalidate_user_transaction_counts(user_id: int) -> None:
+    """Drop a user's cached counts, e.g. after their group memberships change."""
+    transaction_count_cache.invalidate_where(lambda key: key[0] == user_id)
+
+
+def invalidate_group_caches(group_id: int) -> None:
+    """Drop everything cached from a group's transactions, after they change."""
+    invalidate_transaction_counts(group_id)
+    invalidate_group_dashboard_stats(group_id)
+
+
+def invalidate_user_caches(user_id: int) -> None:
+    """Drop everything cached from a user's set of groups, after their memberships change."""
+    invalidate_user_transaction_counts(user_id)
+    invalidate_user_dashboard_stats(user_id)
+
+
+def build_prefix_tsquery(text: str) -> Optional[str]:
+    """Turn free text into a tsquery matching every word as a prefix, e.g. 'swig din' -> 'swig:* & din:*'."""
+    terms = re.findall(r"\w+", text.lower())[:SEARCH_MAX_TERMS]
+    return " & ".join(f"{term}:*" for term in terms) or None
+
+
+# Content keys give dates as whole seconds since this instant
+_CONTENT_KEY_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def utc_datetime(value: datetime) -> datetime:
+    """The instant as an aware UTC datetime; naive datetimes are taken to be in UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def transaction_content_key(row: dict) -> str:
+    """Canonical form of the fields that identify an ingested transaction.
+
+    Dates are compared as whole UTC seconds since the epoch (naive ones taken as UTC)
+    and amounts to the cent; the content_hash migration builds the same key in SQL to
+    backfill existing rows.
+    """
+    date = row.get('date')
+    return "|".join([
+        str(row['group_id']),
+        str((utc_datetime(date) - _CONTENT_KEY_EPOCH) // timedelta(seconds=1)) if date is not None else "",
+        str(round(row['amount'] * 100)),
+        row.get('note') or "",
+        str(row['paid_by']) if row.get('paid_by') is not None else "",
+    ])
+
+
+def assign_content_hashes(rows: List[dict], occurrences: Counter) -> None:
+    """Set `content_hash` on rows about to be ingested.
+
+    The hash covers (group_id, date, amount, note, paid_by) plus how many identical
+    rows came before in the same upload, as counted in `occurrences`. Two identical
+    coffees on one day are both kept, while a retried or re-imported upload maps
+    onto the rows it created the first time. Dates are converted to UTC first, so
+    rows store the instant they were hashed with rather than one Postgres reads in
+    the session's time zone.
+    """
+    for row in rows:
+        if row.get('date') is not None:
+            row['date'] = utc_datetime(row['date'])
+        key = transaction_content_key(row)
+        occurrence = occurrences[key]
+        occurrences[key] += 1
+        row['content_hash'] = hashlib.sha256(f"{key}|{occurrence}".encode("utf-8")).hexdigest()
+
+
+# Characters COPY's text format treats specially
+_COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_text_value(value) -> str:
+    """Format a value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, Enum):
+        return value.name  # Enum columns store member names
+    if isinstance(value, str):
+        return value.translate(_COPY_TEXT_ESCAPES)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_csv_date(value: str) -> date:
+    """Parse a Pennywise CSV date; exports repeat the same dates many times, so results are cached."""
+    return datetime.strptime(value, '%m/%d/%Y').date()
+
+
+def _describe_row_error(error: ValueError) -> str:
+    """Short, user-facing reason a CSV row was rejected."""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
 
 
 class TransactionService:
     def __init__(self, db: Session):
         self.db = db
+        self.memberships = MembershipService(db)
 
-    def create_transaction(self, transaction_data: TransactionCreate, user_id: int) -> Transaction:
+    def create_transaction(self, transaction_data: TransactionCreate, user_id: int) -> dict:
         """Create a new transaction with validation."""
         # Validate that user is a member of the group
-        member = self.db.query(GroupMember).filter(
-            GroupMember.user_id == user_id,
-            GroupMember.group_id == transaction_data.group_id
-        ).first()
-        
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this group"
-            )
+        self.memberships.require_member(user_id, transaction_data.group_id)
 
         # Validate paid_by user if specified
         if transaction_data.paid_by is not None:
-            paid_by_member = self.db.query(GroupMember).filter(
-                GroupMember.user_id == transaction_data.paid_by,
-                GroupMember.group_id == transaction_data.group_id
-            ).first()
-            
-            if not paid_by_member:
+            if not self.memberships.is_member(transaction_data.paid_by, transaction_data.group_id):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="The 'paid_by' user is not a member of the group"
@@ -45,110 +161,163 @@ class TransactionService:
         # Create transaction
         db_transaction = Transaction(**transaction_data.dict())
         self.db.add(db_transaction)
+        self.db.flush()
+        transaction_id = db_transaction.id
+        self._record_changes(added=[summary_image(db_transaction)])
         self.db.commit()
-        self.db.refresh(db_transaction)
+        invalidate_group_caches(transaction_data.group_id)
         
         # Get transaction with user information
-        PaidByUser = aliased(User)
-        result = self.db.query(
-            Transaction,
-            User.full_name.label('user_full_name'),
-            User.email.label('user_email'),
-            User.username.label('user_username'),
-            PaidByUser.full_name.label('paid_by_full_name'),
-            PaidByUser.email.label('paid_by_email'),
-            PaidByUser.username.label('paid_by_username')
-        ).join(
-            User, Transaction.user_id == User.id
-        ).outerjoin(
-            PaidByUser, Transaction.paid_by == PaidByUser.id
-        ).filter(
-            Transaction.id == db_transaction.id
-        ).first()
-        
-        if result:
-            transaction = result[0]
-            # Add user information to the transaction object
-            transaction.user_full_name = result[1]
-            transaction.user_email = result[2]
-            transaction.user_username = result[3]
-            transaction.paid_by_full_name = result[4]
-            transaction.paid_by_email = result[5]
-            transaction.paid_by_username = result[6]
-            return transaction
-        
-        return db_transaction
+        return self.get_transaction_row(transaction_id)
+
+    def import_pennywise_csv(
+        self,
+        fileobj: BinaryIO,
+        group_id: int,
+        user_id: int,
+        mapping: dict,
+        progress: Optional[Callable[[dict], None]] = None
+    ) -> dict:
+        """Import a Pennywise CSV export, plain or gzip-compressed, into a group.
 
-    def import_pennywise_csv(self, file: UploadFile, group_id: int, user_id: int, mapping: dict):
+        The file is parsed as a stream and inserted in batches of
+        CSV_CONSTANTS['IMPORT_BATCH_SIZE'] rows within one database transaction.
+        Rows that fail validation are skipped and reported instead of failing the import,
+        and rows already imported (see assign_content_hashes) are skipped and counted,
+        so importing the same file again changes nothing.
+        `progress`, if given, receives the running summary after every batch.
+        """
         # 1. User Authorization
-        member = self.db.query(GroupMember).filter(
-            GroupMember.user_id == user_id,
-            GroupMember.group_id == group_id
-        ).first()
+        self.memberships.require_member(user_id, group_id)
+        payer_ids = self.resolve_payer_mapping(group_id, mapping)
 
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this group"
-            )
+        # 2. Streaming CSV parsing and batched creation
+        summary = {"count": 0, "skipped_count": 0, "rejected_count": 0, "rejected_rows": [], "bytes_read": 0}
+        batch = []
+        occurrences = Counter()
+        # Summed over the whole import and applied once, so the group's summary rows are only locked at the end
+        summary_delta = SummaryDelta()
+
+        def insert_batch() -> None:
+            assign_content_hashes(batch, occurrences)
+            inserted_rows = [
+                row for row, transaction_id in zip(batch, self._insert_transactions(batch)) if transaction_id is not None
+            ]
+            summary_delta.add(inserted_rows)
+            inserted = len(inserted_rows)
+            summary["count"] += inserted
+            summary["skipped_count"] += len(batch) - inserted
+            batch.clear()
 
-        # 2. CSV Parsing
         try:
-            content = file.file.read().decode('utf-8')
-            csv_reader = csv.DictReader(io.StringIO(content))
-            transactions_to_create = []
-            
-            # No longer need to fetch all users, mapping is provided
-            
+            stream = open_text_upload(fileobj, CSV_CONSTANTS['MAX_FILE_SIZE'])
+            csv_reader = csv.DictReader(stream)
+            missing_columns = [
+                column for column in CSV_CONSTANTS['PENNYWISE_REQUIRED_COLUMNS']
+                if column not in (csv_reader.fieldnames or [])
+            ]
+            if missing_columns:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Missing required column(s) in CSV file: {', '.join(missing_columns)}"
+                )
+
             for i, row in enumerate(csv_reader):
                 try:
-                    paid_by_username = row.get('Paid By')
-                    paid_by_id = None
-                    if paid_by_username and paid_by_username in mapping:
-                        mapped_id = mapping[paid_by_username]
-                        if mapped_id != 'ignore':
-                            paid_by_id = int(mapped_id)
-
-                    transaction_type = row.get('Type', 'expense').lower()
-
-                    transaction_data = TransactionCreate(
-                        date=datetime.strptime(row['Date'], '%m/%d/%Y').date(),
-                        note=row['Description'],
-                        amount=abs(float(row['Amount'].replace(',', ''))),
-                        type=transaction_type.upper(),
-                        category=row.get('Category'),
-                        payment_mode=row.get('Payment Mode'),
-                        group_id=group_id,
-                        user_id=user_id,
-                        paid_by=paid_by_id
-                    )
-                    transactions_to_create.append(transaction_data)
-                except KeyError as e:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Missing required column in CSV file on row {i+2}: {e}"
-                    )
+                    transaction_data = self._parse_pennywise_row(row, group_id, user_id, payer_ids)
+                    batch.append(transaction_data.model_dump())
                 except ValueError as e:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Invalid data format in CSV file on row {i+2}: {e}"
-                    )
+                    summary["rejected_count"] += 1
+                    if len(summary["rejected_rows"]) < CSV_CONSTANTS['MAX_REPORTED_ERRORS']:
+                        summary["rejected_rows"].append({"row": i + 2, "reason": _describe_row_error(e)})
 
-        except Exception as e:
+                if (i + 1) % CSV_CONSTANTS['IMPORT_BATCH_SIZE'] == 0:
+                    insert_batch()
+                    if progress:
+                        summary["bytes_read"] = bytes_consumed(stream)
+                        progress(summary)
+            insert_batch()
+            summary["bytes_read"] = bytes_consumed(stream)
+        except UploadTooLargeError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=str(e)
+            )
+        except (UnicodeDecodeError, csv.Error, OSError, EOFError) as e:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error processing CSV file: {e}"
             )
 
-        # 3. Bulk Creation
-        if transactions_to_create:
-            bulk_data = BulkTransactionCreate(transactions=transactions_to_create)
-            return self.create_bulk_transactions(bulk_data, user_id)
-        
-        return 0
+        SummaryService(self.db).apply(summary_delta)
+        self.db.commit()
+        if summary["count"]:
+            invalidate_group_caches(group_id)
+
+        return summary
 
-    def create_bulk_transactions(self, bulk_data: BulkTransactionCreate, user_id: int) -> int:
-        """Create multiple transactions in bulk with validation."""
+    def resolve_payer_mapping(self, group_id: int, mapping: dict) -> dict:
+        """Turn the CSV 'Paid By' name -> user ID mapping into ints, checking each user once."""
+        payer_ids = {}
+        for name, mapped_id in mapping.items():
+            if mapped_id == 'ignore':
+                continue
+            try:
+                payer_id = int(mapped_id)
+            except (TypeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid user ID for '{name}' in user_mapping"
+                )
+            if not self.memberships.is_member(payer_id, group_id):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"The 'paid_by' user (ID: {payer_id}) is not a member of the group"
+                )
+            payer_ids[name] = payer_id
+        return payer_ids
+
+    @staticmethod
+    def _parse_pennywise_row(row: dict, group_id: int, user_id: int, payer_ids: dict) -> TransactionCreate:
+        """Build a transaction from one CSV row, raising ValueError if the row is invalid."""
+        for column in CSV_CONSTANTS['PENNYWISE_REQUIRED_COLUMNS']:
+            if not row.get(column):
+                raise ValueError(f"Missing value for '{column}'")
+
+        paid_by_username = row.get('Paid By')
+        paid_by_id = payer_ids.get(paid_by_username)
+        if paid_by_id is None:
+            raise ValueError(f"'Paid By' value '{paid_by_username or ''}' is not mapped to a group member")
+
+        transaction_type = (row.get('Type') or 'expense').lower()
+
+        return TransactionCreate(
+            date=_parse_csv_date(row['Date']),
+            note=row['Description'],
+            amount=abs(float(row['Amount'].replace(',', ''))),
+            type=transaction_type.upper(),
+            category=row.get('Category'),
+            payment_mode=row.get('Payment Mode'),
+            group_id=group_id,
+            user_id=user_id,
+            paid_by=paid_by_id
+        )
+
+    def create_bulk_transactions(
+        self,
+        bulk_data: BulkTransactionCreate,
+        user_id: int,
+        skip_duplicates: bool = True
+    ) -> Tuple[List[int], int]:
+        """Create multiple transactions in bulk with validation.
+
+        With skip_duplicates, transactions already created from the same content (e.g.
+        by a retried request, see assign_content_hashes) are not inserted again.
+        Returns the IDs of all submitted transactions in input order, existing ones
+        included, and how many were newly inserted.
+        """
         if not bulk_data.transactions:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -157,16 +326,7 @@ class TransactionService:
 
         # Validate that user is a member of the group (assuming all transactions are for the same group)
         first_transaction = bulk_data.transactions[0]
-        member = self.db.query(GroupMember).filter(
-            GroupMember.user_id == user_id,
-            GroupMember.group_id == first_transaction.group_id
-        ).first()
-        
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this group"
-            )
+        self.memberships.require_member(user_id, first_transaction.group_id)
 
         # Validate all transactions are for the same group
         group_id = first_transaction.group_id
@@ -177,40 +337,51 @@ class TransactionService:
                     detail="All transactions must be for the same group"
                 )
 
-        # Get all group members for validation
-        group_members = self.db.query(GroupMember.user_id).filter(
-            GroupMember.group_id == group_id
-        ).all()
-        group_member_ids = {member.user_id for member in group_members}
-
-        # Validate paid_by users if specified
-        for transaction in bulk_data.transactions:
-            if transaction.paid_by is not None and transaction.paid_by not in group_member_ids:
+        # Validate paid_by users if specified (each distinct payer is checked once)
+        paid_by_ids = {t.paid_by for t in bulk_data.transactions if t.paid_by is not None}
+        for paid_by in sorted(paid_by_ids):
+            if not self.memberships.is_member(paid_by, group_id):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"The 'paid_by' user (ID: {transaction.paid_by}) is not a member of the group"
+                    detail=f"The 'paid_by' user (ID: {paid_by}) is not a member of the group"
                 )
 
         # Create all transactions
-        db_transactions = []
-        for transaction_data in bulk_data.transactions:
-            db_transaction = Transaction(**transaction_data.dict())
-            db_transactions.append(db_transaction)
-        
-        self.db.add_all(db_transactions)
+        rows = [transaction_data.model_dump() for transaction_data in bulk_data.transactions]
+        if skip_duplicates:
+            assign_content_hashes(rows, Counter())
+        transaction_ids = self._insert_transactions(rows)
+        self._record_changes(
+            added=[row for row, transaction_id in zip(rows, transaction_ids) if transaction_id is not None]
+        )
         self.db.commit()
 
-        return len(db_transactions)
+        inserted_count = sum(1 for transaction_id in transaction_ids if transaction_id is not None)
+        if inserted_count:
+            invalidate_group_caches(group_id)
+        if inserted_count < len(rows):
+            existing_ids = self.get_ids_by_content_hash(
+                [row['content_hash'] for row, transaction_id in zip(rows, transaction_ids) if transaction_id is None]
+            )
+            transaction_ids = [
+                transaction_id if transaction_id is not None else existing_ids.get(row['content_hash'])
+                for row, transaction_id in zip(rows, transaction_ids)
+            ]
+
+        return transaction_ids, inserted_count
 
     def get_user_transactions(
         self, 
         user_id: int, 
         group_id: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Transaction]:
+        limit: int = 100,
+        filters: Optional[TransactionFilters] = None
+    ) -> List[dict]:
         """Get transactions for a user with optional group filtering."""
-        transactions, _ = self.get_user_transactions_with_count(user_id, group_id, skip, limit)
+        transactions, _, _ = self.get_user_transactions_with_count(
+            user_id, group_id, skip, limit, count_strategy=CountStrategy.NONE, filters=filters
+        )
         return transactions
 
     def get_user_transactions_with_count(
@@ -218,14 +389,359 @@ class TransactionService:
         user_id: int, 
         group_id: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[Transaction], int]:
-        """Get transactions for a user with optional group filtering and total count."""
-        # Query with user joins to get user information
+        limit: int = 100,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        filters: Optional[TransactionFilters] = None
+    ) -> tuple[List[dict], Optional[int], bool]:
+        """Get transactions for a user with optional group and field filtering and total count.
+
+        Transactions are returned as dicts in the TransactionResponse shape.
+        Returns the page, the total (None with CountStrategy.NONE) and whether more rows follow.
+        """
+        clauses = self._transaction_clauses(user_id, group_id, filters)
+        if clauses is None:
+            return [], 0, False
+
+        total_count = None
+        if count_strategy == CountStrategy.EXACT:
+            total_count = self._count_transactions(clauses)
+        elif count_strategy == CountStrategy.CACHED:
+            cache_key = (user_id, group_id, filters.cache_key() if filters else None)
+            total_count = transaction_count_cache.get(cache_key)
+            if total_count is None:
+                total_count = self._count_transactions(clauses)
+                if not reads_from_replica(self.db):  # a lagging count would outlive the write invalidating it
+                    transaction_count_cache.set(cache_key, total_count)
+
+        transactions = self._fetch_rows(self._listing_page_select(clauses, skip, limit, count_strategy))
+        if count_strategy == CountStrategy.WINDOW:
+            total_count = self._pop_window_count(transactions)
+            if total_count is None:
+                # Past the last row the window has nothing to count over
+                total_count = self._count_transactions(clauses) if skip else 0
+
+        return self._listing_result(transactions, total_count, skip, limit, count_strategy)
+
+    def get_user_transactions_page(
+        self,
+        user_id: int,
+        group_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[TransactionFilters] = None
+    ) -> tuple[List[dict], Optional[str]]:
+        """Get one keyset page of transactions ordered by (date, id) descending.
+
+        Returns the page and the cursor for the next page (None on the last page).
+        Unlike OFFSET pagination, the cost of a page does not grow with its depth.
+        """
+        clauses = self._transaction_clauses(user_id, group_id, filters)
+        if clauses is None:
+            return [], None
+
+        if cursor:
+            clauses.append(self._cursor_clause(cursor))
+        transactions = self._fetch_rows(self._keyset_page_select(clauses, limit))
+        return self._keyset_result(transactions, limit)
+
+    @staticmethod
+    def _listing_page_select(clauses: list, skip: int, limit: int, count_strategy: CountStrategy):
+        """Select one OFFSET page of a listing, with one extra row or a window count as the strategy needs."""
+        stmt = TransactionService._transaction_rows_select().where(*clauses)
+        if count_strategy == CountStrategy.WINDOW:
+            stmt = stmt.add_columns(func.count().over().label('total_count'))
+
+        # Apply pagination (id breaks ties between transactions on the same date)
+        stmt = stmt.order_by(desc(Transaction.date), desc(Transaction.id)).offset(skip)
+        if count_strategy == CountStrategy.NONE:
+            # Fetch one extra row to find out whether another page exists
+            return stmt.limit(limit + 1)
+        return stmt.limit(limit)
+
+    @staticmethod
+    def _pop_window_count(transactions: List[dict]) -> Optional[int]:
+        """Take the COUNT(*) OVER() column off the rows, returning it (None without rows)."""
+        if not transactions:
+            return None
+        total_count = transactions[0]['total_count']
+        for transaction in transactions:
+            del transaction['total_count']
+        return total_count
+
+    @staticmethod
+    def _listing_result(
+        transactions: List[dict],
+        total_count: Optional[int],
+        skip: int,
+        limit: int,
+        count_strategy: CountStrategy
+    ) -> tuple[List[dict], Optional[int], bool]:
+        if count_strategy == CountStrategy.NONE:
+            return transactions[:limit], None, len(transactions) > limit
+        return transactions, total_count, (skip + limit) < total_count
+
+    @staticmethod
+    def _cursor_clause(cursor: str):
+        """Clause selecting the transactions after a keyset cursor, raising 400 for a malformed one."""
+        try:
+            cursor_date, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        if cursor_date is None:
+            # NULL dates sort first in descending order, so everything dated comes after them
+            return or_(
+                and_(Transaction.date.is_(None), Transaction.id < cursor_id),
+                Transaction.date.isnot(None)
+            )
+        return tuple_(Transaction.date, Transaction.id) < tuple_(cursor_date, cursor_id)
+
+    @staticmethod
+    def _keyset_page_select(clauses: list, limit: int):
+        # Fetch one extra row to find out whether another page exists
+        return (
+            TransactionService._transaction_rows_select().where(*clauses)
+            .order_by(desc(Transaction.date), desc(Transaction.id))
+            .limit(limit + 1)
+        )
+
+    @staticmethod
+    def _keyset_result(transactions: List[dict], limit: int) -> tuple[List[dict], Optional[str]]:
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            next_cursor = encode_cursor(transactions[-1]['date'], transactions[-1]['id'])
+        return transactions, next_cursor
+
+    def search_transactions(
+        self,
+        user_id: int,
+        text: str,
+        group_id: Optional[int] = None,
+        filters: Optional[TransactionFilters] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> tuple[List[dict], bool, bool]:
+        """Full-text search over transaction notes, best matches first.
+
+        Every word of `text` is matched as a prefix. Only the SEARCH_MAX_CANDIDATES most
+        recent matches are ranked, which keeps broad terms from reading every matching
+        row; narrower filters reach further back. Returns the page of transactions
+        (each with its `rank`), whether more matches follow and whether older matches
+        were left out of the ranking.
+        """
+        tsquery = build_prefix_tsquery(text)
+        if tsquery is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must contain letters or digits"
+            )
+
+        clauses = self._transaction_clauses(user_id, group_id, filters)
+        if clauses is None:
+            return [], False, False
+
+        rows = self._fetch_rows(self._search_select(tsquery, clauses, skip, limit))
+        truncated = bool(rows and rows[0]['truncated'])
+        transactions = [
+            {key: value for key, value in row.items() if key != 'truncated'}
+            for row in rows if row['id'] is not None
+        ]
+        return transactions[:limit], len(transactions) > limit, truncated
+
+    @staticmethod
+    def _search_select(tsquery: str, clauses: list, skip: int, limit: int):
+        """One page of ranked matches (plus one row) and whether the candidates were cut off.
+
+        The candidates CTE reads one match past SEARCH_MAX_CANDIDATES to find out whether
+        the cap was hit; only the ones within the cap are ranked. The summary CTE always
+        yields one row and the page is outer joined onto it, so the flag also comes back
+        for a page past the last match.
+        """
+        query = func.to_tsquery(SEARCH_TEXT_CONFIG, tsquery)
+        candidates = select(
+            Transaction.id,
+            func.ts_rank_cd(Transaction.note_search, query).label('rank'),
+            func.row_number().over(order_by=(desc(Transaction.date), desc(Transaction.id))).label('position')
+        ).where(
+            Transaction.note_search.bool_op('@@')(query), *clauses
+        ).order_by(
+            desc(Transaction.date), desc(Transaction.id)
+        ).limit(SEARCH_MAX_CANDIDATES + 1).cte('candidates')
+
+        summary = select(
+            (func.count() > SEARCH_MAX_CANDIDATES).label('truncated')
+        ).select_from(candidates).cte('summary')
+        page = (
+            TransactionService._transaction_rows_select().add_columns(candidates.c.rank)
+            .join(candidates, candidates.c.id == Transaction.id)
+            .where(candidates.c.position <= SEARCH_MAX_CANDIDATES)
+            .order_by(desc(candidates.c.rank), desc(Transaction.date), desc(Transaction.id))
+            .offset(skip)
+            .limit(limit + 1)
+        ).cte('page')
+        return (
+            select(summary, page)
+            .select_from(summary.outerjoin(page, true()))
+            .order_by(desc(page.c.rank), desc(page.c.date), desc(page.c.id))
+        )
+
+    def get_accessible_group_ids(self, user_id: int, group_id: Optional[int] = None) -> List[int]:
+        """Resolve the group ids a listing covers: the given group (membership checked) or all of the user's groups."""
+        if group_id:
+            self.memberships.require_member(user_id, group_id)
+            return [group_id]
+
+        return self.memberships.get_group_ids(user_id)
+
+    def iter_transaction_batches(
+        self,
+        group_ids: List[int],
+        batch_size: int = 1000,
+        filters: Optional[TransactionFilters] = None
+    ) -> Iterator[Sequence[RowMapping]]:
+        """Stream transaction rows with user information for the given groups, newest first.
+
+        Rows are plain column mappings read from a server-side cursor and yielded in
+        batches of `batch_size`, so memory use does not depend on how many transactions there are.
+        """
+        if not group_ids:
+            return
+
+        stmt = self._transaction_rows_select().where(
+            Transaction.group_id.in_(group_ids), *self._field_clauses(filters)
+        ).order_by(desc(Transaction.date), desc(Transaction.id))
+
+        result = self.db.execute(stmt, execution_options={"yield_per": batch_size})
+        yield from result.mappings().partitions()
+
+    def get_transaction_row(self, transaction_id: int) -> Optional[dict]:
+        """Get a single transaction with user information in the TransactionResponse shape."""
+        rows = self._fetch_rows(self._transaction_rows_select().where(Transaction.id == transaction_id))
+        return rows[0] if rows else None
+
+    def get_transaction_rows(self, transaction_ids: Sequence[int]) -> List[dict]:
+        """Get transactions in the TransactionResponse shape, in the order of transaction_ids."""
+        rows_by_id = {}
+        for start in range(0, len(transaction_ids), BULK_INSERT_CHUNK_SIZE):
+            chunk = transaction_ids[start:start + BULK_INSERT_CHUNK_SIZE]
+            for row in self._fetch_rows(self._transaction_rows_select().where(Transaction.id.in_(chunk))):
+                rows_by_id[row['id']] = row
+        return [rows_by_id[transaction_id] for transaction_id in transaction_ids if transaction_id in rows_by_id]
+
+    def get_ids_by_content_hash(self, content_hashes: Sequence[str]) -> dict:
+        """Map content hashes to the IDs of the transactions that already carry them."""
+        ids_by_hash = {}
+        for start in range(0, len(content_hashes), BULK_INSERT_CHUNK_SIZE):
+            chunk = content_hashes[start:start + BULK_INSERT_CHUNK_SIZE]
+            ids_by_hash.update(self.db.execute(
+                select(Transaction.content_hash, Transaction.id).where(
+                    Transaction.content_hash == any_(bindparam('content_hashes', list(chunk), type_=ARRAY(String)))
+                )
+            ).all())
+        return ids_by_hash
+
+    def _insert_transactions(self, rows: List[dict]) -> List[Optional[int]]:
+        """Insert rows in as few statements as possible and return the new IDs in input order.
+
+        Large batches are loaded with COPY on psycopg2; otherwise rows are sent as multi-row
+        INSERT ... VALUES statements of BULK_INSERT_CHUNK_SIZE rows instead of one INSERT per ORM object.
+        Rows carrying a `content_hash` that already exists are skipped and get None in place of
+        an ID: existing hashes are looked up first, so re-sent rows cost one index lookup and
+        no writes, and ON CONFLICT DO NOTHING covers rows inserted concurrently.
+        """
+        if not rows:
+            return []
+        if rows[0].get('content_hash') is None:
+            return self._write_transactions(rows, deduplicate=False)
+
+        existing_ids = self.get_ids_by_content_hash([row['content_hash'] for row in rows])
+        new_rows = [row for row in rows if row['content_hash'] not in existing_ids]
+        new_ids = dict(zip(
+            (row['content_hash'] for row in new_rows),
+            self._write_transactions(new_rows, deduplicate=True)
+        ))
+        return [new_ids.get(row['content_hash']) for row in rows]
+
+    def _write_transactions(self, rows: List[dict], deduplicate: bool) -> List[Optional[int]]:
+        """Insert rows with COPY or multi-row INSERTs; see _insert_transactions."""
+        if not rows:
+            return []
+        if len(rows) >= BULK_COPY_MIN_ROWS and self.db.get_bind().dialect.driver == "psycopg2":
+            return self._copy_transactions(rows, deduplicate)
+
+        options = {"insertmanyvalues_page_size": BULK_INSERT_CHUNK_SIZE}
+        if not deduplicate:
+            stmt = insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True)
+            return list(self.db.scalars(stmt, rows, execution_options=options))
+        stmt = pg_insert(Transaction).on_conflict_do_nothing(
+            index_elements=[Transaction.content_hash]
+        ).returning(Transaction.content_hash, Transaction.id)
+        inserted = dict(self.db.execute(stmt, rows, execution_options=options).all())
+        return [inserted.get(row['content_hash']) for row in rows]
+
+    def _copy_transactions(self, rows: List[dict], deduplicate: bool) -> List[Optional[int]]:
+        """Load rows with COPY FROM STDIN.
+
+        COPY cannot return the generated keys, so the IDs are taken from the id sequence
+        up front and written with the rows. COPY cannot skip conflicts either, so rows to
+        deduplicate go to a temporary staging table and move over with INSERT ... SELECT
+        ... ON CONFLICT DO NOTHING.
+        """
+        transaction_ids = list(self.db.scalars(
+            select(func.nextval(func.pg_get_serial_sequence(Transaction.__tablename__, 'id')))
+            .select_from(func.generate_series(1, len(rows)))
+        ))
+        columns = ", ".join(["id", *rows[0]])
+        buffer = io.StringIO()
+        for transaction_id, row in zip(transaction_ids, rows):
+            values = [transaction_id, *row.values()]
+            buffer.write("\t".join(_copy_text_value(value) for value in values) + "\n")
+        buffer.seek(0)
+
+        target = Transaction.__tablename__
+        if deduplicate:
+            target = "transactions_staging"
+            self.db.execute(text(
+                f"CREATE TEMPORARY TABLE {target} AS SELECT {columns} FROM {Transaction.__tablename__} WITH NO DATA"
+            ))
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {target} ({columns}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+        if not deduplicate:
+            return transaction_ids
+
+        inserted = set(self.db.scalars(text(
+            f"INSERT INTO {Transaction.__tablename__} ({columns}) SELECT {columns} FROM {target} "
+            f"ON CONFLICT (content_hash) DO NOTHING RETURNING id"
+        )))
+        self.db.execute(text(f"DROP TABLE {target}"))
+        return [transaction_id if transaction_id in inserted else None for transaction_id in transaction_ids]
+
+    @staticmethod
+    def _transaction_rows_select(source=None):
+        """Select the columns of TransactionResponse directly, without loading ORM entities.
+
+        source defaults to the transactions table; pass a CTE returning transaction
+        rows (e.g. from an UPDATE) to join the user information onto those instead.
+        """
+        rows = Transaction.__table__ if source is None else source
         PaidByUser = aliased(User)
-        
-        query = self.db.query(
-            Transaction,
+        return select(
+            rows.c.id,
+            rows.c.group_id,
+            rows.c.user_id,
+            rows.c.amount,
+            rows.c.type,
+            rows.c.note,
+            rows.c.category,
+            rows.c.payment_mode,
+            rows.c.date,
+            rows.c.paid_by,
             User.full_name.label('user_full_name'),
             User.email.label('user_email'),
             User.username.label('user_username'),
@@ -233,55 +749,72 @@ class TransactionService:
             PaidByUser.email.label('paid_by_email'),
             PaidByUser.username.label('paid_by_username')
         ).join(
-            User, Transaction.user_id == User.id
+            User, rows.c.user_id == User.id
         ).outerjoin(
-            PaidByUser, Transaction.paid_by == PaidByUser.id
+            PaidByUser, rows.c.paid_by == PaidByUser.id
         )
-        
+
+    def _fetch_rows(self, stmt) -> List[dict]:
+        """Execute a row select and return plain dicts, bypassing the identity map."""
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+
+    def _count_transactions(self, clauses: list) -> int:
+        """Count transactions matching clauses; the user joins never change the count, so they are skipped."""
+        return self.db.execute(self._count_select(clauses)).scalar_one()
+
+    @staticmethod
+    def _count_select(clauses: list):
+        return select(func.count()).select_from(Transaction).where(*clauses)
+
+    def _transaction_clauses(
+        self,
+        user_id: int,
+        group_id: Optional[int] = None,
+        filters: Optional[TransactionFilters] = None
+    ) -> Optional[list]:
+        """Build the WHERE clauses scoping a listing to the user's groups and the given filters.
+
+        Returns None when the user does not belong to any group.
+        """
+        return self._scope_clauses(self.get_accessible_group_ids(user_id, group_id), group_id, filters)
+
+    @staticmethod
+    def _scope_clauses(
+        group_ids: List[int],
+        group_id: Optional[int],
+        filters: Optional[TransactionFilters]
+    ) -> Optional[list]:
+        if not group_ids:
+            return None
         if group_id:
-            # Validate user is member of the group
-            member = self.db.query(GroupMember).filter(
-                GroupMember.user_id == user_id,
-                GroupMember.group_id == group_id
-            ).first()
-            
-            if not member:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You are not a member of this group"
-                )
-            
-            query = query.filter(Transaction.group_id == group_id)
+            clauses = [Transaction.group_id == group_id]
         else:
-            # Get transactions from all user's groups
-            user_group_ids = [gm.group_id for gm in self.db.query(GroupMember.group_id).filter(
-                GroupMember.user_id == user_id
-            ).all()]
-            if user_group_ids:
-                query = query.filter(Transaction.group_id.in_(user_group_ids))
-            else:
-                return [], 0
-        
-        # Get total count before applying pagination
-        total_count = query.count()
-        
-        # Apply pagination
-        results = query.order_by(desc(Transaction.date)).offset(skip).limit(limit).all()
-        
-        # Convert results to Transaction objects with user information
-        transactions = []
-        for result in results:
-            transaction = result[0]  # The Transaction object
-            # Add user information to the transaction object
-            transaction.user_full_name = result[1]
-            transaction.user_email = result[2]
-            transaction.user_username = result[3]
-            transaction.paid_by_full_name = result[4]
-            transaction.paid_by_email = result[5]
-            transaction.paid_by_username = result[6]
-            transactions.append(transaction)
-        
-        return transactions, total_count
+            clauses = [Transaction.group_id.in_(group_ids)]
+        return clauses + TransactionService._field_clauses(filters)
+
+    @staticmethod
+    def _field_clauses(filters: Optional[TransactionFilters]) -> list:
+        """Translate TransactionFilters into WHERE clauses on the transactions table."""
+        if filters is None:
+            return []
+        clauses = []
+        if filters.date_from is not None:
+            clauses.append(Transaction.date >= filters.date_from)
+        if filters.date_to is not None:
+            clauses.append(Transaction.date < filters.date_to)
+        if filters.type is not None:
+            clauses.append(Transaction.type == filters.type)
+        if filters.categories:
+            clauses.append(Transaction.category.in_(filters.categories))
+        if filters.payment_modes:
+            clauses.append(Transaction.payment_mode.in_(filters.payment_modes))
+        if filters.paid_by:
+            clauses.append(Transaction.paid_by.in_(filters.paid_by))
+        if filters.amount_min is not None:
+            clauses.append(Transaction.amount >= filters.amount_min)
+        if filters.amount_max is not None:
+            clauses.append(Transaction.amount <= filters.amount_max)
+        return clauses
 
     def delete_transaction(self, transaction_id: int, user_id: int) -> bool:
         """Delete a transaction if user has permission."""
@@ -294,23 +827,22 @@ class TransactionService:
             )
         
         # Check if user has permission (member of the group)
-        member = self.db.query(GroupMember).filter(
-            GroupMember.user_id == user_id,
-            GroupMember.group_id == transaction.group_id
-        ).first()
-        
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to delete this transaction"
-            )
+        self.memberships.require_member(
+            user_id, transaction.group_id,
+            detail="You don't have permission to delete this transaction"
+        )
         
+        group_id = transaction.group_id
+        removed = summary_image(transaction)
         self.db.delete(transaction)
+        self.db.flush()
+        self._record_changes(removed=[removed])
         self.db.commit()
+        invalidate_group_caches(group_id)
         
         return True
 
-    def update_transaction(self, transaction_id: int, transaction_update: TransactionUpdate, user_id: int) -> Transaction:
+    def update_transaction(self, transaction_id: int, transaction_update: TransactionUpdate, user_id: int) -> dict:
         """Update a transaction if user has permission."""
         # Verify transaction exists
         transaction = self.db.query(Transaction).filter(Transaction.id == transaction_id).first()
@@ -321,35 +853,21 @@ class TransactionService:
             )
 
         # Check if user has permission (member of the group)
-        member = self.db.query(GroupMember).filter(
-            GroupMember.user_id == user_id,
-            GroupMember.group_id == transaction.group_id
-        ).first()
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to update this transaction"
-            )
+        self.memberships.require_member(
+            user_id, transaction.group_id,
+            detail="You don't have permission to update this transaction"
+        )
 
         # Validate that the new group_id is accessible by the user
         if transaction_update.group_id != transaction.group_id:
-            new_group_member = self.db.query(GroupMember).filter(
-                GroupMember.user_id == user_id,
-                GroupMember.group_id == transaction_update.group_id
-            ).first()
-            if not new_group_member:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You don't have permission to move this transaction to the specified group"
-                )
+            self.memberships.require_member(
+                user_id, transaction_update.group_id,
+                detail="You don't have permission to move this transaction to the specified group"
+            )
 
         # Validate paid_by user if specified
         if transaction_update.paid_by is not None:
-            paid_by_member = self.db.query(GroupMember).filter(
-                GroupMember.user_id == transaction_update.paid_by,
-                GroupMember.group_id == transaction_update.group_id
-            ).first()
-            if not paid_by_member:
+            if not self.memberships.is_member(transaction_update.paid_by, transaction_update.group_id):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="The 'paid_by' user is not a member of the group"
@@ -361,43 +879,237 @@ class TransactionService:
             'group_id', 'user_id', 'amount', 'type', 'note', 
             'category', 'payment_mode', 'date', 'paid_by'
         ]
+        previous_group_id = transaction.group_id
+        previous = summary_image(transaction)
         for field in model_fields:
             value = getattr(transaction_update, field)
             setattr(transaction, field, value)
 
+        self.db.flush()
+        self._record_changes(removed=[previous], added=[summary_image(transaction)])
         self.db.commit()
-        self.db.refresh(transaction)
+        for group_id in {previous_group_id, transaction_update.group_id}:
+            invalidate_group_caches(group_id)
 
-        # Query to get the updated transaction with user information
-        PaidByUser = aliased(User)
-        result = self.db.query(
-            Transaction,
-            User.full_name.label('user_full_name'),
-            User.email.label('user_email'),
-            User.username.label('user_username'),
-            PaidByUser.full_name.label('paid_by_full_name'),
-            PaidByUser.email.label('paid_by_email'),
-            PaidByUser.username.label('paid_by_username')
-        ).join(
-            User, Transaction.user_id == User.id
-        ).outerjoin(
-            PaidByUser, Transaction.paid_by == PaidByUser.id
-        ).filter(
-            Transaction.id == transaction_id
+        # Get the updated transaction with user information
+        return self.get_transaction_row(transaction_id)
+
+    def patch_transaction(self, transaction_id: int, patch: TransactionPatch, user_id: int) -> dict:
+        """Apply only the given fields, returning the transaction with user information.
+
+        Access is checked inside a single UPDATE ... RETURNING against the (cached)
+        memberships, and the user names are joined onto the updated row through a
+        CTE, so an edit is one round trip. The transaction is only read separately
+        to explain an edit that matched nothing.
+        """
+        values = patch.model_dump(exclude_unset=True)
+        target_group_id = values.get('group_id')
+        if target_group_id is not None:
+            self.memberships.require_member(
+                user_id, target_group_id,
+                detail="You don't have permission to move this transaction to the specified group"
+            )
+            if values.get('paid_by') is not None and not self.memberships.is_member(values['paid_by'], target_group_id):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The 'paid_by' user is not a member of the group"
+                )
+
+        row = self._patch_transaction_row(transaction_id, values, user_id)
+        if row is None:
+            self._explain_failed_patch(transaction_id, values, user_id)
+            # Memberships were stale and have been reloaded by the check above
+            row = self._patch_transaction_row(transaction_id, values, user_id)
+            if row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Transaction not found"
+                )
+        previous = {field: row.pop(f'previous_{field}') for field in SUMMARY_FIELDS}
+        # The response columns leave out created_at, which an edit keeps
+        self._record_changes(removed=[previous], added=[{**row, 'created_at': previous['created_at']}])
+        self.db.commit()
+
+        invalidate_group_caches(row['group_id'])
+        if previous['group_id'] != row['group_id']:
+            invalidate_group_caches(previous['group_id'])
+        return row
+
+    def _patch_transaction_row(self, transaction_id: int, values: dict, user_id: int) -> Optional[dict]:
+        """Run the UPDATE for patch_transaction, returning None if it matched no row."""
+        group_ids = set(self.memberships.get_group_ids(user_id))
+        paid_by = values.get('paid_by')
+        if paid_by is not None and 'group_id' not in values:
+            group_ids &= set(self.memberships.get_group_ids(paid_by))
+
+        # Lock the row first so RETURNING can report the values it had before, for the group stats
+        previous = select(Transaction.id, *SUMMARY_COLUMNS).where(
+            Transaction.id == transaction_id,
+            Transaction.group_id.in_(sorted(group_ids))
+        ).with_for_update().subquery('previous')
+        stmt = update(Transaction).where(Transaction.id == previous.c.id).values(**values)
+        if 'group_id' in values and 'paid_by' not in values:
+            # The current payer must belong to the group the transaction moves to
+            stmt = stmt.where(or_(
+                Transaction.paid_by.is_(None),
+                Transaction.paid_by.in_(
+                    select(GroupMember.user_id).where(GroupMember.group_id == values['group_id'])
+                )
+            ))
+        previous_columns = [previous.c[field].label(f'previous_{field}') for field in SUMMARY_FIELDS]
+        updated = stmt.returning(*Transaction.__table__.c, *previous_columns).cte('updated')
+
+        rows = self._fetch_rows(self._transaction_rows_select(updated).add_columns(
+            *(updated.c[column.name] for column in previous_columns)
+        ))
+        return rows[0] if rows else None
+
+    def _explain_failed_patch(self, transaction_id: int, values: dict, user_id: int) -> None:
+        """Raise the error for a patch that updated nothing, unless only cached memberships were out of date."""
+        transaction = self.db.execute(
+            select(Transaction.group_id, Transaction.paid_by).where(Transaction.id == transaction_id)
         ).first()
+        if transaction is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Transaction not found"
+            )
+        self.memberships.require_member(
+            user_id, transaction.group_id,
+            detail="You don't have permission to update this transaction"
+        )
+        group_id = values.get('group_id', transaction.group_id)
+        paid_by = values['paid_by'] if 'paid_by' in values else transaction.paid_by
+        if paid_by is not None and not self.memberships.is_member(paid_by, group_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The 'paid_by' user is not a member of the group"
+            )
+
+    def update_transactions(self, transaction_ids: Sequence[int], changes: TransactionChanges, user_id: int) -> dict:
+        """Apply the same changes to many transactions with a single UPDATE.
+
+        Transactions the user cannot access, or whose group the new payer does not
+        belong to, are left unchanged and reported in the per-id results.
+        """
+        values = changes.model_dump(exclude_none=True)
+        results, ids_by_group = self._authorize_bulk_change(transaction_ids, user_id)
+
+        paid_by = values.get('paid_by')
+        if paid_by is not None:
+            for group_id in list(ids_by_group):
+                if not self.memberships.is_member(paid_by, group_id):
+                    for transaction_id in ids_by_group.pop(group_id):
+                        results[transaction_id] = {
+                            "id": transaction_id,
+                            "status": BulkChangeOutcome.REJECTED,
+                            "detail": "The 'paid_by' user is not a member of the group"
+                        }
+
+        changes_summaries = bool(SUMMARY_FIELDS & values.keys())
+        rows = self._apply_bulk_change(
+            update(Transaction).values(**values), ids_by_group, results, BulkChangeOutcome.UPDATED,
+            with_previous=changes_summaries
+        )
+        if changes_summaries:
+            removed = [{field: row[f'previous_{field}'] for field in SUMMARY_FIELDS} for row in rows]
+        else:
+            removed = rows  # Totals are unchanged, but the groups' versions still move on
+        self._record_changes(removed=removed, added=rows)
+        self.db.commit()
+        for group_id in {row['group_id'] for row in rows}:
+            invalidate_group_caches(group_id)  # Filtered counts may have changed
+        return self._bulk_change_result(results, BulkChangeOutcome.UPDATED)
+
+    def delete_transactions(self, transaction_ids: Sequence[int], user_id: int) -> dict:
+        """Delete many transactions with a single DELETE, skipping those the user cannot access."""
+        results, ids_by_group = self._authorize_bulk_change(transaction_ids, user_id)
+        rows = self._apply_bulk_change(delete(Transaction), ids_by_group, results, BulkChangeOutcome.DELETED)
+        self._record_changes(removed=rows)
+        self.db.commit()
+        for group_id in {row['group_id'] for row in rows}:
+            invalidate_group_caches(group_id)
+        return self._bulk_change_result(results, BulkChangeOutcome.DELETED)
+
+    def _authorize_bulk_change(
+        self,
+        transaction_ids: Sequence[int],
+        user_id: int
+    ) -> Tuple[Dict[int, dict], Dict[int, List[int]]]:
+        """Look up the groups of the given transactions and check the user's access once per group.
+
+        Returns the outcomes decided so far keyed by id (in input order, without
+        duplicates) and the ids the user may change, grouped by group_id.
+        """
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        group_by_id = dict(self.db.execute(
+            select(Transaction.id, Transaction.group_id)
+            .where(Transaction.id == any_(bindparam('transaction_ids', transaction_ids, type_=ARRAY(Integer))))
+        ).all())
+
+        results: Dict[int, dict] = {}
+        ids_by_group: Dict[int, List[int]] = {}
+        for transaction_id in transaction_ids:
+            group_id = group_by_id.get(transaction_id)
+            if group_id is None:
+                results[transaction_id] = {"id": transaction_id, "status": BulkChangeOutcome.NOT_FOUND, "detail": None}
+            elif not self.memberships.is_member(user_id, group_id):
+                results[transaction_id] = {"id": transaction_id, "status": BulkChangeOutcome.FORBIDDEN, "detail": None}
+            else:
+                results[transaction_id] = None
+                ids_by_group.setdefault(group_id, []).append(transaction_id)
+        return results, ids_by_group
+
+    def _apply_bulk_change(
+        self,
+        stmt,
+        ids_by_group: Dict[int, List[int]],
+        results: Dict[int, dict],
+        outcome: BulkChangeOutcome,
+        with_previous: bool = False
+    ) -> List[dict]:
+        """Run an UPDATE or DELETE over the authorized ids and record the outcome of each.
+
+        The statement is also restricted to the authorized groups, so a transaction
+        moved to another group since it was checked is not touched; it is reported
+        as not found along with any deleted in the meantime. Returns the id and
+        SUMMARY_COLUMNS of each changed transaction, as left by the statement;
+        with_previous adds their values from before an UPDATE as `previous_<column>`.
+        The caller commits.
+        """
+        ids = [transaction_id for group_ids in ids_by_group.values() for transaction_id in group_ids]
+        rows = []
+        if ids:
+            scope = [
+                Transaction.id == any_(bindparam('transaction_ids', ids, type_=ARRAY(Integer))),
+                Transaction.group_id == any_(bindparam('group_ids', list(ids_by_group), type_=ARRAY(Integer)))
+            ]
+            stmt = stmt.returning(Transaction.id, *SUMMARY_COLUMNS)
+            if with_previous:
+                # Lock the rows first so RETURNING can report their values from before the update
+                previous = select(Transaction.id, *SUMMARY_COLUMNS).where(*scope).with_for_update().subquery('previous')
+                stmt = stmt.where(Transaction.id == previous.c.id).returning(
+                    *(previous.c[field].label(f'previous_{field}') for field in SUMMARY_FIELDS)
+                )
+            else:
+                stmt = stmt.where(*scope)
+            rows = [dict(row) for row in self.db.execute(stmt.execution_options(synchronize_session=False)).mappings()]
+            for row in rows:
+                results[row['id']] = {"id": row['id'], "status": outcome, "detail": None}
+
+        for transaction_id in ids:
+            if results[transaction_id] is None:
+                results[transaction_id] = {"id": transaction_id, "status": BulkChangeOutcome.NOT_FOUND, "detail": None}
+        return rows
 
-        if result:
-            updated_transaction = result[0]
-            # Add user information to the transaction object
-            updated_transaction.user_full_name = result[1]
-            updated_transaction.user_email = result[2]
-            updated_transaction.user_username = result[3]
-            updated_transaction.paid_by_full_name = result[4]
-            updated_transaction.paid_by_email = result[5]
-            updated_transaction.paid_by_username = result[6]
-            return updated_transaction
+    @staticmethod
+    def _bulk_change_result(results: Dict[int, dict], outcome: BulkChangeOutcome) -> dict:
+        succeeded = sum(1 for result in results.values() if result["status"] == outcome)
+        return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": list(results.values())}
 
-        return transaction
+    def _record_changes(self, removed: Sequence[dict] = (), added: Sequence[dict] = ()) -> None:
+        """Update the summary tables for the rows a write removed and added; call it before committing."""
+        SummaryService(self.db).record_changes(removed, added)
 
     def get_transaction_by_id(self, transaction_id: int, user_id: int) -> Optional[Transaction]:
         """Get a specific transaction if user has access."""
@@ -407,12 +1119,85 @@ class TransactionService:
             return None
         
         # Check if user is member of the group
-        member = self.db.query(GroupMember).filter(
-            GroupMember.user_id == user_id,
-            GroupMember.group_id == transaction.group_id
-        ).first()
-        
-        if not member:
+        if not self.memberships.is_member(user_id, transaction.group_id):
             return None
         
-        return transaction 
\ No newline at end of file
+        return transaction 
+
+
+class AsyncTransactionService:
+    """Transaction listing on an AsyncSession, built from the same statements as TransactionService."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.memberships = AsyncMembershipService(db)
+
+    async def get_accessible_group_ids(self, user_id: int, group_id: Optional[int] = None) -> List[int]:
+        """Resolve the group ids a listing covers: the given group (membership checked) or all of the user's groups."""
+        if group_id:
+            await self.memberships.require_member(user_id, group_id)
+            return [group_id]
+
+        return await self.memberships.get_group_ids(user_id)
+
+    async def get_user_transactions_with_count(
+        self,
+        user_id: int,
+        group_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        filters: Optional[TransactionFilters] = None
+    ) -> tuple[List[dict], Optional[int], bool]:
+        """See TransactionService.get_user_transactions_with_count."""
+        group_ids = await self.get_accessible_group_ids(user_id, group_id)
+        clauses = TransactionService._scope_clauses(group_ids, group_id, filters)
+        if clauses is None:
+            return [], 0, False
+
+        total_count = None
+        if count_strategy == CountStrategy.EXACT:
+            total_count = await self._count_transactions(clauses)
+        elif count_strategy == CountStrategy.CACHED:
+            cache_key = (user_id, group_id, filters.cache_key() if filters else None)
+            total_count = transaction_count_cache.get(cache_key)
+            if total_count is None:
+                total_count = await self._count_transactions(clauses)
+                if not reads_from_replica(self.db):
+                    transaction_count_cache.set(cache_key, total_count)
+
+        transactions = await self._fetch_rows(
+            TransactionService._listing_page_select(clauses, skip, limit, count_strategy)
+        )
+        if count_strategy == CountStrategy.WINDOW:
+            total_count = TransactionService._pop_window_count(transactions)
+            if total_count is None:
+                # Past the last row the window has nothing to count over
+                total_count = await self._count_transactions(clauses) if skip else 0
+
+        return TransactionService._listing_result(transactions, total_count, skip, limit, count_strategy)
+
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        group_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[TransactionFilters] = None
+    ) -> tuple[List[dict], Optional[str]]:
+        """See TransactionService.get_user_transactions_page."""
+        group_ids = await self.get_accessible_group_ids(user_id, group_id)
+        clauses = TransactionService._scope_clauses(group_ids, group_id, filters)
+        if clauses is None:
+            return [], None
+
+        if cursor:
+            clauses.append(TransactionService._cursor_clause(cursor))
+        transactions = await self._fetch_rows(TransactionService._keyset_page_select(clauses, limit))
+        return TransactionService._keyset_result(transactions, limit)
+
+    async def _fetch_rows(self, stmt) -> List[dict]:
+        return [dict(row) for row in (await self.db.execute(stmt)).mappings()]
+
+    async def _count_transactions(self, clauses: list) -> int:
+        return (await self.db.execute(TransactionService._count_select(clauses))).scalar_one()
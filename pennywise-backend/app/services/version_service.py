@@ -0,0 +1,61 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# One primary-key lookup per group the user belongs to; groups without a group_stats row have never changed
+GROUP_VERSIONS_QUERY = text("""
+    SELECT gm.group_id, COALESCE(s.version, 0) as version
+    FROM group_members gm
+    LEFT JOIN group_stats s ON s.group_id = gm.group_id
+    WHERE gm.user_id = :user_id
+    ORDER BY gm.group_id
+""")
+
+# Creating, reading (updated_at) and deleting notifications each move one of these
+NOTIFICATION_VERSION_QUERY = text("""
+    SELECT COUNT(*) as count, MAX(id) as last_id, MAX(updated_at) as last_updated_at
+    FROM notifications
+    WHERE user_id = :user_id
+""")
+
+
+def _group_versions(rows) -> str:
+    return ",".join(f"{row.group_id}.{row.version}" for row in rows)
+
+
+def _notification_version(row) -> str:
+    return f"{row.count}.{row.last_id}.{row.last_updated_at.isoformat() if row.last_updated_at else ''}"
+
+
+class VersionService:
+    """Cheap stamps of the data behind a user's read endpoints, which change whenever that data does.
+
+    A stamp read before a response's queries can only be older than the data they
+    return, so an ETag derived from it never outlives a write.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_group_versions(self, user_id: int) -> str:
+        """Stamp of the user's groups: which ones they belong to and each group's version."""
+        return _group_versions(self.db.execute(GROUP_VERSIONS_QUERY, {"user_id": user_id}))
+
+    def get_notification_version(self, user_id: int) -> str:
+        """Stamp of the user's notifications."""
+        return _notification_version(self.db.execute(NOTIFICATION_VERSION_QUERY, {"user_id": user_id}).one())
+
+
+class AsyncVersionService:
+    """VersionService on an AsyncSession, running the same queries."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_group_versions(self, user_id: int) -> str:
+        """Stamp of the user's groups: which ones they belong to and each group's version."""
+        return _group_versions(await self.db.execute(GROUP_VERSIONS_QUERY, {"user_id": user_id}))
+
+    async def get_notification_version(self, user_id: int) -> str:
+        """Stamp of the user's notifications."""
+        return _notification_version((await self.db.execute(NOTIFICATION_VERSION_QUERY, {"user_id": user_id})).one())
@@ -0,0 +1,18 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+# Significant digits Postgres keeps when casting float8 to numeric (DBL_DIG)
+FLOAT8_NUMERIC_DIGITS = 15
+
+
+def numeric_amount(amount: float) -> Decimal:
+    """A float amount as the Decimal Postgres' float8 -> numeric cast gives, e.g. 0.1 + 0.2 -> Decimal('0.3').
+
+    The summary tables add these up in Python and compare them with SUM(amount::numeric)
+    in SQL, so both sides must round the float the same way.
+    """
+    return Decimal(format(amount, f".{FLOAT8_NUMERIC_DIGITS}g"))
+
+
+def amount_cents(amount: float) -> int:
+    """numeric_amount in whole cents, rounded half away from zero like Postgres' round(amount::numeric * 100)."""
+    return int((numeric_amount(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
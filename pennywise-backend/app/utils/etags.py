@@ -0,0 +1,36 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+# Let the browser keep responses, but check back with If-None-Match before using them
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag hashing the given parts, e.g. the user, URL and version stamps a response depends on."""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists the ETag (weak comparison, as RFC 9110 asks for GETs)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def closed_months_cache_control(date_to: Optional[datetime], max_age: int, now: Optional[datetime] = None) -> str:
+    """Cache-Control for a date range: long-lived when it ends (exclusive) by the start of the current month.
+
+    Naive datetimes are taken as UTC, like the rest of the API.
+    """
+    if date_to is None or max_age <= 0:
+        return REVALIDATE
+    now = now or datetime.now(timezone.utc)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if date_to.tzinfo is None:
+        date_to = date_to.replace(tzinfo=timezone.utc)
+    if date_to <= month_start:
+        return f"private, max-age={max_age}"
+    return REVALIDATE
@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(date: Optional[datetime], transaction_id: int) -> str:
+    """Encode a (date, id) keyset position as an opaque URL-safe cursor."""
+    payload = {"d": date.isoformat() if date else None, "i": transaction_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        date = datetime.fromisoformat(payload["d"]) if payload["d"] is not None else None
+        return date, int(payload["i"])
+    except (KeyError, TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
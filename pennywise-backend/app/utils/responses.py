@@ -0,0 +1,15 @@
+from typing import Any
+from fastapi import Response
+from pydantic_core import to_json
+
+
+class RawJSONResponse(Response):
+    """JSON response for payloads already in the response shape.
+
+    Serializes with pydantic-core (datetimes, enums) and, being a Response,
+    skips FastAPI's response_model validation of the returned content.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
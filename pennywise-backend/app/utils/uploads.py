@@ -0,0 +1,72 @@
+import gzip
+import io
+from typing import BinaryIO
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class UploadTooLargeError(ValueError):
+    """Raised while reading an upload once it exceeds the allowed size."""
+
+
+class _SizeLimitedReader(io.RawIOBase):
+    """Raw byte stream that fails as soon as more than max_bytes have been read."""
+
+    def __init__(self, raw: BinaryIO, max_bytes: int):
+        self._raw = raw
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._raw.read(len(buffer))
+        self.bytes_read += len(data)
+        if self.bytes_read > self._max_bytes:
+            raise UploadTooLargeError(f"File exceeds the {self._max_bytes // (1024 * 1024)}MB limit")
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_text_upload(fileobj: BinaryIO, max_bytes: int, encoding: str = "utf-8-sig") -> io.TextIOWrapper:
+    """Open an uploaded file as a text stream, decompressing it first if it is gzipped.
+
+    Nothing is read up front; max_bytes applies to the uncompressed content, so a
+    small gzip upload cannot expand past the limit either.
+    """
+    raw = fileobj
+    if fileobj.read(len(GZIP_MAGIC)) == GZIP_MAGIC:
+        fileobj.seek(0)
+        raw = gzip.GzipFile(fileobj=fileobj, mode="rb")
+    else:
+        fileobj.seek(0)
+    limited = io.BufferedReader(_SizeLimitedReader(raw, max_bytes))
+    return io.TextIOWrapper(limited, encoding=encoding, newline="")
+
+
+def bytes_consumed(stream: io.TextIOWrapper) -> int:
+    """Uncompressed bytes read so far from a stream opened with open_text_upload."""
+    return stream.buffer.raw.bytes_read
+
+
+def content_size(data: bytes) -> int:
+    """Size of a stored upload once decompressed.
+
+    For gzip this comes from the trailer, which only records the last member's size
+    modulo 4GB, so treat it as an estimate (it is used for progress reporting).
+    """
+    if not data.startswith(GZIP_MAGIC):
+        return len(data)
+    return int.from_bytes(data[-4:], "little")
+
+
+def read_upload(fileobj: BinaryIO, max_bytes: int, chunk_size: int = 1024 * 1024) -> bytes:
+    """Read an upload in chunks, raising UploadTooLargeError once it exceeds max_bytes."""
+    reader = _SizeLimitedReader(fileobj, max_bytes)
+    buffer = io.BytesIO()
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return buffer.getvalue()
+        buffer.write(chunk)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sync and async versions of the read-heavy endpoints under the same load.
+
+Seeds a throwaway user, group and transactions (deleted again at the end), then
+builds one app from the sync read routers and one from the async read routers
+and drives each in-process with the same number of concurrent clients cycling
+through the transaction listing, dashboard, group stats and notification
+endpoints. Both apps get their own engine with the same pool size, so only the
+driver and the execution model differ. Reports throughput and latency
+percentiles. Uses the database configured for the app; requires asyncpg.
+
+    python -m benchmarks.async_engine --concurrency 64 --pool-size 20 --requests 4000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.api_v1.endpoints import dashboard, groups, notifications, transactions
+from app.api.api_v1.endpoints.auth import get_async_read_db, get_read_db
+from app.core.config import settings
+from app.core.database import (
+    DATABASE_URL, SessionLocal, async_engine_args, pool_args, sync_engine_args
+)
+from app.core.pool_metrics import InstrumentedAsyncAdaptedQueuePool, get_pool_metrics
+from app.models import Group, GroupMember, Notification, Transaction, User
+from app.utils.auth import create_access_token
+
+ENDPOINTS = [
+    "/transactions/?limit=50",
+    "/transactions/?limit=50&count_strategy=window&category=Food",
+    "/dashboard/stats",
+    "/dashboard/recent-transactions",
+    "/groups/stats",
+    "/notifications/unread-count",
+]
+
+
+def seed(rows: int) -> tuple[int, int]:
+    """Create a user, a group and `rows` transactions; returns (user_id, group_id)."""
+    db = SessionLocal()
+    try:
+        user = User(email="async-benchmark@example.com", username="async-benchmark", full_name="Benchmark User")
+        db.add(user)
+        db.flush()
+        group = Group(name="Async benchmark", owner_id=user.id)
+        db.add(group)
+        db.flush()
+        db.add(GroupMember(user_id=user.id, group_id=group.id, role="admin"))
+        db.add(Notification(user_id=user.id, title="Benchmark", message="Benchmark", notification_type="info"))
+
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        categories = ["Food", "Rent", "Travel", "Bills"]
+        db.execute(insert(Transaction), [
+            {
+                "group_id": group.id,
+                "user_id": user.id,
+                "amount": float(i % 1000) + 0.5,
+                "type": "EXPENSE" if i % 4 else "INCOME",
+                "note": f"Benchmark transaction {i}",
+                "category": categories[i % len(categories)],
+                "payment_mode": "UPI",
+                "date": start + timedelta(minutes=i),
+                "paid_by": user.id,
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+        return user.id, group.id
+    finally:
+        db.close()
+
+
+def cleanup(user_id: int, group_id: int) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(Transaction).where(Transaction.group_id == group_id))
+        db.execute(delete(Notification).where(Notification.user_id == user_id))
+        db.execute(delete(GroupMember).where(GroupMember.group_id == group_id))
+        db.execute(delete(Group).where(Group.id == group_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app(use_async: bool) -> FastAPI:
+    app = FastAPI()
+    for prefix, module in [
+        ("/transactions", transactions),
+        ("/groups", groups),
+        ("/dashboard", dashboard),
+        ("/notifications", notifications),
+    ]:
+        router = module.async_read_router if use_async else module.read_router
+        app.include_router(router, prefix=settings.API_V1_STR + prefix)
+    return app
+
+
+async def run_load(app: FastAPI, token: str, concurrency: int, requests: int) -> tuple[float, list[float]]:
+    """Send `requests` requests from `concurrency` clients; returns (elapsed seconds, latencies)."""
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers=headers) as client:
+        async def worker() -> None:
+            for i in remaining:
+                started = time.perf_counter()
+                response = await client.get(settings.API_V1_STR + ENDPOINTS[i % len(ENDPOINTS)])
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started, latencies
+
+
+async def benchmark(args: argparse.Namespace, token: str) -> dict:
+    pool_size = {"pool_size": args.pool_size, "max_overflow": args.max_overflow}
+    sync_engine = create_engine(
+        DATABASE_URL,
+        connect_args=sync_engine_args(DATABASE_URL),
+        **{**pool_args("benchmark-sync"), **pool_size}
+    )
+    BenchmarkSession = sessionmaker(bind=sync_engine, autoflush=False)
+    async_url, connect_args = async_engine_args(DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url,
+        connect_args=connect_args,
+        **{**pool_args("benchmark-async", InstrumentedAsyncAdaptedQueuePool), **pool_size}
+    )
+    AsyncBenchmarkSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_benchmark_db():
+        db = BenchmarkSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_benchmark_async_db():
+        async with AsyncBenchmarkSession() as db:
+            yield db
+
+    sync_app = build_app(use_async=False)
+    sync_app.dependency_overrides[get_read_db] = get_benchmark_db
+    async_app = build_app(use_async=True)
+    async_app.dependency_overrides[get_async_read_db] = get_benchmark_async_db
+
+    results = {}
+    try:
+        for name, app in [("sync", sync_app), ("async", async_app)]:
+            await run_load(app, token, args.concurrency, len(ENDPOINTS) * 5)  # warm up pools and caches
+            get_pool_metrics(f"benchmark-{name}").reset()
+            results[name] = await run_load(app, token, args.concurrency, args.requests)
+            # Release the sync engine's connections so both runs fit under max_connections
+            sync_engine.dispose()
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Transactions in the benchmark group")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=4000, help="Requests per engine")
+    parser.add_argument("--pool-size", type=int, default=5, help="Connection pool size of both engines")
+    parser.add_argument("--max-overflow", type=int, default=10, help="Connections allowed beyond the pool size")
+    args = parser.parse_args()
+
+    user_id, group_id = seed(args.rows)
+    try:
+        token = create_access_token({"sub": str(user_id)})
+        results = asyncio.run(benchmark(args, token))
+    finally:
+        cleanup(user_id, group_id)
+
+    print(
+        f"{'engine':<8}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+        f"{'wait avg':>10}{'wait max':>10}{'peak':>6}"
+    )
+    for name, (elapsed, latencies) in results.items():
+        percentiles = statistics.quantiles(latencies, n=100)
+        metrics = get_pool_metrics(f"benchmark-{name}")
+        wait_avg = metrics.wait_seconds_total / max(metrics.checkouts + metrics.timeouts, 1)
+        print(
+            f"{name:<8}{len(latencies) / elapsed:>10.0f}"
+            f"{percentiles[49] * 1000:>10.1f}{percentiles[94] * 1000:>10.1f}{percentiles[98] * 1000:>10.1f}"
+            f"{wait_avg * 1000:>10.1f}{metrics.wait_seconds_max * 1000:>10.1f}{metrics.in_use_peak:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark ORM-hydrated vs column-projection transaction listing.
+
+Inserts a throwaway group of transactions inside a transaction that is rolled
+back at the end, then lists it with both read paths and reports per-row CPU
+time and peak Python memory. Uses the database configured for the app.
+
+    python -m benchmarks.transaction_reads --rows 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from pydantic_core import to_json
+from sqlalchemy import desc, insert
+from sqlalchemy.orm import Session, aliased
+
+from app.core.database import engine
+from app.models import Group, GroupMember, Transaction, User
+from app.schemas.transaction import TransactionResponse
+from app.services.transaction_service import TransactionService
+
+
+def seed(db: Session, rows: int) -> tuple[int, int]:
+    """Create a user, a group and `rows` transactions; returns (user_id, group_id)."""
+    user = User(email="benchmark@pennywise.local", username="benchmark", full_name="Benchmark User")
+    db.add(user)
+    db.flush()
+    group = Group(name="Benchmark", owner_id=user.id)
+    db.add(group)
+    db.flush()
+    db.add(GroupMember(user_id=user.id, group_id=group.id, role="admin"))
+
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "group_id": group.id,
+            "user_id": user.id,
+            "amount": float(i % 1000) + 0.5,
+            "type": "EXPENSE" if i % 4 else "INCOME",
+            "note": f"Benchmark transaction {i}",
+            "category": "Others",
+            "payment_mode": "UPI",
+            "date": start + timedelta(minutes=i),
+            "paid_by": user.id,
+        })
+        if len(batch) == 10000:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    db.flush()
+    return user.id, group.id
+
+
+def orm_listing(db: Session, user_id: int, group_id: int, limit: int) -> bytes:
+    """Previous read path: ORM entities, setattr'd user fields, TransactionResponse validation."""
+    PaidByUser = aliased(User)
+    results = db.query(
+        Transaction,
+        User.full_name.label('user_full_name'),
+        User.email.label('user_email'),
+        User.username.label('user_username'),
+        PaidByUser.full_name.label('paid_by_full_name'),
+        PaidByUser.email.label('paid_by_email'),
+        PaidByUser.username.label('paid_by_username')
+    ).join(
+        User, Transaction.user_id == User.id
+    ).outerjoin(
+        PaidByUser, Transaction.paid_by == PaidByUser.id
+    ).filter(
+        Transaction.group_id == group_id
+    ).order_by(desc(Transaction.date), desc(Transaction.id)).limit(limit).all()
+
+    transactions = []
+    for result in results:
+        transaction = result[0]
+        transaction.user_full_name = result[1]
+        transaction.user_email = result[2]
+        transaction.user_username = result[3]
+        transaction.paid_by_full_name = result[4]
+        transaction.paid_by_email = result[5]
+        transaction.paid_by_username = result[6]
+        transactions.append(TransactionResponse.from_orm(transaction))
+    payload = to_json({"transactions": transactions})
+    db.expunge_all()
+    return payload
+
+
+def projection_listing(db: Session, user_id: int, group_id: int, limit: int) -> bytes:
+    """Column-projection read path used by TransactionService."""
+    transactions, _, _ = TransactionService(db).get_user_transactions_with_count(
+        user_id, group_id, skip=0, limit=limit
+    )
+    return to_json({"transactions": transactions})
+
+
+def measure(fn, db: Session, user_id: int, group_id: int, rows: int, repeat: int) -> tuple[float, float]:
+    """Return (best CPU seconds, peak traced bytes) for one listing of `rows` rows."""
+    fn(db, user_id, group_id, rows)  # warm up caches and compiled statements
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        fn(db, user_id, group_id, rows)
+        best = min(best, time.process_time() - started)
+
+    tracemalloc.start()
+    fn(db, user_id, group_id, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Number of transactions to list")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per read path (best is reported)")
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        outer = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            user_id, group_id = seed(db, args.rows)
+            results = {
+                "orm": measure(orm_listing, db, user_id, group_id, args.rows, args.repeat),
+                "projection": measure(projection_listing, db, user_id, group_id, args.rows, args.repeat),
+            }
+        finally:
+            db.close()
+            outer.rollback()
+
+    print(f"{'path':<12}{'CPU/row (us)':>14}{'peak mem/row (B)':>18}")
+    for name, (seconds, peak) in results.items():
+        print(f"{name:<12}{seconds / args.rows * 1e6:>14.2f}{peak / args.rows:>18.0f}")
+    (orm_s, orm_peak), (proj_s, proj_peak) = results["orm"], results["projection"]
+    print(f"saved per row: {(orm_s - proj_s) / args.rows * 1e6:.2f} us CPU, {(orm_peak - proj_peak) / args.rows:.0f} B peak memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Numeric, cast, func, select
+from sqlalchemy.orm import Session
+from app.api.api_v1.endpoints.auth import get_read_db
+from app.constants.transactions import TransactionType
+from app.core.database import Base, SessionLocal, engine, get_db
+from app.main import app
+from app.models import Group, GroupMember, GroupStatsSummary, Transaction, User
+from app.schemas.transaction import BulkTransactionCreate, TransactionCreate
+from app.services.group_service import GroupService
+from app.services.ledger_service import MemberLedgerService
+from app.services.rollup_service import MonthlyRollupService
+from app.services.transaction_service import TransactionService
+from app.utils.auth import create_access_token
+
+
+@pytest.fixture
+def db():
+    """Session on the test database whose commits are rolled back after the test."""
+    Base.metadata.create_all(bind=engine)
+    connection = engine.connect()
+    outer = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        outer.rollback()
+        connection.close()
+
+
+def create_group(db: Session, member_count: int) -> SimpleNamespace:
+    """Commit a group with new members, the first of whom owns the group."""
+    suffix = uuid.uuid4().hex[:12]
+    users = [
+        User(email=f"member{index}-{suffix}@example.com", full_name=f"Member {index}")
+        for index in range(member_count)
+    ]
+    db.add_all(users)
+    db.flush()
+    group = Group(name=f"Group {suffix}", owner_id=users[0].id)
+    db.add(group)
+    db.flush()
+    db.add_all(
+        GroupMember(user_id=user.id, group_id=group.id, role="admin" if index == 0 else "member")
+        for index, user in enumerate(users)
+    )
+    db.commit()
+    return SimpleNamespace(id=group.id, user_ids=[user.id for user in users])
+
+
+@pytest.fixture
+def make_group(db):
+    """Factory of groups with new members, the first of whom owns the group."""
+    def create(member_count: int = 3) -> SimpleNamespace:
+        return create_group(db, member_count)
+
+    return create
+
+
+@pytest.fixture
+def make_committed_group():
+    """Factory of groups like make_group's, committed for real so other sessions see them; removed afterwards.
+
+    For tests whose code runs on sessions of its own, or that need now() to move on between writes.
+    """
+    groups = []
+
+    def create(member_count: int = 3) -> SimpleNamespace:
+        with SessionLocal() as session:
+            groups.append(create_group(session, member_count))
+        return groups[-1]
+
+    try:
+        yield create
+    finally:
+        with SessionLocal() as session:
+            for group in groups:
+                GroupService(session).delete_group(group.id, group.user_ids[0])
+            user_ids = [user_id for group in groups for user_id in group.user_ids]
+            session.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+            session.commit()
+
+
+@pytest.fixture
+def group(make_group):
+    """A group of three members."""
+    return make_group()
+
+
+@pytest.fixture
+def client(db):
+    """Factory of API clients authenticated as a user, sharing the test session."""
+    def override_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_db
+
+    def client_for(user_id: int) -> TestClient:
+        test_client = TestClient(app)
+        test_client.headers["Authorization"] = "Bearer " + create_access_token({"sub": str(user_id)})
+        return test_client
+
+    try:
+        yield client_for
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+def add_transactions(db: Session, group: SimpleNamespace, count: int, **fields) -> List[int]:
+    """Create expenses in a group, a day apart from 2025-01-01 and paid in turn by its members."""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    transactions = [
+        TransactionCreate(**{
+            "group_id": group.id,
+            "user_id": group.user_ids[0],
+            "amount": 10.0 * (index + 1),
+            "type": TransactionType.EXPENSE,
+            "note": f"Expense {index}",
+            "category": "Food",
+            "payment_mode": "UPI",
+            "date": start + timedelta(days=index),
+            "paid_by": group.user_ids[index % len(group.user_ids)],
+            **fields
+        })
+        for index in range(count)
+    ]
+    ids, _ = TransactionService(db).create_bulk_transactions(
+        BulkTransactionCreate(transactions=transactions), group.user_ids[0], skip_duplicates=False
+    )
+    return ids
+
+
+def assert_summaries_match(db: Session, group_id: int) -> None:
+    """Check that group_stats, the monthly rollups and the member ledgers agree with the transactions."""
+    amount = cast(Transaction.amount, Numeric)
+    count, income, expense = db.execute(select(
+        func.count(),
+        func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.INCOME), 0),
+        func.coalesce(func.sum(amount).filter(Transaction.type == TransactionType.EXPENSE), 0)
+    ).where(Transaction.group_id == group_id)).one()
+    stats = db.execute(select(
+        GroupStatsSummary.transaction_count, GroupStatsSummary.income_total, GroupStatsSummary.expense_total
+    ).where(GroupStatsSummary.group_id == group_id)).one()
+    assert tuple(stats) == (count, income, expense)
+    assert MonthlyRollupService(db).verify([group_id]) == []
+    assert MemberLedgerService(db).verify([group_id]) == []
@@ -0,0 +1,42 @@
+from datetime import date, datetime, timezone
+import numpy as np
+from app.constants.transactions import AnalyticsGranularity
+from app.services.analytics_service import compute_analytics, linear_trend, moving_average
+
+
+def _month(year, month):
+    return datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_moving_average_and_trend_run_over_every_row():
+    """Test that the windowed means and least-squares fits are computed per group row."""
+    series = np.array([[1.0, 2.0, 3.0, 4.0], [5.0, 5.0, 5.0, 5.0]])
+
+    averages = moving_average(series, 2)
+    assert np.isnan(averages[:, 0]).all()
+    assert averages[:, 1:].tolist() == [[1.5, 2.5, 3.5], [5.0, 5.0, 5.0]]
+
+    slopes, intercepts = linear_trend(series)
+    assert np.allclose(slopes, [1.0, 0.0]) and np.allclose(intercepts, [1.0, 5.0])
+
+
+def test_monthly_analytics_project_the_month_and_compare_categories():
+    """Test the projection at the recent daily rate and category growth over completed months."""
+    analytics = compute_analytics([1, 2], [
+        (1, _month(2025, 1), "Food", 0, 100),
+        (1, _month(2025, 2), "Food", 0, 280),
+        (1, _month(2025, 3), "Food", 50, 30),
+        (1, _month(2025, 2), "", 0, 10),
+    ], AnalyticsGranularity.MONTHLY, 3, 1, date(2025, 3, 10))
+
+    assert analytics["buckets"][0] == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    group = analytics["groups"][0]
+    assert group["expense"] == [100.0, 290.0, 30.0]
+    assert group["expense_trend"] == {"slope": 190.0, "start": 100.0, "end": 480.0}
+    # 30 so far, then 21 more days at February's 290 / 28 a day
+    assert group["projected_month_expense"] == 247.5
+    assert group["categories"] == [
+        {"category": "Food", "recent_expense": 280.0, "previous_expense": 100.0, "growth_rate": 1.8},
+        {"category": None, "recent_expense": 10.0, "previous_expense": 0.0, "growth_rate": None},
+    ]
+    assert analytics["groups"][1]["expense"] == [0.0, 0.0, 0.0]
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import text
+from app.core.database import SessionLocal
+from app.models import User
+from app.services.balance_service import BalanceService, compute_balances, minimal_transfers
+from app.services.group_service import GroupService
+from app.services.ledger_service import MemberLedgerDelta, MemberLedgerService
+from app.services.transaction_service import TransactionService
+from tests.conftest import add_transactions
+
+JOINED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(user_id, paid, owed="0", is_member=True):
+    return SimpleNamespace(
+        user_id=user_id, username=f"u{user_id}", full_name=None, is_member=is_member,
+        paid_total=Decimal(paid), owed_total=Decimal(owed)
+    )
+
+
+def test_ledger_delta_counts_only_expenses_with_a_payer():
+    """Test that income and payer-less expenses leave the ledger alone, and moving the payer moves the amount."""
+    expense = {"group_id": 1, "type": "EXPENSE", "amount": 10.1, "paid_by": 2}
+    delta = MemberLedgerDelta()
+    delta.add([{**expense, "type": "INCOME"}, {**expense, "paid_by": None}])
+    delta.remove([expense])
+    delta.add([{**expense, "paid_by": 3}])
+    delta.split({1: [(JOINED, 2), (JOINED, 3)]}, JOINED)
+
+    # Both splits of the moved expense are the same, so the shares cancel out
+    assert delta.changes() == [
+        {"group_id": 1, "user_id": 2, "paid_total": Decimal("-10.1"), "expense_count": -1, "owed_total": Decimal(0)},
+        {"group_id": 1, "user_id": 3, "paid_total": Decimal("10.1"), "expense_count": 1, "owed_total": Decimal(0)},
+    ]
+
+
+def test_ledger_delta_splits_expenses_among_the_members_at_the_time():
+    """Test that later members take no share of older expenses and leftover cents go to the lowest user ids."""
+    later = JOINED + timedelta(days=30)
+    memberships = {1: [(JOINED, 2), (JOINED, 3), (later, 4)]}
+    expense = {"group_id": 1, "type": "EXPENSE", "paid_by": 2}
+    delta = MemberLedgerDelta()
+    delta.add([{**expense, "amount": 10.01, "created_at": JOINED + timedelta(days=1)}])
+    delta.add([{**expense, "amount": 1.0}])  # Inserted now, after the third member joined
+    delta.split(memberships, later + timedelta(days=1))
+
+    owed = {change["user_id"]: change["owed_total"] for change in delta.changes()}
+    assert owed == {2: Decimal("5.01") + Decimal("0.34"), 3: Decimal("5.00") + Decimal("0.33"), 4: Decimal("0.33")}
+
+    # Removing the older expense takes back exactly what it added, whoever has joined since
+    delta = MemberLedgerDelta()
+    delta.remove([{**expense, "amount": 10.01, "created_at": JOINED + timedelta(days=1)}])
+    delta.split(memberships, later + timedelta(days=2))
+    assert [(change["user_id"], change["owed_total"]) for change in delta.changes()] == [
+        (2, Decimal("-5.01")), (3, Decimal("-5.00"))
+    ]
+
+
+def test_ledger_delta_shares_expenses_older_than_the_group_among_its_first_members():
+    """Test that an expense moved in from an older group is split between the members who joined first."""
+    delta = MemberLedgerDelta()
+    delta.add([{
+        "group_id": 1, "type": "EXPENSE", "amount": 9.0, "paid_by": 2, "created_at": JOINED - timedelta(days=90)
+    }])
+    delta.split({1: [(JOINED, 2), (JOINED, 3), (JOINED + timedelta(days=1), 4)]}, JOINED + timedelta(days=2))
+    assert {change["user_id"]: change["owed_total"] for change in delta.changes()} == {
+        2: Decimal("4.50"), 3: Decimal("4.50")
+    }
+
+
+def test_ledger_delta_rounds_amounts_like_the_numeric_cast():
+    """Test that paid totals add up floats the way SUM(amount::numeric) does."""
+    delta = MemberLedgerDelta()
+    delta.add([{"group_id": 1, "type": "EXPENSE", "amount": 0.1 + 0.2, "paid_by": 2}] * 3)
+    delta.split({1: [(JOINED, 2)]}, JOINED)
+    assert delta.changes()[0]["paid_total"] == Decimal("0.9")
+    assert delta.changes()[0]["owed_total"] == Decimal("0.9")
+
+
+def test_balances_are_what_members_paid_less_what_they_owe():
+    """Test that balances come from the ledgers' paid and owed totals, and that former members keep their credit."""
+    balances = compute_balances(7, [
+        _row(1, "100", "33.34"), _row(2, "0", "33.34"), _row(3, "0", "33.33"), _row(4, "0.01", is_member=False)
+    ])
+
+    assert balances["total_paid"] == 100.01
+    assert [member["share"] for member in balances["members"]] == [33.34, 33.34, 33.33, 0.0]
+    assert [member["balance"] for member in balances["members"]] == [66.66, -33.34, -33.33, 0.01]
+
+
+def test_minimal_transfers_pay_the_largest_creditor_from_the_largest_debtor():
+    """Test that every transfer settles someone, so n members need at most n - 1 transfers."""
+    balances = {1: 6000, 2: -3000, 3: -2000, 4: -1000, 5: 0}
+    transfers = minimal_transfers(balances)
+
+    assert transfers == [(2, 1, 3000), (3, 1, 2000), (4, 1, 1000)]
+    settled = dict(balances)
+    for debtor, creditor, cents in transfers:
+        settled[debtor] += cents
+        settled[creditor] -= cents
+    assert set(settled.values()) == {0}
+
+
+def test_ledger_rebuild_and_verify_run_without_the_connection_timeouts(db, group):
+    """Test that splitting every expense again is not cut short by statement_timeout."""
+    add_transactions(db, group, 3)
+    db.execute(text("SET LOCAL statement_timeout = 30000"))
+    assert MemberLedgerService(db).verify([group.id]) == []
+    assert db.execute(text("SHOW statement_timeout")).scalar() == "0"
+
+    db.execute(text("SET LOCAL statement_timeout = 30000"))
+    assert MemberLedgerService(db).rebuild([group.id]) == 3
+    assert db.execute(text("SHOW statement_timeout")).scalar() == "0"
+    assert MemberLedgerService(db).verify([group.id]) == []
+
+
+def test_members_who_join_later_share_only_the_later_expenses(make_committed_group):
+    """Test that a new member owes nothing for the expenses written before they joined."""
+    # Committed in separate transactions, so the newcomer's joined_at comes after the first expenses
+    founders = make_committed_group(2)
+    owner_id = founders.user_ids[0]
+    with SessionLocal() as db:
+        # 10, 20 and 30, paid in turn by the founders
+        earlier_ids = add_transactions(db, founders, 3)
+    newcomer_id = make_committed_group(1).user_ids[0]
+    with SessionLocal() as db:
+        GroupService(db).add_group_member(founders.id, db.get(User, newcomer_id).email, owner_id)
+    with SessionLocal() as db:
+        # 10.00 paid by the newcomer, split three ways
+        add_transactions(db, SimpleNamespace(id=founders.id, user_ids=[newcomer_id]), 1)
+        balances = {member["user_id"]: member for member in BalanceService(db).get_balances(founders.id, owner_id)["members"]}
+        assert [balances[user_id]["share"] for user_id in (*founders.user_ids, newcomer_id)] == [33.34, 33.33, 3.33]
+        assert [balances[user_id]["balance"] for user_id in (*founders.user_ids, newcomer_id)] == [6.66, -13.33, 6.67]
+        assert MemberLedgerService(db).verify([founders.id]) == []
+
+    with SessionLocal() as db:
+        # Deleting an older expense gives back only the founders' shares
+        TransactionService(db).delete_transaction(earlier_ids[0], owner_id)
+        balances = {member["user_id"]: member for member in BalanceService(db).get_balances(founders.id, owner_id)["members"]}
+        assert [balances[user_id]["share"] for user_id in (*founders.user_ids, newcomer_id)] == [28.34, 28.33, 3.33]
+        assert MemberLedgerService(db).verify([founders.id]) == []
+        assert sum(round(member["balance"] * 100) for member in balances.values()) == 0
@@ -0,0 +1,102 @@
+from sqlalchemy import select
+from app.constants.transactions import BulkChangeOutcome
+from app.models import GroupMember, GroupStatsSummary, Transaction
+from tests.conftest import add_transactions, assert_summaries_match
+
+
+def _stored(db, ids):
+    rows = db.execute(select(Transaction.id, Transaction.amount, Transaction.note, Transaction.paid_by).where(
+        Transaction.id.in_(ids)
+    )).all()
+    return {row.id: row for row in rows}
+
+
+def _outcomes(body):
+    return [(result["id"], result["status"]) for result in body["results"]]
+
+
+def test_bulk_update_reports_each_outcome(db, make_group, client):
+    """Test that a bulk update changes what the user may change and reports every other ID."""
+    home, shared, foreign = make_group(), make_group(), make_group()
+    user_id = home.user_ids[0]
+    db.add(GroupMember(user_id=user_id, group_id=shared.id, role="member"))
+    db.commit()
+    home_ids, shared_ids = add_transactions(db, home, 2), add_transactions(db, shared, 1)
+    foreign_ids = add_transactions(db, foreign, 1)
+    missing_id = max(home_ids + shared_ids + foreign_ids) + 1000
+
+    ids = [home_ids[0], foreign_ids[0], missing_id, shared_ids[0], home_ids[1], home_ids[0]]
+    # The new payer belongs to the home group only, so the shared group's transaction is rejected
+    response = client(user_id).patch("/api/v1/transactions/bulk", json={
+        "ids": ids, "changes": {"amount": 99.5, "paid_by": home.user_ids[1]}
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert _outcomes(body) == [
+        (home_ids[0], BulkChangeOutcome.UPDATED),
+        (foreign_ids[0], BulkChangeOutcome.FORBIDDEN),
+        (missing_id, BulkChangeOutcome.NOT_FOUND),
+        (shared_ids[0], BulkChangeOutcome.REJECTED),
+        (home_ids[1], BulkChangeOutcome.UPDATED),
+    ]
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    assert body["results"][3]["detail"] == "The 'paid_by' user is not a member of the group"
+
+    stored = _stored(db, home_ids + shared_ids + foreign_ids)
+    assert [(stored[i].amount, stored[i].paid_by) for i in home_ids] == [(99.5, home.user_ids[1])] * 2
+    assert (stored[shared_ids[0]].amount, stored[foreign_ids[0]].amount) == (10.0, 10.0)
+    for group in (home, shared, foreign):
+        assert_summaries_match(db, group.id)
+
+
+def test_bulk_update_without_summary_fields_keeps_totals_and_moves_versions(db, group, client):
+    """Test that changing only notes leaves the totals alone but still changes the group's version."""
+    ids = add_transactions(db, group, 3)
+    version = db.scalar(select(GroupStatsSummary.version).where(GroupStatsSummary.group_id == group.id))
+
+    response = client(group.user_ids[0]).patch("/api/v1/transactions/bulk", json={
+        "ids": ids, "changes": {"note": "Renamed"}
+    })
+
+    assert response.json()["succeeded"] == 3
+    assert {row.note for row in _stored(db, ids).values()} == {"Renamed"}
+    assert db.scalar(select(GroupStatsSummary.version).where(GroupStatsSummary.group_id == group.id)) > version
+    assert_summaries_match(db, group.id)
+
+
+def test_bulk_delete_reports_each_outcome(db, make_group, client):
+    """Test that a bulk delete removes the user's transactions only and keeps the summaries in step."""
+    home, foreign = make_group(), make_group()
+    home_ids, foreign_ids = add_transactions(db, home, 3), add_transactions(db, foreign, 2)
+    missing_id = max(home_ids + foreign_ids) + 1000
+
+    response = client(home.user_ids[1]).post("/api/v1/transactions/bulk-delete", json={
+        "ids": [home_ids[0], foreign_ids[0], home_ids[2], missing_id, foreign_ids[1]]
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert _outcomes(body) == [
+        (home_ids[0], BulkChangeOutcome.DELETED),
+        (foreign_ids[0], BulkChangeOutcome.FORBIDDEN),
+        (home_ids[2], BulkChangeOutcome.DELETED),
+        (missing_id, BulkChangeOutcome.NOT_FOUND),
+        (foreign_ids[1], BulkChangeOutcome.FORBIDDEN),
+    ]
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    assert set(_stored(db, home_ids + foreign_ids)) == {home_ids[1], *foreign_ids}
+    assert_summaries_match(db, home.id)
+    assert_summaries_match(db, foreign.id)
+
+
+def test_bulk_delete_of_deleted_transactions_reports_not_found(db, group, client):
+    """Test that deleting the same transactions twice changes nothing the second time."""
+    ids = add_transactions(db, group, 2)
+    api = client(group.user_ids[0])
+    api.post("/api/v1/transactions/bulk-delete", json={"ids": ids})
+
+    body = api.post("/api/v1/transactions/bulk-delete", json={"ids": ids}).json()
+
+    assert _outcomes(body) == [(transaction_id, BulkChangeOutcome.NOT_FOUND) for transaction_id in ids]
+    assert_summaries_match(db, group.id)
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from app.constants.transactions import BULK_COPY_MIN_ROWS, TransactionType
+from app.models import Transaction
+from app.schemas.transaction import BulkTransactionCreate, TransactionCreate
+from app.services import transaction_service
+from app.services.transaction_service import TransactionService
+from tests.conftest import assert_summaries_match
+
+
+def _batch(group, count):
+    start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    return BulkTransactionCreate(transactions=[
+        TransactionCreate(
+            group_id=group.id,
+            user_id=group.user_ids[0],
+            amount=round(0.1 * (index % 97) + 1.05, 2),
+            type=TransactionType.INCOME if index % 5 == 0 else TransactionType.EXPENSE,
+            note=f"Row {index}\twith\\escapes" if index % 50 == 0 else f"Row {index}",
+            category="Food",
+            payment_mode="UPI",
+            date=start + timedelta(hours=index),
+            paid_by=group.user_ids[index % len(group.user_ids)]
+        )
+        for index in range(count)
+    ])
+
+
+def _stored(db, ids):
+    rows = db.execute(
+        select(Transaction.id, Transaction.note, Transaction.amount, Transaction.type, Transaction.date)
+        .where(Transaction.id.in_(ids))
+    ).all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[transaction_id] for transaction_id in ids]
+
+
+def _load(db, monkeypatch, group, count, copy):
+    calls = []
+    copy_transactions = TransactionService._copy_transactions
+
+    def spy(self, rows, deduplicate):
+        calls.append(len(rows))
+        return copy_transactions(self, rows, deduplicate)
+
+    monkeypatch.setattr(TransactionService, "_copy_transactions", spy)
+    monkeypatch.setattr(transaction_service, "BULK_COPY_MIN_ROWS", BULK_COPY_MIN_ROWS if copy else count + 1)
+    ids, inserted = TransactionService(db).create_bulk_transactions(_batch(group, count), group.user_ids[0])
+    return ids, inserted, calls
+
+
+def test_copy_and_insert_paths_agree_at_the_threshold(db, make_group, monkeypatch):
+    """Test that a batch of BULK_COPY_MIN_ROWS loads by COPY exactly as the multi-row INSERT path does."""
+    copied, inserted = make_group(), make_group()
+    copy_ids, copy_count, copy_calls = _load(db, monkeypatch, copied, BULK_COPY_MIN_ROWS, copy=True)
+    insert_ids, insert_count, insert_calls = _load(db, monkeypatch, inserted, BULK_COPY_MIN_ROWS, copy=False)
+
+    assert (copy_calls, insert_calls) == ([BULK_COPY_MIN_ROWS], [])
+    assert copy_count == insert_count == BULK_COPY_MIN_ROWS
+    # IDs come back in input order, and each one is the row submitted at its position
+    assert copy_ids == sorted(copy_ids) and insert_ids == sorted(insert_ids)
+    copy_rows, insert_rows = _stored(db, copy_ids), _stored(db, insert_ids)
+    assert [row[1:] for row in copy_rows] == [row[1:] for row in insert_rows]
+    assert [row.note for row in copy_rows] == [t.note for t in _batch(copied, BULK_COPY_MIN_ROWS).transactions]
+    assert_summaries_match(db, copied.id)
+    assert_summaries_match(db, inserted.id)
+
+
+def test_resent_batch_returns_the_same_ids_on_both_paths(db, make_group, monkeypatch):
+    """Test that resending a batch inserts nothing and returns the first load's IDs, by COPY and by INSERT."""
+    for copy in (True, False):
+        target = make_group()
+        first_ids, _, _ = _load(db, monkeypatch, target, BULK_COPY_MIN_ROWS, copy=copy)
+        resent_ids, inserted, calls = _load(db, monkeypatch, target, BULK_COPY_MIN_ROWS, copy=copy)
+        # Nothing is left to write, so neither path runs
+        assert (resent_ids, inserted, calls) == (first_ids, 0, [])
+        assert_summaries_match(db, target.id)
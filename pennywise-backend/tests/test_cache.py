@@ -0,0 +1,61 @@
+import time
+from app.core.cache import TTLCache
+
+
+def test_cache_returns_stored_value():
+    """Test that a stored value is returned until it is invalidated."""
+    cache = TTLCache(ttl_seconds=60)
+    cache.set((1, 2), 10)
+    assert cache.get((1, 2)) == 10
+    cache.invalidate((1, 2))
+    assert cache.get((1, 2)) is None
+
+
+def test_cache_entries_expire():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = TTLCache(ttl_seconds=0.01)
+    cache.set("key", "value")
+    time.sleep(0.02)
+    assert cache.get("key", "missing") == "missing"
+
+
+def test_cache_evicts_oldest_entry_when_full():
+    """Test that the cache never grows past max_entries."""
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_where_drops_matching_keys():
+    """Test predicate-based invalidation."""
+    cache = TTLCache(ttl_seconds=60)
+    cache.set((1, 5), 1)
+    cache.set((2, 5), 2)
+    cache.set((1, 6), 3)
+    cache.invalidate_where(lambda key: key[1] == 5)
+    assert cache.get((1, 5)) is None
+    assert cache.get((2, 5)) is None
+    assert cache.get((1, 6)) == 3
+
+
+def test_cache_counts_hits_and_misses():
+    """Test that lookups are counted, expired entries as misses."""
+    cache = TTLCache(ttl_seconds=60)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    assert cache.stats() == {"entries": 1, "hits": 2, "misses": 1, "hit_rate": 0.6667}
+
+
+def test_cache_invalidates_entries_by_value():
+    """Test that entries can be dropped by what they hold."""
+    cache = TTLCache(ttl_seconds=60)
+    cache.set(1, {"group_ids": [1, 2]})
+    cache.set(2, {"group_ids": [3]})
+    cache.invalidate_values_where(lambda value: 2 in value["group_ids"])
+    assert cache.get(1) is None
+    assert cache.get(2) == {"group_ids": [3]}
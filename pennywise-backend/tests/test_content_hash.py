@@ -0,0 +1,90 @@
+import importlib.util
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from sqlalchemy import select, text
+from app.constants.transactions import TransactionType
+from app.models import Transaction
+from app.schemas.transaction import BulkTransactionCreate, TransactionCreate
+from app.services.transaction_service import TransactionService, assign_content_hashes
+
+MIGRATION = Path(__file__).parent.parent / "alembic" / "versions" / "5d2e8b71c0f3_add_transaction_content_hash.py"
+
+
+def _content_hashes_sql() -> str:
+    spec = importlib.util.spec_from_file_location("content_hash_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration.CONTENT_HASHES
+
+
+def _row(**overrides):
+    row = {"group_id": 1, "amount": 12.5, "note": "Coffee", "paid_by": 2, "date": datetime(2025, 1, 5, 9, 30)}
+    row.update(overrides)
+    return row
+
+
+def test_identical_rows_in_one_upload_get_distinct_hashes():
+    """Test that repeated transactions within an upload are all kept."""
+    rows = [_row(), _row()]
+    assign_content_hashes(rows, Counter())
+    assert rows[0]["content_hash"] != rows[1]["content_hash"]
+
+
+def test_resent_upload_reproduces_its_hashes():
+    """Test that retrying the same rows maps onto the same hashes."""
+    first, retry = [_row(), _row(), _row(note="Tea")], [_row(), _row(), _row(note="Tea")]
+    assign_content_hashes(first, Counter())
+    assign_content_hashes(retry, Counter())
+    assert [r["content_hash"] for r in first] == [r["content_hash"] for r in retry]
+
+
+def test_naive_dates_hash_as_utc():
+    """Test that a naive date and the same instant in UTC are the same transaction."""
+    naive, aware = [_row()], [_row(date=datetime(2025, 1, 5, 9, 30, tzinfo=timezone.utc))]
+    assign_content_hashes(naive, Counter())
+    assign_content_hashes(aware, Counter())
+    assert naive[0]["content_hash"] == aware[0]["content_hash"]
+
+
+def test_dates_are_stored_as_the_utc_instant_they_were_hashed_with():
+    """Test that hashing converts dates to UTC, naive ones taken as UTC."""
+    ist = timezone(timedelta(hours=5, minutes=30))
+    naive, offset = [_row()], [_row(date=datetime(2025, 1, 5, 15, 0, tzinfo=ist))]
+    assign_content_hashes(naive, Counter())
+    assign_content_hashes(offset, Counter())
+    assert naive[0]["date"] == offset[0]["date"] == datetime(2025, 1, 5, 9, 30, tzinfo=timezone.utc)
+    assert naive[0]["date"].utcoffset() == timedelta(0)
+    assert naive[0]["content_hash"] == offset[0]["content_hash"]
+
+
+def test_backfill_sql_reproduces_the_python_hashes(db, group):
+    """Test that the migration's SQL hashes stored rows exactly as assign_content_hashes did.
+
+    The session runs in a non-UTC time zone, so a naive date read in the session's
+    zone would hash differently.
+    """
+    db.execute(text("SET LOCAL TimeZone = 'Asia/Kolkata'"))
+    ist = timezone(timedelta(hours=5, minutes=30))
+    dates = [
+        datetime(2025, 1, 5),  # Naive, as parsed from a CSV date
+        datetime(2025, 1, 5),  # An identical row, numbered as the second occurrence
+        datetime(2025, 1, 5, 23, 59, 59, 999999, tzinfo=ist),
+        datetime(2024, 12, 31, 23, 0, tzinfo=timezone(timedelta(hours=-8))),
+    ]
+    amounts = [12.5, 12.5, 0.125, 2.675]
+    batch = BulkTransactionCreate(transactions=[
+        TransactionCreate(
+            group_id=group.id, user_id=group.user_ids[0], amount=amount, type=TransactionType.EXPENSE,
+            note="Café ☕", category="Food", payment_mode="UPI", date=date, paid_by=group.user_ids[1]
+        )
+        for date, amount in zip(dates, amounts)
+    ])
+    ids, _ = TransactionService(db).create_bulk_transactions(batch, group.user_ids[0])
+
+    stored = dict(db.execute(select(Transaction.id, Transaction.content_hash).where(Transaction.id.in_(ids))).all())
+    hashes = dict(db.execute(
+        text(f"SELECT id, content_hash FROM ({_content_hashes_sql()}) AS hashes WHERE id = ANY(:ids)"), {"ids": ids}
+    ).all())
+    assert len(set(stored.values())) == len(ids)
+    assert hashes == stored
@@ -0,0 +1,12 @@
+from sqlalchemy import text
+from app.core.database import lift_timeouts
+
+
+def test_lift_timeouts_turns_the_connection_timeouts_off(db):
+    """Test that long-running work can opt out of the timeouts set on every connection."""
+    db.execute(text("SET LOCAL statement_timeout = 30000"))
+    db.execute(text("SET LOCAL idle_in_transaction_session_timeout = 60000"))
+    lift_timeouts(db)
+
+    assert db.execute(text("SHOW statement_timeout")).scalar() == "0"
+    assert db.execute(text("SHOW idle_in_transaction_session_timeout")).scalar() == "0"
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from app.utils.etags import REVALIDATE, closed_months_cache_control, etag_matches, make_etag
+
+
+def test_etag_matches_any_listed_tag():
+    """Test that If-None-Match lists, weak tags and '*' are honoured."""
+    etag = make_etag(1, "/transactions/", "1.3,2.7")
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(make_etag(1, "/transactions/", "1.3,2.8"), etag)
+    assert not etag_matches(None, etag)
+
+
+def test_only_ranges_ending_before_this_month_are_long_lived():
+    """Test that a range is cacheable once it ends by the start of the current month."""
+    now = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+    assert closed_months_cache_control(datetime(2026, 10, 1), 3600, now) == "private, max-age=3600"
+    assert closed_months_cache_control(datetime(2026, 10, 1, 0, 1), 3600, now) == REVALIDATE
+    assert closed_months_cache_control(None, 3600, now) == REVALIDATE
+    assert closed_months_cache_control(datetime(2026, 9, 1), 0, now) == REVALIDATE
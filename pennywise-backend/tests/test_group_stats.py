@@ -0,0 +1,62 @@
+from decimal import Decimal
+from sqlalchemy import Numeric, cast, func, select, text
+from app.constants.transactions import TransactionType
+from app.models import GroupStatsSummary, Transaction
+from app.services.group_stats_service import GroupStatsDelta, GroupStatsService
+from app.utils.amounts import numeric_amount
+from tests.conftest import add_transactions
+
+
+def test_delta_nets_removed_and_added_rows_per_group():
+    """Test that a move between groups and an amount change net out per group."""
+    delta = GroupStatsDelta()
+    delta.remove([
+        {"group_id": 1, "type": "EXPENSE", "amount": 10.1},
+        {"group_id": 2, "type": "INCOME", "amount": 5.0}
+    ])
+    delta.add([
+        {"group_id": 2, "type": "EXPENSE", "amount": 10.1},
+        {"group_id": 2, "type": "INCOME", "amount": 7.25}
+    ])
+
+    assert delta.groups[1] == {
+        "group_id": 1, "transaction_count": -1, "income_total": Decimal(0), "expense_total": Decimal("-10.1")
+    }
+    assert delta.groups[2] == {
+        "group_id": 2, "transaction_count": 1, "income_total": Decimal("2.25"), "expense_total": Decimal("10.1")
+    }
+
+
+def test_amounts_are_rounded_like_the_numeric_cast():
+    """Test that float amounts keep the 15 significant digits Postgres' float8 -> numeric cast keeps."""
+    assert numeric_amount(0.1 + 0.2) == Decimal("0.3")
+    assert numeric_amount(1234567.891234567) == Decimal("1234567.89123457")
+    delta = GroupStatsDelta()
+    delta.add([
+        {"group_id": 1, "type": "EXPENSE", "amount": 0.1 + 0.2},
+        {"group_id": 1, "type": "EXPENSE", "amount": 0.7}
+    ])
+    assert delta.groups[1]["expense_total"] == Decimal("1.0")
+
+
+def test_stored_totals_match_sql_sums_of_inexact_floats(db, group):
+    """Test that totals kept in Python equal Postgres' SUM(amount::numeric) for floats without an exact decimal form."""
+    add_transactions(db, group, 3, amount=0.1 + 0.2)
+    add_transactions(db, group, 2, amount=1234567.891234567, type="INCOME")
+    totals = select(
+        func.sum(cast(Transaction.amount, Numeric)).filter(Transaction.type == TransactionType.INCOME),
+        func.sum(cast(Transaction.amount, Numeric)).filter(Transaction.type == TransactionType.EXPENSE)
+    ).where(Transaction.group_id == group.id)
+    stored = select(GroupStatsSummary.income_total, GroupStatsSummary.expense_total).where(
+        GroupStatsSummary.group_id == group.id
+    )
+    assert db.execute(stored).one() == db.execute(totals).one() == (Decimal("2469135.78246914"), Decimal("0.9"))
+
+
+def test_rebuild_runs_without_the_connection_timeouts(db, group):
+    """Test that rebuilding group_stats is not cut short by statement_timeout while it holds the table lock."""
+    add_transactions(db, group, 3)
+    db.execute(text("SET LOCAL statement_timeout = 30000"))
+    assert GroupStatsService(db).rebuild([group.id]) == 1
+    assert db.execute(text("SHOW statement_timeout")).scalar() == "0"
+    assert db.scalar(select(GroupStatsSummary.transaction_count).where(GroupStatsSummary.group_id == group.id)) == 3
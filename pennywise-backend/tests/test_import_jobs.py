@@ -0,0 +1,114 @@
+import io
+import logging
+import pytest
+from starlette.datastructures import UploadFile
+from app.constants.transactions import ImportJobStatus
+from app.core.database import SessionLocal
+from app.models import ImportJob
+from app.services import import_job_service
+from app.services.import_job_service import ImportJobService, recover_import_jobs, run_import_job
+from app.services.transaction_service import TransactionService
+
+CSV = (
+    "Date,Description,Amount,Type,Category,Payment Mode,Paid By\n"
+    "01/05/2025,Coffee,12.50,expense,Food,UPI,Asha\n"
+    "01/06/2025,Salary,1000,income,Others,UPI,Asha\n"
+)
+
+
+@pytest.fixture
+def owner(make_committed_group):
+    """A user and their group, committed so the job workers' own sessions see them."""
+    group = make_committed_group(1)
+    return group.user_ids[0], group.id
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """Job IDs handed to the worker pool, which is kept from running them."""
+    job_ids = []
+    monkeypatch.setattr(import_job_service, "submit_import_job", job_ids.append)
+    return job_ids
+
+
+def _create_job(owner, content: str) -> int:
+    user_id, group_id = owner
+    upload = UploadFile(io.BytesIO(content.encode("utf-8")), filename="export.csv")
+    with SessionLocal() as db:
+        return ImportJobService(db).create_job(upload, group_id, user_id, {"Asha": str(user_id)}).id
+
+
+def _job(job_id: int) -> ImportJob:
+    with SessionLocal() as db:
+        job = db.get(ImportJob, job_id)
+        job.upload  # Loaded while the session is open
+        return job
+
+
+def test_job_runs_from_its_stored_upload(owner, submitted, monkeypatch):
+    """Test that a job goes from pending to running to completed, reading the upload from its row."""
+    job_id = _create_job(owner, CSV)
+    job = _job(job_id)
+    assert submitted == [job_id]
+    assert (job.status, job.upload, job.file_size) == (ImportJobStatus.PENDING.value, CSV.encode("utf-8"), len(CSV))
+
+    statuses = []
+    import_pennywise_csv = TransactionService.import_pennywise_csv
+
+    def observe(self, *args, **kwargs):
+        statuses.append(_job(job_id).status)
+        return import_pennywise_csv(self, *args, **kwargs)
+
+    monkeypatch.setattr(TransactionService, "import_pennywise_csv", observe)
+    run_import_job(job_id)
+
+    job = _job(job_id)
+    assert statuses == [ImportJobStatus.RUNNING.value]
+    assert (job.status, job.rows_imported, job.error) == (ImportJobStatus.COMPLETED.value, 2, None)
+    assert job.upload is None and job.started_at <= job.finished_at
+
+
+def test_finished_job_does_not_run_again(owner, submitted):
+    """Test that running a completed job again leaves it as it was."""
+    job_id = _create_job(owner, CSV)
+    run_import_job(job_id)
+    run_import_job(job_id)
+    assert _job(job_id).rows_imported == 2
+
+
+def test_invalid_upload_fails_the_job_with_its_reason(owner, submitted):
+    """Test that an upload the import rejects fails the job with the rejection as its error."""
+    job_id = _create_job(owner, "Date,Note\n01/05/2025,Coffee\n")
+    run_import_job(job_id)
+    job = _job(job_id)
+    assert job.status == ImportJobStatus.FAILED.value
+    assert job.error == "Missing required column(s) in CSV file: Description, Amount"
+
+
+def test_unexpected_error_is_logged_and_recorded(owner, submitted, monkeypatch, caplog):
+    """Test that an unexpected error fails the job, is logged with its traceback and kept on the row."""
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(TransactionService, "import_pennywise_csv", fail)
+    job_id = _create_job(owner, CSV)
+    with caplog.at_level(logging.ERROR, logger=import_job_service.__name__):
+        run_import_job(job_id)
+
+    job = _job(job_id)
+    assert (job.status, job.error) == (ImportJobStatus.FAILED.value, "Import failed unexpectedly: disk on fire")
+    assert job.upload is None
+    assert [record.exc_info[0] for record in caplog.records] == [RuntimeError]
+
+
+def test_orphaned_running_job_is_requeued(owner, submitted):
+    """Test that a running job without a worker goes back to pending and is submitted again."""
+    job_id = _create_job(owner, CSV)
+    with SessionLocal() as db:
+        db.query(ImportJob).filter(ImportJob.id == job_id).update({ImportJob.status: ImportJobStatus.RUNNING.value})
+        db.commit()
+
+    submitted.clear()
+    recover_import_jobs()
+    assert _job(job_id).status == ImportJobStatus.PENDING.value
+    assert job_id in submitted
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from app.constants.transactions import ReportPeriod
+from app.schemas.transaction import TransactionFilters
+from app.services.month_view_service import build_month_view, month_bounds
+from app.services.report_service import rollups_cover
+
+
+def test_month_bounds_follow_the_time_zone():
+    """Test that months start at local midnight, roll over the year and default to the current local month."""
+    bounds = month_bounds("2025-12", "Asia/Kolkata")
+    assert bounds.start.astimezone(timezone.utc) == datetime(2025, 11, 30, 18, 30, tzinfo=timezone.utc)
+    assert bounds.end - bounds.start == timedelta(days=31)
+    assert bounds.end.year == 2026 and bounds.end.month == 1
+
+    # Already February in Auckland, still January in UTC
+    assert month_bounds(None, "Pacific/Auckland", now=datetime(2025, 1, 31, 20, tzinfo=timezone.utc)).month == "2025-02"
+
+    with pytest.raises(HTTPException) as error:
+        month_bounds("2025-01", "Nowhere/City")
+    assert error.value.status_code == 400
+
+
+def test_only_utc_aligned_months_read_the_rollups():
+    """Test that the rollups, kept per UTC month, are not used for months starting at another offset."""
+    for time_zone, covered in (("UTC", True), ("Europe/London", True), ("Asia/Kolkata", False)):
+        bounds = month_bounds("2025-01", time_zone)
+        filters = TransactionFilters(date_from=bounds.start, date_to=bounds.end)
+        assert rollups_cover(ReportPeriod.MONTHLY, filters) is covered
+
+
+def test_month_view_of_an_empty_month_keeps_its_totals():
+    """Test that the totals row outer joined to an empty page is not mistaken for a transaction."""
+    empty = {"month_income": 0, "month_expense": 0, "month_transaction_count": 0, "id": None, "date": None}
+    month_view = build_month_view(month_bounds("2025-01", "UTC"), [empty], 10)
+
+    assert month_view["transactions"] == [] and month_view["has_more"] is False
+    assert month_view["totals"]["transaction_count"] == 0
+    assert month_view["date_from"] == datetime(2025, 1, 1, tzinfo=timezone.utc)
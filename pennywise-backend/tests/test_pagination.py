@@ -0,0 +1,20 @@
+import pytest
+from datetime import datetime, timezone
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the (date, id) it was built from."""
+    date = datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(date, 42)) == (date, 42)
+
+
+def test_cursor_round_trip_without_date():
+    """Test that transactions without a date still produce a usable cursor."""
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+
+def test_invalid_cursor_raises_value_error():
+    """Test that malformed cursors are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,95 @@
+from sqlalchemy import select
+from app.models import GroupMember, GroupStatsSummary, Transaction, TransactionMonthlyRollup
+from tests.conftest import add_transactions, assert_summaries_match
+
+FIELDS = ("group_id", "amount", "type", "note", "category", "payment_mode", "date", "paid_by")
+
+
+def _stored(db, transaction_id):
+    return db.execute(
+        select(*(Transaction.__table__.c[field] for field in FIELDS)).where(Transaction.id == transaction_id)
+    ).one()._asdict()
+
+
+def test_unset_fields_are_kept(db, group, client):
+    """Test that a PATCH changes the given field and leaves every other one as it was."""
+    transaction_id = add_transactions(db, group, 1)[0]
+    before = _stored(db, transaction_id)
+
+    response = client(group.user_ids[0]).patch(f"/api/v1/transactions/{transaction_id}", json={"note": "Lunch"})
+
+    assert response.status_code == 200
+    assert response.json()["note"] == "Lunch"
+    assert _stored(db, transaction_id) == {**before, "note": "Lunch"}
+
+
+def test_explicit_null_clears_the_field(db, group, client):
+    """Test that null clears the optional fields, including the payer, whose ledger is updated."""
+    transaction_id = add_transactions(db, group, 1)[0]
+    before = _stored(db, transaction_id)
+
+    response = client(group.user_ids[0]).patch(
+        f"/api/v1/transactions/{transaction_id}", json={"category": None, "payment_mode": None, "paid_by": None}
+    )
+
+    assert response.status_code == 200
+    assert (response.json()["category"], response.json()["paid_by_full_name"]) == (None, None)
+    assert _stored(db, transaction_id) == {**before, "category": None, "payment_mode": None, "paid_by": None}
+    assert_summaries_match(db, group.id)
+
+
+def test_null_is_refused_for_required_fields(db, group, client):
+    """Test that amount, type, date and group cannot be cleared."""
+    transaction_id = add_transactions(db, group, 1)[0]
+    api = client(group.user_ids[0])
+    for field in ("amount", "type", "date", "group_id"):
+        assert api.patch(f"/api/v1/transactions/{transaction_id}", json={field: None}).status_code == 422
+
+
+def test_amount_and_date_changes_update_the_summaries(db, group, client):
+    """Test that changing the amount, type and month of a transaction moves it in every summary table."""
+    ids = add_transactions(db, group, 3)
+    api = client(group.user_ids[0])
+
+    api.patch(f"/api/v1/transactions/{ids[0]}", json={"amount": 1234.56})
+    api.patch(f"/api/v1/transactions/{ids[1]}", json={"date": "2025-03-15T12:00:00Z", "type": "INCOME"})
+
+    stats = db.execute(select(GroupStatsSummary.income_total, GroupStatsSummary.expense_total).where(
+        GroupStatsSummary.group_id == group.id
+    )).one()
+    assert (float(stats.income_total), float(stats.expense_total)) == (20.0, 1234.56 + 30.0)
+    rollups = db.execute(
+        select(TransactionMonthlyRollup.month, TransactionMonthlyRollup.type)
+        .where(TransactionMonthlyRollup.group_id == group.id)
+    ).all()
+    assert sorted((row.month.month, row.type.value) for row in rollups) == [(1, "EXPENSE"), (3, "INCOME")]
+    assert_summaries_match(db, group.id)
+
+
+def test_moving_to_another_group_updates_both(db, make_group, client):
+    """Test that a transaction moved between groups leaves one group's summaries and joins the other's."""
+    source, target = make_group(), make_group()
+    user_id = source.user_ids[0]
+    db.add(GroupMember(user_id=user_id, group_id=target.id, role="member"))
+    db.commit()
+    transaction_id = add_transactions(db, source, 1)[0]
+
+    response = client(user_id).patch(
+        f"/api/v1/transactions/{transaction_id}", json={"group_id": target.id, "paid_by": user_id}
+    )
+
+    assert response.status_code == 200
+    assert _stored(db, transaction_id)["group_id"] == target.id
+    assert_summaries_match(db, source.id)
+    assert_summaries_match(db, target.id)
+
+
+def test_patch_outside_the_users_groups_is_refused(db, make_group, client):
+    """Test that a PATCH by a non-member is forbidden and a missing transaction is not found."""
+    home, foreign = make_group(), make_group()
+    transaction_id = add_transactions(db, foreign, 1)[0]
+    api = client(home.user_ids[0])
+
+    assert api.patch(f"/api/v1/transactions/{transaction_id}", json={"note": "Mine"}).status_code == 403
+    assert api.patch(f"/api/v1/transactions/{transaction_id + 1000}", json={"note": "Mine"}).status_code == 404
+    assert _stored(db, transaction_id)["note"] == "Expense 0"
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.pool_metrics import InstrumentedQueuePool, get_pool_metrics
+
+
+class _Connection:
+    def close(self):
+        pass
+
+
+def test_checkouts_record_waits_and_peak_in_use():
+    """Test that each checkout is timed and the in-use peak is kept after returns."""
+    pool = InstrumentedQueuePool(_Connection, pool_size=2, max_overflow=0, logging_name="test-peak")
+    first, second = pool.connect(), pool.connect()
+    first.close()
+    second.close()
+
+    snapshot = get_pool_metrics("test-peak").snapshot(pool)
+    assert snapshot["checkouts"] == 2
+    assert snapshot["in_use"] == 0
+    assert snapshot["in_use_peak"] == 2
+    assert sum(snapshot["wait_histogram"].values()) == 2
+
+
+def test_exhausted_pool_counts_timeouts():
+    """Test that a checkout giving up on a full pool is counted as a timeout."""
+    pool = InstrumentedQueuePool(_Connection, pool_size=1, max_overflow=0, timeout=0.01, logging_name="test-timeout")
+    held = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    held.close()
+
+    snapshot = get_pool_metrics("test-timeout").snapshot(pool)
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms_max"] >= 10
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import update
+from app.constants.transactions import ReportPeriod
+from app.models import Transaction
+from app.services.report_service import build_report
+from app.services.rollup_service import MonthlyRollupService
+from tests.conftest import add_transactions
+
+JAN = datetime(2025, 1, 1, tzinfo=timezone.utc)
+FEB = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+
+def _row(bucket, category, income, expense, count):
+    return SimpleNamespace(
+        bucket=bucket, category=category, income=Decimal(income), expense=Decimal(expense), transaction_count=count
+    )
+
+
+def test_report_sums_buckets_and_categories():
+    """Test that bucket and overall totals, breakdowns and ratios are derived from the per-category rows."""
+    report = build_report(ReportPeriod.MONTHLY, None, None, [
+        _row(JAN, "Food", "0", "30.5", 2),
+        _row(JAN, "Salary", "100", "0", 1),
+        _row(FEB, "Food", "0", "10", 1),
+    ])
+
+    assert report["totals"] == {
+        "income": 100.0, "expense": 40.5, "net": 59.5, "transaction_count": 4, "income_expense_ratio": 2.4691
+    }
+    assert [category["category"] for category in report["categories"]] == ["Food", "Salary"]
+    assert report["categories"][0]["expense"] == 40.5
+    assert [bucket["start"] for bucket in report["buckets"]] == [JAN, FEB]
+    assert report["buckets"][1]["income_expense_ratio"] == 0.0
+    assert report["buckets"][0]["transaction_count"] == 3
+
+
+def test_report_without_expenses_has_no_ratio():
+    """Test that the ratio is left out rather than dividing by zero."""
+    report = build_report(ReportPeriod.YEARLY, 1, None, [_row(JAN, "Salary", "100", "0", 1)])
+    assert report["totals"]["income_expense_ratio"] is None
+    assert report["group_id"] == 1
+
+
+def test_undated_and_uncategorised_transactions(db, group, client):
+    """Test that reports leave undated transactions out and list uncategorised ones under no category."""
+    ids = add_transactions(db, group, 3)
+    db.execute(update(Transaction).where(Transaction.id == ids[0]).values(date=None))
+    db.execute(update(Transaction).where(Transaction.id == ids[1]).values(category=None))
+    MonthlyRollupService(db).rebuild([group.id])
+    db.commit()
+    api = client(group.user_ids[0])
+
+    # Weekly reports aggregate the transactions; monthly ones read the rollups
+    for period in ReportPeriod.WEEKLY, ReportPeriod.MONTHLY:
+        response = api.get("/api/v1/reports/", params={"period": period.value, "group_id": group.id})
+        assert response.status_code == 200
+        report = response.json()
+        assert (report["totals"]["transaction_count"], report["totals"]["expense"]) == (2, 50.0)
+        assert {category["category"]: category["expense"] for category in report["categories"]} == {
+            "Food": 30.0, None: 20.0
+        }
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import text
+from app.services.rollup_service import MonthlyRollupDelta, MonthlyRollupService, rollup_month
+from tests.conftest import add_transactions
+
+
+def _row(**overrides):
+    row = {"group_id": 1, "type": "EXPENSE", "amount": 10.1, "category": "Food", "payment_mode": "UPI",
+           "date": datetime(2025, 1, 31, 23, 30, tzinfo=timezone.utc)}
+    row.update(overrides)
+    return row
+
+
+def test_months_are_taken_in_utc():
+    """Test that the month key follows UTC, whatever the offset the date carries."""
+    assert rollup_month(datetime(2025, 2, 1, 1, 0, tzinfo=timezone(timedelta(hours=5)))) == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert rollup_month(datetime(2025, 2, 1)) == datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+
+def test_delta_moves_totals_between_keys_and_drops_unchanged_ones():
+    """Test that an edit moving a row to another month is two changes, and a note edit none."""
+    delta = MonthlyRollupDelta()
+    delta.remove([_row(), _row(amount=5)])
+    delta.add([_row(date=datetime(2025, 2, 1, tzinfo=timezone.utc)), _row(amount=5)])
+
+    assert delta.changes() == [
+        {"group_id": 1, "month": datetime(2025, 1, 1, tzinfo=timezone.utc), "category": "Food", "type": "EXPENSE",
+         "payment_mode": "UPI", "total": Decimal("-10.1"), "transaction_count": -1},
+        {"group_id": 1, "month": datetime(2025, 2, 1, tzinfo=timezone.utc), "category": "Food", "type": "EXPENSE",
+         "payment_mode": "UPI", "total": Decimal("10.1"), "transaction_count": 1},
+    ]
+    assert MonthlyRollupDelta().changes() == []
+
+
+def test_totals_match_sql_sums_of_inexact_floats(db, group):
+    """Test that rollup totals kept in Python equal SUM(amount::numeric) for floats without an exact decimal form."""
+    delta = MonthlyRollupDelta()
+    delta.add([_row(amount=0.1 + 0.2), _row(amount=0.1 + 0.2), _row(amount=0.1 + 0.2)])
+    assert delta.changes()[0]["total"] == Decimal("0.9")
+
+    add_transactions(db, group, 3, amount=0.1 + 0.2, date=datetime(2025, 1, 5, tzinfo=timezone.utc))
+    assert MonthlyRollupService(db).verify([group.id]) == []
+
+
+def test_rebuild_and_verify_run_without_the_connection_timeouts(db, group):
+    """Test that rebuilding and verifying every group is not cut short by statement_timeout."""
+    add_transactions(db, group, 3)
+    db.execute(text("SET LOCAL statement_timeout = 30000"))
+    assert MonthlyRollupService(db).verify([group.id]) == []
+    assert db.execute(text("SHOW statement_timeout")).scalar() == "0"
+
+    db.execute(text("SET LOCAL statement_timeout = 30000"))
+    MonthlyRollupService(db).rebuild([group.id])
+    assert db.execute(text("SHOW statement_timeout")).scalar() == "0"
+    assert MonthlyRollupService(db).verify([group.id]) == []
@@ -0,0 +1,25 @@
+from app.constants.transactions import SEARCH_MAX_TERMS
+from app.services.transaction_service import build_prefix_tsquery
+
+
+def test_words_become_prefix_terms():
+    """Test that every word is lowercased and matched as a prefix."""
+    assert build_prefix_tsquery("Swig Din") == "swig:* & din:*"
+
+
+def test_input_without_words_has_no_query():
+    """Test that empty or punctuation-only input yields no tsquery."""
+    assert build_prefix_tsquery("") is None
+    assert build_prefix_tsquery("  !! -- ") is None
+
+
+def test_tsquery_operators_are_not_passed_through():
+    """Test that tsquery syntax in the input is treated as word separators."""
+    assert build_prefix_tsquery("rent & !food | (cab):* <-> 'x'") == "rent:* & food:* & cab:* & x:*"
+    assert build_prefix_tsquery("café_2025") == "café_2025:*"
+
+
+def test_terms_beyond_the_limit_are_dropped():
+    """Test that only the first SEARCH_MAX_TERMS words are searched."""
+    words = [f"w{index}" for index in range(SEARCH_MAX_TERMS + 3)]
+    assert build_prefix_tsquery(" ".join(words)) == " & ".join(f"{word}:*" for word in words[:SEARCH_MAX_TERMS])
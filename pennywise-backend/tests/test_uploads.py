@@ -0,0 +1,35 @@
+import gzip
+import io
+import pytest
+from app.utils.uploads import UploadTooLargeError, content_size, open_text_upload, read_upload
+
+CSV = "Date,Description\n01/05/2025,Café\n"
+
+
+def test_plain_upload_is_read_as_text():
+    """Test that an uncompressed upload is decoded, dropping a UTF-8 BOM."""
+    stream = open_text_upload(io.BytesIO(b"\xef\xbb\xbf" + CSV.encode("utf-8")), max_bytes=1024)
+    assert stream.read() == CSV
+
+
+def test_gzip_upload_is_decompressed():
+    """Test that gzip-compressed uploads are detected and decompressed."""
+    stream = open_text_upload(io.BytesIO(gzip.compress(CSV.encode("utf-8"))), max_bytes=1024)
+    assert stream.read() == CSV
+
+
+def test_size_limit_applies_to_uncompressed_content():
+    """Test that reading fails once the uncompressed content exceeds the limit."""
+    data = gzip.compress(CSV.encode("utf-8") * 1000)
+    stream = open_text_upload(io.BytesIO(data), max_bytes=4096)
+    with pytest.raises(UploadTooLargeError):
+        stream.read()
+
+
+def test_stored_upload_is_read_up_to_the_limit():
+    """Test that uploads are read whole within the limit and rejected past it."""
+    data = gzip.compress(CSV.encode("utf-8"))
+    assert read_upload(io.BytesIO(data), max_bytes=len(data), chunk_size=8) == data
+    assert content_size(data) == len(CSV.encode("utf-8"))
+    with pytest.raises(UploadTooLargeError):
+        read_upload(io.BytesIO(data), max_bytes=len(data) - 1)
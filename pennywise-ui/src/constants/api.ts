@@ -13,6 +13,9 @@ export const API_CONSTANTS = {
     TRANSACTIONS: {
       BASE: '/transactions',
       BULK: '/transactions/bulk',
+      BULK_DELETE: '/transactions/bulk-delete',
+      IMPORT_CSV: '/transactions/import-pennywise-csv',
+      IMPORT_JOB: (jobId: number) => `/transactions/import-jobs/${jobId}`,
     },
     GROUPS: {
       BASE: '/groups',
@@ -252,6 +252,19 @@ class ApiClient {
     });
   }
 
+  async patch<T>(url: string, data?: unknown): Promise<T> {
+    const headers: Record<string, string> = {};
+    if (data) {
+      headers['Content-Type'] = 'application/json';
+    }
+    
+    return this.request<T>(url, {
+      method: 'PATCH',
+      headers,
+      body: data ? JSON.stringify(data) : undefined,
+    });
+  }
+
   async delete<T>(url: string): Promise<T> {
     return this.request<T>(url, {
       method: 'DELETE',
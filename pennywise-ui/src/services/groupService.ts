@@ -10,6 +10,8 @@ export interface GroupStats {
   member_count: number;
   transaction_count: number;
   total_amount: number;
+  total_income: number;
+  total_expense: number;
   created_at: string;
   updated_at: string;
   last_transaction_at?: string;
@@ -1,7 +1,9 @@
 import { apiClient } from './apiClient';
-import { Transaction, TransactionCreate, PaginatedTransactionResponse, ImportCsvResponse } from '@/types/transaction';
+import { Transaction, TransactionCreate, TransactionChanges, TransactionPatch, BulkTransactionChangeResult, PaginatedTransactionResponse, ImportCsvResponse, ImportJob } from '@/types/transaction';
 import { API_CONSTANTS } from '@/constants';
 
+const IMPORT_JOB_POLL_INTERVAL_MS = 1000;
+
 export const transactionService = {
   async getTransactions(
     groupId?: number, 
@@ -40,12 +42,51 @@ export const transactionService = {
     return apiClient.put<Transaction>(`${API_CONSTANTS.ENDPOINTS.TRANSACTIONS.BASE}/${id}`, transaction);
   },
 
-  async importPennywiseCsv(file: File, groupId: number, mapping: Record<string, number | 'ignore'>): Promise<ImportCsvResponse> {
+  // Sends only the changed fields
+  async patchTransaction(id: number, changes: TransactionPatch): Promise<Transaction> {
+    return apiClient.patch<Transaction>(`${API_CONSTANTS.ENDPOINTS.TRANSACTIONS.BASE}/${id}`, changes);
+  },
+
+  async updateTransactions(ids: number[], changes: TransactionChanges): Promise<BulkTransactionChangeResult> {
+    return apiClient.patch<BulkTransactionChangeResult>(API_CONSTANTS.ENDPOINTS.TRANSACTIONS.BULK, { ids, changes });
+  },
+
+  async deleteTransactions(ids: number[]): Promise<BulkTransactionChangeResult> {
+    return apiClient.post<BulkTransactionChangeResult>(API_CONSTANTS.ENDPOINTS.TRANSACTIONS.BULK_DELETE, { ids });
+  },
+
+  async startPennywiseCsvImport(file: File, groupId: number, mapping: Record<string, number | 'ignore'>): Promise<ImportJob> {
     const formData = new FormData();
     formData.append('file', file);
     formData.append('group_id', groupId.toString());
     formData.append('user_mapping', JSON.stringify(mapping));
 
-    return apiClient.post('/transactions/import-pennywise-csv', formData);
+    return apiClient.post<ImportJob>(API_CONSTANTS.ENDPOINTS.TRANSACTIONS.IMPORT_CSV, formData);
+  },
+
+  async getImportJob(jobId: number): Promise<ImportJob> {
+    return apiClient.get<ImportJob>(API_CONSTANTS.ENDPOINTS.TRANSACTIONS.IMPORT_JOB(jobId));
+  },
+
+  // Imports run as background jobs on the server; wait for the job to finish
+  async importPennywiseCsv(
+    file: File,
+    groupId: number,
+    mapping: Record<string, number | 'ignore'>,
+    onProgress?: (job: ImportJob) => void
+  ): Promise<ImportCsvResponse> {
+    let job = await this.startPennywiseCsvImport(file, groupId, mapping);
+    while (job.status === 'pending' || job.status === 'running') {
+      onProgress?.(job);
+      await new Promise((resolve) => setTimeout(resolve, IMPORT_JOB_POLL_INTERVAL_MS));
+      job = await this.getImportJob(job.id);
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Failed to import transactions');
+    }
+    const skipped = job.rows_skipped ? ` ${job.rows_skipped} already imported rows were skipped.` : '';
+    const rejected = job.rows_rejected ? ` ${job.rows_rejected} rows were rejected.` : '';
+    return { message: `Successfully imported ${job.rows_imported} transactions.${skipped}${rejected}`, count: job.rows_imported };
   }
 }; 
\ No newline at end of file
@@ -38,6 +38,22 @@ export interface TransactionCreate {
   paid_by?: number;
 }
 
+export type TransactionChanges = Partial<Pick<TransactionCreate, 'amount' | 'type' | 'note' | 'category' | 'payment_mode' | 'date' | 'paid_by'>>;
+
+export type TransactionPatch = TransactionChanges & { group_id?: number };
+
+export interface BulkTransactionOutcome {
+  id: number;
+  status: 'updated' | 'deleted' | 'not_found' | 'forbidden' | 'rejected';
+  detail: string | null;
+}
+
+export interface BulkTransactionChangeResult {
+  succeeded: number;
+  failed: number;
+  results: BulkTransactionOutcome[];
+}
+
 export interface PaginatedTransactionResponse {
   transactions: Transaction[];
   total: number;
@@ -49,4 +65,29 @@ export interface PaginatedTransactionResponse {
 export interface ImportCsvResponse {
   message: string;
   count: number;
+}
+
+export interface ImportCsvRowError {
+  row: number;
+  reason: string;
+}
+
+export interface ImportJob {
+  id: number;
+  group_id: number;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  filename: string | null;
+  file_size: number;
+  content_size: number | null;
+  bytes_processed: number;
+  rows_imported: number;
+  rows_skipped: number;
+  rows_rejected: number;
+  rows_processed: number;
+  rejected_rows: ImportCsvRowError[] | null;
+  error: string | null;
+  eta_seconds: number | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
 }
\ No newline at end of file